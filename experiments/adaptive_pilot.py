@@ -0,0 +1,153 @@
+"""
+Stop a pilot study as soon as it is clear whether a tracker beats a baseline.
+
+An adaptive pilot study compares a tracker to a baseline tracker in the pilot study database. It
+tracks the sequences that best tell trackers apart first, and stops as soon as a sequential test
+settles the comparison.
+
+Sequence Order
+--------------
+
+A sequence's discriminativeness is the standard deviation of the scores of every tracker in the
+pilot study database on that sequence. Sequences on which trackers score alike say little about a
+change, so the adaptive pilot study tracks the most discriminative sequences first. Sequences
+without a baseline score go last, in the order requested; they do not count toward the test.
+
+Sequential Test
+---------------
+
+After each sequence, the test pairs the tracker's mean IoU with the baseline's mean IoU on that
+sequence. The tracker wins the sequence if it beats the baseline by more than the tie margin, and
+loses it if the baseline beats the tracker by more than the margin. The test is a Wald sequential
+probability ratio test of the win rate, between the hypotheses that the tracker wins 3 of 4
+sequences (better) and that it loses 3 of 4 (worse). Ties do not count. With a significance level
+of 0.05, the test stops once the wins and losses differ by 3. If the remaining sequences cannot
+settle the test either way, the test stops early and reports that the result is inconclusive.
+
+The test only uses the sign of each difference, so it makes no assumption about how IoU
+differences are distributed.
+
+Reference
+---------
+"""
+
+import math
+import numpy
+
+BETTER = "better"
+WORSE = "worse"
+INCONCLUSIVE = "inconclusive"
+
+
+def discriminativeness(pilot_results: dict) -> dict:
+    """
+    Compute how well each sequence tells trackers apart.
+
+    Args:
+        pilot_results (dict): The pilot study database.
+
+    Returns:
+        dict: The standard deviation of the tracker scores on each sequence. Sequences with fewer
+        than two scores have a standard deviation of 0.
+    """
+    sequence_scores = {}
+    for tracker_data in pilot_results.values():
+        for sequence, score in tracker_data["scores"].items():
+            sequence_scores.setdefault(sequence, []).append(score)
+    return {
+        sequence: float(numpy.std(scores)) if len(scores) > 1 else 0.0
+        for sequence, scores in sequence_scores.items()
+    }
+
+
+def order_sequences(sequences: list, pilot_results: dict, baseline: str) -> list:
+    """
+    Order sequences for an adaptive pilot study.
+
+    Args:
+        sequences (list): The sequences to track.
+        pilot_results (dict): The pilot study database.
+        baseline (str): The name of the baseline tracker in the database.
+
+    Returns:
+        list: The sequences with baseline scores, most discriminative first, followed by the
+        sequences without baseline scores, in their original order.
+    """
+    spread = discriminativeness(pilot_results)
+    baseline_scores = pilot_results[baseline]["scores"]
+    scored = [sequence for sequence in sequences if sequence in baseline_scores]
+    unscored = [sequence for sequence in sequences if sequence not in baseline_scores]
+    return sorted(scored, key=lambda sequence: spread[sequence], reverse=True) + unscored
+
+
+class SignTest:
+    """
+    A sequential paired sign test of a tracker against a baseline.
+
+    Call :py:meth:`update()` after each sequence; stop tracking once it returns ``True``. The
+    constructor only takes JSON types, so the test can be sent to a pilot server.
+
+    Args:
+        baseline_scores (dict): The baseline's mean IoU on each sequence.
+        sequences (list): The sequences the study will track, in order.
+        alpha (float): The probability of calling the tracker better when it is worse, or worse
+            when it is better.
+        tie_margin (float): IoU differences this small count as ties.
+        win_rate (float): The win rate of a better tracker, between 0.5 and 1. A worse tracker has
+            a win rate of ``1 - win_rate``.
+    """
+
+    def __init__(
+        self,
+        baseline_scores: dict,
+        sequences: list,
+        alpha: float = 0.05,
+        tie_margin: float = 0.01,
+        win_rate: float = 0.75,
+    ):
+        self.__baseline_scores = baseline_scores
+        self.__remaining = {sequence for sequence in sequences if sequence in baseline_scores}
+        self.__tie_margin = tie_margin
+        self.__step = math.log(win_rate / (1.0 - win_rate))
+        self.__bound = math.log((1.0 - alpha) / alpha)
+        self.__ratio = 0.0
+        self.__outcome = None
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+
+    @property
+    def outcome(self):
+        """The outcome of the test: ``BETTER``, ``WORSE``, ``INCONCLUSIVE``, or ``None``."""
+        return self.__outcome
+
+    def update(self, sequence: str, score: float) -> bool:
+        """
+        Add a sequence to the test.
+
+        Args:
+            sequence (str): The name of the sequence.
+            score (float): The tracker's mean IoU on the sequence.
+
+        Returns:
+            bool: ``True`` if the test is settled, and the study can stop.
+        """
+        if self.__outcome is not None or sequence not in self.__remaining:
+            return self.__outcome is not None
+        self.__remaining.discard(sequence)
+        difference = score - self.__baseline_scores[sequence]
+        if difference > self.__tie_margin:
+            self.wins += 1
+            self.__ratio += self.__step
+        elif difference < -self.__tie_margin:
+            self.losses += 1
+            self.__ratio -= self.__step
+        else:
+            self.ties += 1
+        if self.__ratio >= self.__bound:
+            self.__outcome = BETTER
+        elif self.__ratio <= -self.__bound:
+            self.__outcome = WORSE
+        elif abs(self.__ratio) + len(self.__remaining) * self.__step < self.__bound:
+            self.__outcome = INCONCLUSIVE
+        return self.__outcome is not None
@@ -0,0 +1,73 @@
+"""
+Estimate the uncertainty of benchmark scores by bootstrap resampling.
+
+A benchmark score is the mean of per-sequence scores, so it depends on which sequences the
+benchmark happens to include. This module resamples the sequences with replacement many times and
+recomputes every tracker's mean for each resample. The spread of the resampled means gives a
+confidence interval for each tracker, and the fraction of resamples in which one tracker beats
+another gives a win probability.
+
+All the resamples are one matrix product. Each row of a samples x sequences matrix counts how many
+times a resample draws each sequence, so the resampled means of every tracker are
+``scores @ counts.T / sequences``.
+
+Reference
+---------
+"""
+
+import numpy
+
+
+def resample_means(scores: numpy.ndarray, samples: int, seed: int = 0) -> numpy.ndarray:
+    """
+    Compute the means of bootstrap resamples of per-sequence scores.
+
+    Args:
+        scores (numpy.ndarray): The trackers x sequences scores.
+        samples (int): Draw this many resamples.
+        seed (int): Seed the random number generator with this value, so reports are repeatable.
+
+    Returns:
+        numpy.ndarray: The trackers x samples means. Every tracker uses the same resamples.
+    """
+    sequences = scores.shape[1]
+    counts = numpy.random.default_rng(seed).multinomial(
+        sequences, numpy.full(sequences, 1.0 / sequences), size=samples
+    )
+    return scores @ counts.T / sequences
+
+
+def confidence_intervals(means: numpy.ndarray, confidence: float = 0.95) -> tuple:
+    """
+    Compute percentile confidence intervals from resampled means.
+
+    Args:
+        means (numpy.ndarray): The trackers x samples means from :py:func:`resample_means()`.
+        confidence (float): The confidence level of the intervals, between 0 and 1.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the lower and upper bounds of each
+        tracker's interval.
+    """
+    alpha = (1.0 - confidence) / 2.0
+    lower, upper = numpy.quantile(means, [alpha, 1.0 - alpha], axis=1)
+    return lower, upper
+
+
+def win_probabilities(means: numpy.ndarray) -> numpy.ndarray:
+    """
+    Compute the probability that each tracker beats each other tracker.
+
+    Args:
+        means (numpy.ndarray): The trackers x samples means from :py:func:`resample_means()`.
+
+    Returns:
+        numpy.ndarray: The trackers x trackers probabilities. Element [i, j] is the fraction of
+        resamples in which tracker i has a higher mean than tracker j; ties count as half a win.
+        The diagonal is NaN.
+    """
+    rows = means[:, numpy.newaxis, :]
+    columns = means[numpy.newaxis, :, :]
+    wins = numpy.mean(rows > columns, axis=2) + 0.5 * numpy.mean(rows == columns, axis=2)
+    numpy.fill_diagonal(wins, numpy.nan)
+    return wins
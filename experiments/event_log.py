@@ -0,0 +1,269 @@
+"""
+Record the lifecycle and timing of tracking experiments as structured events.
+
+An :py:class:`EventLog` appends one JSON object per line to a file, and passes every event to its
+subscribers, such as the console and Slack notifiers. Writes are buffered; the log only touches the
+file when the buffer fills, when an error occurs, and when the log closes. Each event has these
+fields, plus the fields of its type:
+
+========= ========================================================================================
+Field     Meaning
+========= ========================================================================================
+``run``   An identifier shared by every event of one experiment run.
+``time``  The time of the event, in seconds since the epoch.
+``event`` The event type.
+========= ========================================================================================
+
+A :py:class:`RunRecorder` turns tracker timings into these events:
+
+================== ===============================================================================
+Event              Fields
+================== ===============================================================================
+``run_start``      ``tracker``, ``benchmark``, ``platform``
+``sequence_start`` ``sequence``, ``frames`` (``null`` if it is not known in advance)
+``sequence_end``   ``sequence``, ``frames`` tracked, ``initializations``, ``init_ms`` (mean),
+                   ``latency_ms`` (``mean``, ``p50``, ``p95``, and ``max`` of the updates), ``fps``,
+                   ``cached``
+``error``          ``message``, ``sequence`` (``null`` outside a sequence)
+``run_end``        ``status`` ('finished' or 'failed'), ``sequences``, ``cached_sequences``,
+                   ``frames``, ``wall_seconds``, ``tracking_seconds``, ``fps``
+================== ===============================================================================
+
+A sequence is ``cached`` if its output came from the :py:mod:`experiments.tracking_cache` instead
+of tracking. Its timings were measured by the run that stored the output, not by this run, so the
+``run_end`` ``frames``, ``tracking_seconds``, and ``fps`` only count the sequences that were
+tracked.
+
+Reference
+---------
+"""
+
+import json
+import os
+import time
+import uuid
+import numpy
+
+EVENT_FILE_NAME = "events.jsonl"
+
+
+class EventLog:
+    """
+    A buffered JSON lines event stream.
+
+    Args:
+        file_path (str | None): Append events to this file. If this is ``None``, events only go to
+            the subscribers.
+        buffer_size (int): Write the buffered events to the file when there are this many.
+
+    Attributes:
+        run (str): The identifier of the run this log records.
+    """
+
+    def __init__(self, file_path: str = None, buffer_size: int = 256) -> None:
+        self.run = uuid.uuid4().hex
+        self.__file = None
+        if file_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            self.__file = open(file_path, "a")
+        self.__buffer = []
+        self.__buffer_size = buffer_size
+        self.__subscribers = []
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def subscribe(self, subscriber) -> None:
+        """
+        Pass every future event to a subscriber.
+
+        Args:
+            subscriber: A callable that takes one argument, the event dictionary.
+        """
+        self.__subscribers.append(subscriber)
+
+    def emit(self, event: str, **fields) -> dict:
+        """
+        Record an event.
+
+        Args:
+            event (str): The event type, such as 'sequence_end'.
+            fields: The event's fields. The values must be serializable to JSON.
+
+        Returns:
+            dict: The complete event.
+        """
+        record = {"run": self.run, "time": time.time(), "event": event, **fields}
+        if self.__file is not None:
+            self.__buffer.append(json.dumps(record) + "\n")
+            if len(self.__buffer) >= self.__buffer_size or event == "error":
+                self.flush()
+        for subscriber in self.__subscribers:
+            subscriber(record)
+        return record
+
+    def flush(self) -> None:
+        """Write the buffered events to the file."""
+        if self.__file is not None and self.__buffer:
+            self.__file.writelines(self.__buffer)
+            self.__file.flush()
+            self.__buffer.clear()
+
+    def close(self) -> None:
+        """Write the buffered events, and close the file."""
+        self.flush()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class RunRecorder:
+    """
+    Turn the timings of one experiment run into events.
+
+    Args:
+        log (EventLog): Emit the events to this log.
+    """
+
+    def __init__(self, log: EventLog) -> None:
+        self.log = log
+        self.__start_time = None
+        self.__sequence = None
+        self.__initializations = []
+        self.__updates = []
+        self.__cached = False
+        self.__sequences = 0
+        self.__cached_sequences = 0
+        self.__frames = 0
+        self.__tracking_seconds = 0.0
+
+    @property
+    def sequence(self) -> str:
+        """str | None: The name of the sequence being tracked."""
+        return self.__sequence
+
+    def start_run(self, tracker_name: str, benchmark: str, platform: str) -> None:
+        """
+        Record the start of the run.
+
+        Args:
+            tracker_name (str): The name of the tracker.
+            benchmark (str): The benchmark, or benchmark version, of the experiment.
+            platform (str): The machine running the experiment.
+        """
+        self.__start_time = time.time()
+        self.log.emit("run_start", tracker=tracker_name, benchmark=benchmark, platform=platform)
+
+    def start_sequence(self, sequence_name: str, frames: int = None) -> None:
+        """
+        Record the start of a sequence, finishing the previous sequence if there is one.
+
+        Args:
+            sequence_name (str): The name of the sequence.
+            frames (int | None): The number of frames in the sequence, if it is known.
+        """
+        self.finish_sequence()
+        self.__sequence = sequence_name
+        self.log.emit("sequence_start", sequence=sequence_name, frames=frames)
+
+    def record_initialization(self, seconds: float) -> None:
+        """
+        Record the duration of a tracker initialization.
+
+        Args:
+            seconds (float): The duration, in seconds.
+        """
+        self.__initializations.append(seconds)
+
+    def record_update(self, seconds: float) -> None:
+        """
+        Record the duration of a tracker update.
+
+        Args:
+            seconds (float): The duration, in seconds.
+        """
+        self.__updates.append(seconds)
+
+    def record_times(self, times: numpy.ndarray, cached: bool = False) -> None:
+        """
+        Record the frame times of a one-pass sequence.
+
+        Args:
+            times (numpy.ndarray): The duration of each frame, in seconds. The first frame is the
+                initialization.
+            cached (bool): ``True`` if the times come from the tracking cache, instead of this run.
+        """
+        self.__cached = cached
+        if len(times) > 0:
+            self.__initializations.append(float(times[0]))
+            self.__updates.extend(times[1:].tolist())
+
+    def finish_sequence(self) -> None:
+        """Record the end of the current sequence, if there is one."""
+        if self.__sequence is None:
+            return
+        updates = numpy.array(self.__updates)
+        frames = len(self.__initializations) + len(updates)
+        seconds = float(numpy.sum(self.__initializations) + numpy.sum(updates))
+        latency = None
+        if len(updates) > 0:
+            p50, p95 = numpy.percentile(updates, [50, 95]) * 1000.0
+            latency = {
+                "mean": float(numpy.mean(updates)) * 1000.0,
+                "p50": float(p50),
+                "p95": float(p95),
+                "max": float(numpy.max(updates)) * 1000.0,
+            }
+        self.log.emit(
+            "sequence_end",
+            sequence=self.__sequence,
+            frames=frames,
+            initializations=len(self.__initializations),
+            init_ms=float(numpy.mean(self.__initializations)) * 1000.0
+            if self.__initializations
+            else None,
+            latency_ms=latency,
+            fps=frames / seconds if seconds > 0 else None,
+            cached=self.__cached,
+        )
+        self.__sequences += 1
+        if self.__cached:
+            self.__cached_sequences += 1
+        else:
+            self.__frames += frames
+            self.__tracking_seconds += seconds
+        self.__cached = False
+        self.__sequence = None
+        self.__initializations = []
+        self.__updates = []
+
+    def record_error(self, error: Exception) -> None:
+        """
+        Record an error.
+
+        Args:
+            error (Exception): The error.
+        """
+        self.log.emit("error", message=str(error), sequence=self.__sequence)
+
+    def finish_run(self, status: str) -> None:
+        """
+        Record the end of the run, with the run totals.
+
+        Args:
+            status (str): 'finished' if the run completed, or 'failed' if it stopped on an error.
+        """
+        self.finish_sequence()
+        self.log.emit(
+            "run_end",
+            status=status,
+            sequences=self.__sequences,
+            cached_sequences=self.__cached_sequences,
+            frames=self.__frames,
+            wall_seconds=time.time() - self.__start_time if self.__start_time else None,
+            tracking_seconds=self.__tracking_seconds,
+            fps=self.__frames / self.__tracking_seconds if self.__tracking_seconds > 0 else None,
+        )
@@ -5,6 +5,32 @@ This module runs a complete tracking experiment for a common tracking benchmark.
 not create reports; see :py:mod:`experiments.report` for information about generating reports
 from the experiment results.
 
+Real-Time Simulation
+--------------------
+
+GOT-10k experiments track every frame, however long the tracker takes. With ``--realtime-fps``,
+a one-pass experiment simulates a camera at that frame rate instead. Frame ``i`` arrives at
+``i / fps`` seconds. When the tracker finishes a frame, it skips to the latest frame that has
+arrived, measured by the tracker's actual initialization and update times. Skipped frames report
+the last tracked box, and their time is 0, so speed reports only count the tracked frames.
+
+The results go in a separate tracker directory, ``<tracker name>-realtime``, in the normal results
+tree, so reports score them next to the offline results. The directory also has a
+``realtime.json`` file with the camera frame rate and, for each sequence, the number of frames,
+the number of tracked frames, and the effective frame rate: tracked update frames per second of
+video. The speed report shows the effective frame rate in its ``RT FPS`` column. Real-time results
+depend on the machine's speed, so they never use the tracking cache.
+
+Isolating Sequences
+-------------------
+
+With ``--isolate``, a one-pass experiment tracks each sequence in a supervised child process, with
+the time limit, memory limit, and retries described in :py:mod:`experiments.isolation`. A sequence
+that crashes, hangs, or runs out of memory fails on its own; the experiment records the failure in
+the tracker's ``run_manifest.json`` and the event log, and moves on to the next sequence. Each
+child makes its own tracker, because a forked child cannot use CUDA once the experiment process has
+initialized it; this adds the tracker's start up time to each sequence.
+
 Running this Module as a Script
 -------------------------------
 
@@ -45,20 +71,38 @@ Reference
 
 import argparse
 import datetime
+import functools
+import json
 import os
 import sys
+import time
 from typing import Union
+import numpy
 import got10k.experiments
 import got10k.trackers
 import experiments.command_line as command_line
+import experiments.event_log as event_log
+import experiments.frame_ring as frame_ring
+import experiments.image_decoder as image_decoder
+import experiments.isolation as isolation
+import experiments.results_manifest as results_manifest
 import experiments.slack_reporter as slack_reporter
+import experiments.speed_report as speed_report
+import experiments.synthetic_dataset as synthetic_dataset
+import experiments.tracking_cache as tracking_cache
 
 sys.path.append(os.path.expanduser("~/repositories/py-MDNet"))
-import tracking.mdnet
+try:
+    import tracking.mdnet
+except ImportError:
+    tracking = None
 
 OTB_VERSIONS = ["tb50", "tb100"]
 VOT_VERSIONS = ["2019"]
 UAV_VERSIONS = ["uav123"]
+SYNTHETIC_VERSIONS = [f"synthetic-{layout}" for layout in synthetic_dataset.LAYOUTS]
+TRACKERS = ["mdnet", "null"]
+REALTIME_SUFFIX = "-realtime"
 
 
 def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.Namespace:
@@ -89,12 +133,32 @@ def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.Namesp
         "module for details about the file contents.",
         action=command_line.PathSanitizer,
     )
+    parser.add_argument(
+        "--tracker",
+        help="Run this tracker. The 'null' tracker reports the initial box on every frame; use it "
+        "to measure the overhead of decoding frames and writing results.",
+        choices=TRACKERS,
+        default="mdnet",
+    )
+    image_decoder.add_decoder_parameters(parser)
+    frame_ring.add_frame_ring_parameter(parser)
+    tracking_cache.add_cache_parameter(parser)
+    parser.add_argument(
+        "--realtime-fps",
+        help="Simulate a camera at this frame rate, and skip the frames that arrive while the "
+        "tracker is busy. The results are saved as '<tracker name>-realtime'. If this is 0, track "
+        "every frame. This only applies to one-pass benchmarks; VOT ignores it.",
+        type=float,
+        default=0.0,
+    )
+    isolation.add_isolation_parameters(parser)
     parser.add_argument(
         "benchmark",
         help="Use this benchmark for the tracking experiment. 'tb50' and 'tb100' are OTB "
         "benchmarks. '2019' is the VOT 2019 short-term benchmark. 'uav123' is the UAV123 "
-        "benchmark.",
-        choices=OTB_VERSIONS + VOT_VERSIONS + UAV_VERSIONS,
+        "benchmark. 'synthetic-otb' and 'synthetic-uav' are synthetic datasets; see the "
+        "experiments.synthetic_dataset module.",
+        choices=OTB_VERSIONS + VOT_VERSIONS + UAV_VERSIONS + SYNTHETIC_VERSIONS,
     )
     return parser
 
@@ -110,30 +174,534 @@ def main(arguments: argparse.Namespace) -> None:
     Args:
         arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
             have these attributes: ``tracker_name``, ``slack_file``, ``benchmark``, ``dataset_dir``,
-            and ``results_dir``.
+            ``results_dir``, ``tracker``, ``decoder``, ``frame_cache_dir``, ``frame_ring_slots``,
+            ``no_cache``, ``realtime_fps``, ``isolate``, ``sequence_timeout``, ``memory_limit``,
+            and ``retries``.
     """
     experiment = _make_experiment(arguments)
-    _run_tracker(experiment, arguments.tracker_name, arguments.slack_file)
+    results_manifest.record_dataset_dir(
+        arguments.results_dir, os.path.basename(experiment.result_dir), arguments.dataset_dir
+    )
+    realtime_fps = arguments.realtime_fps
+    supervisor = None
+    if arguments.isolate:
+        supervisor = isolation.Supervisor(
+            arguments.sequence_timeout, arguments.memory_limit, arguments.retries
+        )
+    if not isinstance(experiment, got10k.experiments.ExperimentOTB):
+        if realtime_fps > 0:
+            command_line.print_warning(
+                f"The {arguments.benchmark} benchmark does not support --realtime-fps; ignoring it."
+            )
+            realtime_fps = 0.0
+        if supervisor is not None:
+            command_line.print_warning(
+                f"The {arguments.benchmark} benchmark does not support --isolate; ignoring it."
+            )
+            supervisor = None
+    _run_tracker(
+        experiment,
+        arguments.tracker_name + (REALTIME_SUFFIX if realtime_fps > 0 else ""),
+        arguments.slack_file,
+        image_decoder.make_decoder(arguments.decoder, arguments.frame_cache_dir),
+        arguments.frame_ring_slots,
+        os.path.join(arguments.results_dir, event_log.EVENT_FILE_NAME),
+        arguments.tracker,
+        None if arguments.no_cache else tracking_cache.TrackingCache(),
+        realtime_fps,
+        supervisor,
+    )
 
 
 class _Got10kMdnet(got10k.trackers.Tracker):
     """
     A wrapper class so the GOT-10k tool can run MDNet.
 
+    The GOT-10k experiments pass either decoded images or image paths to :py:meth:`init()` and
+    :py:meth:`update()`. This class decodes image paths with its ``decoder``.
+
+    If the wrapper has a ``recorder``, it records each sequence and the duration of each
+    initialization and update. One-pass experiments call :py:meth:`track()` once per sequence;
+    pass the dataset's ``sequence_name``, because sequences such as OTB ``Jogging.1`` and
+    ``Jogging.2`` share a frame directory. Supervised experiments call :py:meth:`init()` and
+    :py:meth:`update()` directly, so call :py:meth:`add_sequence()` on every sequence before the
+    experiment. Then the wrapper starts a new sequence on each initialization at the first frame of
+    a sequence, but not on a re-initialization after a failure. GOT-10k times each
+    :py:meth:`init()` call, so :py:meth:`add_sequence()` also checks the decoder;
+    :py:meth:`init()` only checks the decoder on sequences that have not been checked.
+
+    If the wrapper has a ``cache`` and the tracker is deterministic, :py:meth:`track()` returns the
+    cached boxes and times of a sequence the tracker has already tracked with the same code and
+    options.
+
+    If ``realtime_fps`` is more than 0, :py:meth:`track()` simulates a camera at that frame rate;
+    see `Real-Time Simulation`_. Frames are decoded in process, and only the tracked frames are
+    decoded.
+
     Attributes:
-        tracker (tracking.mdnet.Mdnet): The actual MDNet tracker.
+        tracker (tracking.mdnet.Mdnet | _NullTracker): The actual tracker.
         name (str): The tracker's name. It is used in the reports and results output.
+        decoder: Decode image files with this :py:mod:`experiments.image_decoder` backend.
+        frame_ring_slots (int): The number of :py:class:`experiments.frame_ring.FrameRing` slots
+            :py:meth:`track()` uses. If this is 0, :py:meth:`track()` decodes frames in process.
+        recorder (experiments.event_log.RunRecorder | None): Record sequences and tracker timings
+            with this recorder.
+        cache (experiments.tracking_cache.TrackingCache | None): Reuse tracker output from this
+            cache, and store new output in it. Real-time simulations never use the cache.
+        realtime_fps (float): The frame rate of the simulated camera. If this is 0,
+            :py:meth:`track()` tracks every frame.
+        realtime_sequences (dict): The real-time summary of each sequence :py:meth:`track()` has
+            simulated, from :py:func:`_realtime_summary()`.
     """
 
-    def __init__(self, tracker: tracking.mdnet.Mdnet, name: str) -> None:
+    def __init__(
+        self,
+        tracker,
+        name: str,
+        decoder=None,
+        frame_ring_slots: int = 0,
+        recorder: event_log.RunRecorder = None,
+        cache: tracking_cache.TrackingCache = None,
+        realtime_fps: float = 0.0,
+    ) -> None:
         super().__init__(name=name, is_deterministic="random_seed" in tracker.opts)
         self.tracker = tracker
+        self.decoder = image_decoder.PilDecoder() if decoder is None else decoder
+        self.frame_ring_slots = frame_ring_slots
+        self.recorder = recorder
+        self.realtime_fps = realtime_fps
+        self.realtime_sequences = {}
+        self.cache = cache if self.is_deterministic and realtime_fps <= 0 else None
+        self.__verified_directories = set()
+        self.__sequence_names = {}
+
+    def add_sequence(self, sequence_name: str, img_files: list) -> None:
+        """
+        Name a sequence of a supervised experiment, and check the decoder on its first frame.
+
+        Args:
+            sequence_name (str): The name of the sequence in the dataset.
+            img_files (list): The paths to the sequence frames.
+
+        Raises:
+            RuntimeError: This is raised if the decoder does not match Pillow on the first frame.
+        """
+        self.__sequence_names[img_files[0]] = sequence_name
+        if not isinstance(self.decoder, image_decoder.PilDecoder):
+            self.verify_decoder(img_files[0])
+
+    def verify_decoder(self, image_file: str) -> None:
+        """
+        Check the decoder against Pillow on a frame, once per sequence directory.
+
+        Args:
+            image_file (str): The path to the first frame of a sequence.
+
+        Raises:
+            RuntimeError: This is raised if the decoder does not match Pillow on the frame.
+        """
+        directory = os.path.dirname(image_file)
+        if directory not in self.__verified_directories:
+            image_decoder.verify_decoder(self.decoder, [image_file])
+            self.__verified_directories.add(directory)
 
     def init(self, image, box):
+        if isinstance(image, str):
+            if self.recorder is not None:
+                if self.__sequence_names:
+                    sequence_name = self.__sequence_names.get(image)
+                else:
+                    sequence_name = _sequence_name(image)
+                    if sequence_name == self.recorder.sequence:
+                        sequence_name = None
+                if sequence_name is not None:
+                    self.recorder.start_sequence(sequence_name)
+            self.verify_decoder(image)
+            image = self.decoder.decode(image)
+        start_time = time.time()
         self.tracker.initialize(image, box)
+        if self.recorder is not None:
+            self.recorder.record_initialization(time.time() - start_time)
 
     def update(self, image):
-        return self.tracker.find_target(image)
+        if isinstance(image, str):
+            image = self.decoder.decode(image)
+        start_time = time.time()
+        box = self.tracker.find_target(image)
+        if self.recorder is not None:
+            self.recorder.record_update(time.time() - start_time)
+        return box
+
+    def track(self, img_files, box, visualize=False, sequence_name=None):
+        if sequence_name is None:
+            sequence_name = _sequence_name(img_files[0])
+        if self.recorder is not None:
+            self.recorder.start_sequence(sequence_name, len(img_files))
+        key = None
+        output = None
+        if self.cache is not None:
+            key = tracking_cache.tracking_key(self.tracker, sequence_name, img_files, box)
+            output = self.cache.get(key)
+        cached = output is not None
+        tracked = None
+        if output is None and self.realtime_fps > 0:
+            output, tracked = self.__track_realtime(img_files, box)
+            self.realtime_sequences[sequence_name] = _realtime_summary(tracked, self.realtime_fps)
+        elif output is None:
+            output = self.__track(img_files, box, visualize)
+            if self.cache is not None:
+                self.cache.put(key, *output)
+        if self.recorder is not None:
+            self.recorder.record_times(
+                output[1] if tracked is None else output[1][tracked], cached=cached
+            )
+            self.recorder.finish_sequence()
+        return output
+
+    def __track(self, img_files, box, visualize):
+        # This mirrors got10k.trackers.Tracker.track(), except that it decodes frames with the
+        # decoder backend instead of always using Pillow. Decoding is excluded from the times.
+        boxes = numpy.zeros((len(img_files), 4))
+        boxes[0] = box
+        times = numpy.zeros(len(img_files))
+        image_decoder.verify_decoder(self.decoder, img_files[:1])
+        with frame_ring.decoded_frames(img_files, self.decoder, self.frame_ring_slots) as images:
+            for frame, image in enumerate(images):
+                start_time = time.time()
+                if frame == 0:
+                    self.tracker.initialize(image, box)
+                else:
+                    boxes[frame, :] = self.tracker.find_target(image)
+                times[frame] = time.time() - start_time
+                if visualize:
+                    got10k.utils.viz.show_frame(image, boxes[frame, :])
+        return boxes, times
+
+    def __track_realtime(self, img_files, box) -> tuple:
+        """
+        Track a sequence as it arrives from a simulated camera.
+
+        Args:
+            img_files (list): The paths to the sequence frames.
+            box: The initial target box.
+
+        Returns:
+            tuple: A tuple of ((numpy.ndarray, numpy.ndarray), numpy.ndarray); the boxes and times
+            of every frame, and a mask of the tracked frames.
+        """
+        boxes = numpy.zeros((len(img_files), 4))
+        boxes[0] = box
+        times = numpy.zeros(len(img_files))
+        tracked = numpy.zeros(len(img_files), bool)
+        interval = 1.0 / self.realtime_fps
+        image_decoder.verify_decoder(self.decoder, img_files[:1])
+        frame = 0
+        clock = 0.0
+        while frame < len(img_files):
+            image = self.decoder.decode(img_files[frame])
+            start_time = time.time()
+            if frame == 0:
+                self.tracker.initialize(image, box)
+            else:
+                boxes[frame, :] = self.tracker.find_target(image)
+            times[frame] = time.time() - start_time
+            tracked[frame] = True
+            # The tracker starts a frame when the frame arrives or when it finishes the previous
+            # frame, whichever is later. Then it skips to the latest frame that has arrived.
+            clock = max(clock, frame * interval) + times[frame]
+            next_frame = min(max(frame + 1, int(clock / interval)), len(img_files))
+            boxes[frame + 1 : next_frame] = boxes[frame]
+            frame = next_frame
+        return (boxes, times), tracked
+
+
+def _realtime_summary(tracked: numpy.ndarray, fps: float) -> dict:
+    """
+    Summarize the real-time simulation of a sequence.
+
+    Args:
+        tracked (numpy.ndarray): The mask of tracked frames.
+        fps (float): The frame rate of the simulated camera.
+
+    Returns:
+        dict: The number of ``frames``, the number of ``tracked`` frames, and the
+        ``effective_fps``: the tracked update frames per second of video. The effective frame rate
+        is ``None`` for sequences with one frame.
+    """
+    updates = int(numpy.count_nonzero(tracked[1:]))
+    return {
+        "frames": len(tracked),
+        "tracked": int(numpy.count_nonzero(tracked)),
+        "effective_fps": updates * fps / (len(tracked) - 1) if len(tracked) > 1 else None,
+    }
+
+
+def _save_realtime_summary(
+    experiment, tracker_name: str, camera_fps: float, sequences: dict
+) -> None:
+    """
+    Save the real-time summaries of a tracker's sequences in its results directory.
+
+    Summaries of sequences from earlier runs are kept, unless this run simulated them again.
+
+    Args:
+        experiment (got10k.experiments.ExperimentOTB): The experiment the tracker ran.
+        tracker_name (str): The name of the tracker.
+        camera_fps (float): The frame rate of the simulated camera.
+        sequences (dict): The real-time summary of each sequence the tracker simulated.
+    """
+    file_path = os.path.join(experiment.result_dir, tracker_name, speed_report.REALTIME_FILE_NAME)
+    summary = {"camera_fps": camera_fps, "sequences": {}}
+    if os.path.isfile(file_path):
+        with open(file_path, "r") as summary_file:
+            summary = json.load(summary_file)
+        if summary["camera_fps"] != camera_fps:
+            command_line.print_warning(
+                f"{file_path} is for a {summary['camera_fps']} FPS camera; replacing it."
+            )
+            summary = {"camera_fps": camera_fps, "sequences": {}}
+    summary["sequences"].update(sequences)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    saved = summary["sequences"].values()
+    updates = sum(s["tracked"] - 1 for s in saved)
+    seconds = sum(s["frames"] - 1 for s in saved) / camera_fps
+    if seconds > 0:
+        command_line.print_information(
+            f"Real-time simulation at {camera_fps:g} FPS: "
+            f"effective frame rate {updates / seconds:.1f} FPS."
+        )
+
+
+def _pending_sequences(experiment, tracker_name: str):
+    """
+    Find the sequences of a one-pass GOT-10k experiment that do not have results yet.
+
+    This mirrors the loop in ``got10k.experiments.ExperimentOTB.run()``, except that it names each
+    sequence from the dataset.
+
+    Args:
+        experiment (got10k.experiments.ExperimentOTB): Find the sequences of this experiment.
+        tracker_name (str): The name of the tracker.
+
+    Yields:
+        tuple: A tuple of (str, list, numpy.ndarray, str); the name of the sequence, the paths to
+        its frames, its annotations, and the path to its record file.
+    """
+    print(f"Running tracker {tracker_name} on {type(experiment.dataset).__name__}...")
+    for s, (img_files, anno) in enumerate(experiment.dataset):
+        sequence_name = experiment.dataset.seq_names[s]
+        print(f"--Sequence {s + 1}/{len(experiment.dataset)}: {sequence_name}")
+        record_file = os.path.join(experiment.result_dir, tracker_name, f"{sequence_name}.txt")
+        if os.path.exists(record_file):
+            print("  Found results, skipping", sequence_name)
+            continue
+        yield sequence_name, img_files, anno, record_file
+
+
+def _run_one_pass(experiment, tracker: _Got10kMdnet) -> None:
+    """
+    Run a one-pass GOT-10k experiment.
+
+    This mirrors ``got10k.experiments.ExperimentOTB.run()``, except that it passes the name of each
+    sequence to the tracker.
+
+    Args:
+        experiment (got10k.experiments.ExperimentOTB): Run this experiment.
+        tracker (_Got10kMdnet): Run this tracker.
+    """
+    for sequence_name, img_files, anno, record_file in _pending_sequences(experiment, tracker.name):
+        boxes, times = tracker.track(img_files, anno[0, :], sequence_name=sequence_name)
+        experiment._record(record_file, boxes, times)  # pylint: disable=protected-access
+
+
+def _run_isolated(
+    experiment,
+    tracker_name: str,
+    make_tracker,
+    supervisor: isolation.Supervisor,
+    recorder,
+    realtime_sequences: dict,
+) -> None:
+    """
+    Run a one-pass GOT-10k experiment with each sequence in a supervised child process.
+
+    This mirrors ``got10k.experiments.ExperimentOTB.run()``, except that a failed sequence does
+    not stop the experiment. The function records the outcome of each sequence in the tracker's
+    :py:class:`experiments.isolation.RunManifest`, and emits an error event for each failure.
+
+    Each child makes its own tracker, so this process never loads the model or initializes CUDA.
+
+    Args:
+        experiment (got10k.experiments.ExperimentOTB): Run this experiment.
+        tracker_name (str): The name of the tracker.
+        make_tracker: Make the :py:class:`_Got10kMdnet` tracker in each child process. This takes
+            one keyword argument, the ``recorder`` for the tracker.
+        supervisor (experiments.isolation.Supervisor): Run each sequence with this supervisor.
+        recorder (experiments.event_log.RunRecorder): Record the sequences and their times with
+            this recorder.
+        realtime_sequences (dict): Add the real-time summary of each sequence to this dictionary,
+            if the tracker simulates real time.
+    """
+    manifest = isolation.RunManifest(
+        os.path.join(experiment.result_dir, tracker_name, isolation.MANIFEST_FILE_NAME)
+    )
+    failures = 0
+    for sequence_name, img_files, anno, record_file in _pending_sequences(
+        experiment, tracker_name
+    ):
+        try:
+            (output, times, cached, realtime), attempts = supervisor.run(
+                functools.partial(
+                    _track_in_child, make_tracker, sequence_name, img_files, anno[0, :]
+                )
+            )
+        except isolation.IsolationError as error:
+            failures += 1
+            manifest.record(sequence_name, "failed", error.attempts, str(error), recorder.log.run)
+            recorder.log.emit("error", message=f"{sequence_name} {error}", sequence=sequence_name)
+            continue
+        experiment._record(record_file, *output)  # pylint: disable=protected-access
+        recorder.start_sequence(sequence_name, len(times))
+        recorder.record_times(times, cached=cached)
+        recorder.finish_sequence()
+        if realtime is not None:
+            realtime_sequences[sequence_name] = realtime
+        manifest.record(sequence_name, "finished", attempts, run=recorder.log.run)
+    if failures > 0:
+        command_line.print_warning(
+            f"{failures} sequences failed; see {manifest.file_path} for the reasons."
+        )
+
+
+def _track_in_child(make_tracker, sequence_name: str, img_files: list, box) -> tuple:
+    """
+    Track a sequence in an isolated child process.
+
+    The child must not write to the parent's event log, so the tracker records its times with a
+    :py:class:`_CapturingRecorder` instead, and the parent records them.
+
+    Args:
+        make_tracker: Make the :py:class:`_Got10kMdnet` tracker. This takes one keyword argument,
+            the ``recorder`` for the tracker.
+        sequence_name (str): The name of the sequence.
+        img_files (list): The paths to the sequence frames.
+        box: The initial target box.
+
+    Returns:
+        tuple: A tuple of ((numpy.ndarray, numpy.ndarray), numpy.ndarray, bool, dict | None); the
+        boxes and times from :py:meth:`_Got10kMdnet.track()`, the times the tracker recorded,
+        whether those times came from the tracking cache, and the sequence's real-time summary, if
+        the tracker simulated real time.
+    """
+    recorder = _CapturingRecorder()
+    tracker = make_tracker(recorder=recorder)
+    output = tracker.track(img_files, box, sequence_name=sequence_name)
+    return (
+        output,
+        recorder.times,
+        recorder.cached,
+        tracker.realtime_sequences.get(sequence_name),
+    )
+
+
+class _CapturingRecorder:
+    """
+    A stand-in for :py:class:`experiments.event_log.RunRecorder` that keeps the frame times of one
+    one-pass sequence.
+
+    Attributes:
+        sequence (str | None): The name of the sequence.
+        times (numpy.ndarray): The recorded frame times.
+        cached (bool): ``True`` if the times came from the tracking cache.
+    """
+
+    def __init__(self) -> None:
+        self.sequence = None
+        self.times = numpy.empty(0)
+        self.cached = False
+
+    # pylint: disable-next=unused-argument
+    def start_sequence(self, name: str, frames: int = None) -> None:
+        """
+        Start the sequence.
+
+        Args:
+            name (str): The name of the sequence.
+            frames (int | None): This is not used in the method.
+        """
+        self.sequence = name
+
+    def record_times(self, times: numpy.ndarray, cached: bool = False) -> None:
+        """
+        Keep the frame times of the sequence.
+
+        Args:
+            times (numpy.ndarray): The duration of each frame, in seconds.
+            cached (bool): ``True`` if the times come from the tracking cache.
+        """
+        self.times = numpy.asarray(times)
+        self.cached = cached
+
+    def finish_sequence(self) -> None:
+        """Do nothing; the parent process records the sequence."""
+
+
+def _sequence_name(image_file: str) -> str:
+    """
+    Get the name of the sequence that contains a frame, for callers that do not pass the dataset's
+    name. This is ambiguous for datasets with several sequences in one directory, such as OTB
+    ``Jogging.1`` and ``Jogging.2``.
+
+    Args:
+        image_file (str): The path to the frame.
+
+    Returns:
+        str: The name of the sequence directory. OTB and UAV123 keep frames in an ``img``
+        subdirectory, and VOT 2019 keeps frames in a ``color`` subdirectory; these are skipped.
+    """
+    directory = os.path.dirname(image_file)
+    if os.path.basename(directory) in ("img", "color"):
+        directory = os.path.dirname(directory)
+    return os.path.basename(directory)
+
+
+class _NullTracker:
+    """
+    A tracker that does no work. It reports the last known box on every frame, which is always the
+    initial box.
+
+    Attributes:
+        opts (dict): The tracker options. This mirrors ``tracking.mdnet.Mdnet`` so the GOT-10k
+            wrapper treats the tracker as deterministic.
+    """
+
+    def __init__(self) -> None:
+        self.opts = {"random_seed": 0}
+        self.__box = None
+
+    def initialize(self, image, box) -> None:  # pylint: disable=unused-argument
+        """
+        Remember the initial box.
+
+        Args:
+            image: This is not used in the method.
+            box: The initial target box.
+        """
+        self.__box = numpy.array(box, dtype=float)
+
+    def find_target(self, image) -> numpy.ndarray:  # pylint: disable=unused-argument
+        """
+        Report the last known box.
+
+        Args:
+            image: This is not used in the method.
+
+        Returns:
+            numpy.ndarray: The last known box.
+        """
+        return self.__box
 
 
 class _ConsoleReporter:
@@ -152,6 +720,49 @@ class _ConsoleReporter:
         print(message)
 
 
+class _NotifierSubscriber:
+    """
+    An :py:class:`experiments.event_log.EventLog` subscriber that forwards the run start, errors,
+    and the run end to a notifier. The subscriber ignores per-sequence events.
+
+    Attributes:
+        notifier (_ConsoleReporter | slack_reporter.SlackReporter): Send messages with this
+            notifier.
+    """
+
+    def __init__(self, notifier: Union[_ConsoleReporter, slack_reporter.SlackReporter]) -> None:
+        self.notifier = notifier
+
+    def __call__(self, event: dict) -> None:
+        """
+        Send a message for an event, if the event is one the notifier reports.
+
+        Args:
+            event (dict): The event from the event log.
+        """
+        timestamp = datetime.datetime.fromtimestamp(event["time"]).isoformat(
+            sep=" ", timespec="minutes"
+        )
+        if event["event"] == "run_start":
+            self.notifier.send_message(
+                f"Starting {event['tracker']} {event['benchmark']} experiment at {timestamp}"
+            )
+        elif event["event"] == "error":
+            self.notifier.send_message(f"Error during experiment: '{event['message']}'")
+        elif event["event"] == "run_end" and event["status"] == "finished":
+            self.notifier.send_message(
+                f"Experiment finished at {timestamp}: {event['sequences']} sequences"
+                + (
+                    f" ({event['cached_sequences']} from the tracking cache), "
+                    if event["cached_sequences"]
+                    else ", "
+                )
+                + f"{event['frames']} frames, "
+                + ("N/A" if event["fps"] is None else f"{event['fps']:.1f}")
+                + " FPS"
+            )
+
+
 def _make_notifier(
     configuration_file: str, source: str
 ) -> Union[_ConsoleReporter, slack_reporter.SlackReporter]:
@@ -195,7 +806,7 @@ def _make_experiment(experiment_configuration: argparse.Namespace):
         return got10k.experiments.ExperimentVOT(
             experiment_configuration.dataset_dir,
             int(experiment_configuration.benchmark),
-            read_image=True,
+            read_image=False,
             experiments="supervised",
             result_dir=experiment_configuration.results_dir,
         )
@@ -205,12 +816,29 @@ def _make_experiment(experiment_configuration: argparse.Namespace):
             experiment_configuration.benchmark.upper(),
             experiment_configuration.results_dir,
         )
+    if experiment_configuration.benchmark in SYNTHETIC_VERSIONS:
+        return synthetic_dataset.make_experiment(
+            experiment_configuration.dataset_dir,
+            experiment_configuration.benchmark.split("-")[1],
+            experiment_configuration.results_dir,
+        )
     raise ValueError(
         f"Experiment version '{experiment_configuration.benchmark}' is unknown."
     )
 
 
-def _run_tracker(experiment, tracker_name: str, slack_file: str) -> None:
+def _run_tracker(
+    experiment,
+    tracker_name: str,
+    slack_file: str,
+    decoder=None,
+    frame_ring_slots: int = 0,
+    event_file: str = None,
+    tracker_type: str = "mdnet",
+    cache: tracking_cache.TrackingCache = None,
+    realtime_fps: float = 0.0,
+    supervisor: isolation.Supervisor = None,
+) -> None:
     """
     Run an experiment based on the GOT-10k toolkit.
 
@@ -219,29 +847,150 @@ def _run_tracker(experiment, tracker_name: str, slack_file: str) -> None:
         tracker_name (str): The name of the tracker to run within the ``experiment``.
         slack_file (str | None): The Slack configuration file. If this is ``None``, console
             notifications are used.
+        decoder: Decode frames with this :py:mod:`experiments.image_decoder` backend. If this is
+            ``None``, the tracker decodes frames with Pillow.
+        frame_ring_slots (int): Decode frames in a separate process with a frame ring of this many
+            slots. If this is 0, decode frames in the tracker process.
+        event_file (str | None): Append the run's events to this JSON lines file. If this is
+            ``None``, the events only go to the notifier.
+        tracker_type (str): Run this tracker, either 'mdnet' or 'null'.
+        cache (experiments.tracking_cache.TrackingCache | None): Reuse tracker output from this
+            cache, and store new output in it.
+        realtime_fps (float): Simulate a camera at this frame rate. If this is 0, track every
+            frame. The ``experiment`` must be a one-pass experiment if this is more than 0.
+        supervisor (experiments.isolation.Supervisor | None): If this is not ``None``, run each
+            sequence in a child process with this supervisor. The ``experiment`` must be a
+            one-pass experiment.
     """
-    notifier = _make_notifier(slack_file, sys.platform)
-    tracker = _Got10kMdnet(
-        tracking.mdnet.Mdnet(
-            tracking.mdnet.read_configuration(
-                os.path.expanduser("~/repositories/py-MDNet/tracking/options.yaml")
+    with event_log.EventLog(event_file) as log:
+        log.subscribe(_NotifierSubscriber(_make_notifier(slack_file, sys.platform)))
+        recorder = event_log.RunRecorder(log)
+        tracker = None
+        realtime_sequences = {}
+        if supervisor is None:
+            tracker = _make_tracker(
+                tracker_type,
+                tracker_name,
+                decoder,
+                frame_ring_slots,
+                recorder,
+                cache,
+                realtime_fps,
             )
-        ),
+            realtime_sequences = tracker.realtime_sequences
+        else:
+            _check_tracker_type(tracker_type)
+        recorder.start_run(tracker_name, str(experiment.dataset.version), sys.platform)
+        try:
+            if supervisor is not None:
+                _run_isolated(
+                    experiment,
+                    tracker_name,
+                    functools.partial(
+                        _make_tracker,
+                        tracker_type,
+                        tracker_name,
+                        decoder,
+                        frame_ring_slots,
+                        cache=cache,
+                        realtime_fps=realtime_fps,
+                    ),
+                    supervisor,
+                    recorder,
+                    realtime_sequences,
+                )
+            elif isinstance(experiment, got10k.experiments.ExperimentOTB):
+                _run_one_pass(experiment, tracker)
+            else:
+                for s, (img_files, *_) in enumerate(experiment.dataset):
+                    tracker.add_sequence(experiment.dataset.seq_names[s], img_files)
+                experiment.run(tracker)
+        except Exception as error:  # pylint: disable=broad-except
+            recorder.record_error(error)
+            recorder.finish_run("failed")
+        else:
+            recorder.finish_run("finished")
+        finally:
+            if realtime_fps > 0:
+                _save_realtime_summary(experiment, tracker_name, realtime_fps, realtime_sequences)
+
+
+def _make_tracker(
+    tracker_type: str,
+    tracker_name: str,
+    decoder,
+    frame_ring_slots: int,
+    recorder: event_log.RunRecorder,
+    cache: tracking_cache.TrackingCache = None,
+    realtime_fps: float = 0.0,
+) -> _Got10kMdnet:
+    """
+    Make the tracker for an experiment.
+
+    Args:
+        tracker_type (str): Make this tracker, either 'mdnet' or 'null'.
+        tracker_name (str): The name of the tracker.
+        decoder: Decode frames with this :py:mod:`experiments.image_decoder` backend.
+        frame_ring_slots (int): The number of frame ring slots the tracker uses.
+        recorder (experiments.event_log.RunRecorder): Record sequences and timings with this
+            recorder.
+        cache (experiments.tracking_cache.TrackingCache | None): Reuse tracker output from this
+            cache, and store new output in it.
+        realtime_fps (float): Simulate a camera at this frame rate. If this is 0, track every
+            frame.
+
+    Returns:
+        _Got10kMdnet: The tracker, ready for a GOT-10k experiment.
+
+    Raises:
+        RuntimeError: This is raised if ``tracker_type`` is 'mdnet' and py-MDNet is not installed.
+    """
+    return _Got10kMdnet(
+        _make_base_tracker(tracker_type),
         name=tracker_name,
+        decoder=decoder,
+        frame_ring_slots=frame_ring_slots,
+        recorder=recorder,
+        cache=cache,
+        realtime_fps=realtime_fps,
     )
-    notifier.send_message(
-        f"Starting {tracker_name} {str(experiment.dataset.version)} experiment at "
-        f"{datetime.datetime.today().isoformat(sep=' ', timespec='minutes')}"
-    )
-    try:
-        experiment.run(tracker)
-    except Exception as error:  # pylint: disable=broad-except
-        notifier.send_message(f"Error during experiment: '{str(error)}'")
-    else:
-        notifier.send_message(
-            "Experiment finished at "
-            + datetime.datetime.today().isoformat(sep=" ", timespec="minutes")
+
+
+def _make_base_tracker(tracker_type: str):
+    """
+    Make a tracker, without the GOT-10k wrapper.
+
+    Args:
+        tracker_type (str): Make this tracker, either 'mdnet' or 'null'.
+
+    Returns:
+        tracking.mdnet.Mdnet | _NullTracker: The tracker.
+
+    Raises:
+        RuntimeError: This is raised if ``tracker_type`` is 'mdnet' and py-MDNet is not installed.
+    """
+    _check_tracker_type(tracker_type)
+    if tracker_type == "null":
+        return _NullTracker()
+    return tracking.mdnet.Mdnet(
+        tracking.mdnet.read_configuration(
+            os.path.expanduser("~/repositories/py-MDNet/tracking/options.yaml")
         )
+    )
+
+
+def _check_tracker_type(tracker_type: str) -> None:
+    """
+    Check that a tracker can run here.
+
+    Args:
+        tracker_type (str): Check this tracker, either 'mdnet' or 'null'.
+
+    Raises:
+        RuntimeError: This is raised if ``tracker_type`` is 'mdnet' and py-MDNet is not installed.
+    """
+    if tracker_type == "mdnet" and tracking is None:
+        raise RuntimeError("The mdnet tracker requires py-MDNet in ~/repositories/py-MDNet.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+"""
+Decode frames in a separate process and share them with the tracker through shared memory.
+
+A :py:class:`FrameRing` starts a decoder process that writes each frame of a sequence into one slot
+of a fixed-size ring buffer in shared memory. The tracker process reads NumPy views of the slots,
+so decoding never competes with the tracker for the GIL, and the frames are never pickled or copied
+between the processes.
+
+.. code-block:: python
+
+    import experiments.frame_ring as frame_ring
+    import experiments.image_decoder as image_decoder
+
+    with frame_ring.FrameRing(image_files, image_decoder.PilDecoder(), slots=8) as frames:
+        for frame in frames:
+            track(frame)
+
+Each view is valid only until the loop requests the next frame; after that the decoder process may
+overwrite the slot. Copy a frame if you need to keep it.
+
+The ring always removes its shared memory segment when it closes, including when the decoder
+process crashes. If the tracker process itself dies, the ``multiprocessing`` resource tracker
+removes the segment, and the decoder process exits when it notices that its parent is gone. The
+segment names start with :py:func:`segment_prefix()` of the tracker process, so a supervisor that
+kills a tracker process can call :py:func:`remove_segments()` instead of waiting for the resource
+tracker.
+
+Use :py:func:`decoded_frames()` to switch between in-process decoding and a frame ring with a
+command line option.
+
+Reference
+---------
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import multiprocessing.shared_memory
+import os
+import queue
+import secrets
+import traceback
+import numpy
+import PIL.Image
+
+# The decoder process writes each frame's height and width to the slot header.
+_HEADER_FIELDS = 2
+
+# Wait this long, in seconds, before a blocked process checks whether its peer is still alive.
+_POLL_INTERVAL = 0.5
+
+# POSIX shared memory segments are files in this directory on Linux.
+_SHARED_MEMORY_DIR = "/dev/shm"
+
+
+class FrameRing:
+    """
+    A ring buffer of decoded frames in shared memory, filled by a decoder process.
+
+    The ring uses the ``fork`` start method; the decoder process inherits the shared memory mapping
+    instead of attaching to the segment by name.
+
+    Args:
+        image_paths (list): Decode these images, in order.
+        decoder: Decode images with this :py:mod:`experiments.image_decoder` backend.
+        slots (int): The number of frames the ring can hold. This is the maximum number of frames
+            the decoder process decodes ahead of the tracker.
+
+    Raises:
+        ValueError: This is raised if ``slots`` is less than 2.
+    """
+
+    def __init__(self, image_paths: list, decoder, slots: int = 8) -> None:
+        if slots < 2:
+            raise ValueError(f"A frame ring needs at least 2 slots, not {slots}.")
+        self.__image_paths = list(image_paths)
+        self.__decoder = decoder
+        self.__slots = slots
+        width, height = PIL.Image.open(self.__image_paths[0]).size
+        self.__slot_shape = (height, width, 3)
+        self.__memory = None
+        self.__process = None
+        self.__context = multiprocessing.get_context("fork")
+        self.__free_slots = self.__context.Semaphore(slots)
+        self.__filled_slots = self.__context.Semaphore(0)
+        self.__stop = self.__context.Event()
+        self.__errors = self.__context.Queue()
+
+    def __enter__(self) -> "FrameRing":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.__image_paths)
+
+    def open(self) -> None:
+        """Create the shared memory segment and start the decoder process."""
+        frame_bytes = int(numpy.prod(self.__slot_shape))
+        header_bytes = _HEADER_FIELDS * numpy.dtype(numpy.int64).itemsize
+        self.__memory = multiprocessing.shared_memory.SharedMemory(
+            name=segment_prefix(os.getpid()) + secrets.token_hex(8),
+            create=True,
+            size=self.__slots * (header_bytes + frame_bytes),
+        )
+        self.__process = self.__context.Process(
+            target=self.__decode_frames, name="flatfoot-frame-ring", daemon=True
+        )
+        try:
+            self.__process.start()
+        except BaseException:
+            self.__release_memory()
+            raise
+
+    def close(self) -> None:
+        """
+        Stop the decoder process and remove the shared memory segment.
+
+        It is safe to call this more than once.
+        """
+        if self.__process is not None:
+            self.__stop.set()
+            # Unblock the decoder process if it is waiting for a free slot.
+            self.__free_slots.release()
+            self.__process.join(timeout=5.0)
+            if self.__process.is_alive():
+                self.__process.terminate()
+                self.__process.join()
+            self.__process = None
+        self.__release_memory()
+
+    def __iter__(self):
+        """
+        Iterate over the decoded frames.
+
+        Yields:
+            numpy.ndarray: A read-only, height x width x 3 view of the frame in shared memory. The
+            view is valid until the next iteration.
+
+        Raises:
+            RuntimeError: This is raised if the decoder process fails or dies.
+        """
+        for index in range(len(self.__image_paths)):
+            self.__wait_for_frame()
+            height, width = self.__header(index % self.__slots)
+            frame = self.__frame(index % self.__slots)[:height, :width]
+            frame.flags.writeable = False
+            yield frame
+            del frame
+            self.__free_slots.release()
+
+    def __wait_for_frame(self) -> None:
+        while not self.__filled_slots.acquire(timeout=_POLL_INTERVAL):
+            self.__raise_decoder_error()
+            if not self.__process.is_alive():
+                self.__raise_decoder_error()
+                raise RuntimeError(
+                    f"The frame ring decoder process died with exit code "
+                    f"{self.__process.exitcode}."
+                )
+
+    def __raise_decoder_error(self) -> None:
+        try:
+            message = self.__errors.get_nowait()
+        except queue.Empty:
+            return
+        raise RuntimeError(f"The frame ring decoder process failed:\n{message}")
+
+    def __decode_frames(self) -> None:
+        """The body of the decoder process."""
+        parent = os.getppid()
+        try:
+            for index, image_path in enumerate(self.__image_paths):
+                while not self.__free_slots.acquire(timeout=_POLL_INTERVAL):
+                    if os.getppid() != parent:
+                        return
+                if self.__stop.is_set():
+                    return
+                image = numpy.asarray(self.__decoder.decode(image_path))
+                if any(a > b for a, b in zip(image.shape, self.__slot_shape)):
+                    raise ValueError(
+                        f"{image_path} has shape {image.shape}, which does not fit in a "
+                        f"{self.__slot_shape} slot."
+                    )
+                slot = index % self.__slots
+                self.__frame(slot)[: image.shape[0], : image.shape[1]] = image
+                self.__header(slot)[:] = image.shape[:2]
+                self.__filled_slots.release()
+        except Exception:  # pylint: disable=broad-except
+            self.__errors.put(traceback.format_exc())
+
+    def __header(self, slot: int) -> numpy.ndarray:
+        return numpy.ndarray(
+            (_HEADER_FIELDS,),
+            dtype=numpy.int64,
+            buffer=self.__memory.buf,
+            offset=slot * self.__slot_bytes(),
+        )
+
+    def __frame(self, slot: int) -> numpy.ndarray:
+        return numpy.ndarray(
+            self.__slot_shape,
+            dtype=numpy.uint8,
+            buffer=self.__memory.buf,
+            offset=slot * self.__slot_bytes() + _HEADER_FIELDS * numpy.dtype(numpy.int64).itemsize,
+        )
+
+    def __slot_bytes(self) -> int:
+        return _HEADER_FIELDS * numpy.dtype(numpy.int64).itemsize + int(
+            numpy.prod(self.__slot_shape)
+        )
+
+    def __release_memory(self) -> None:
+        if self.__memory is None:
+            return
+        try:
+            self.__memory.close()
+        except BufferError:
+            # A caller still holds a frame view. The segment is removed below regardless; the
+            # mapping goes away when the last view does.
+            pass
+        self.__memory.unlink()
+        self.__memory = None
+
+
+def segment_prefix(pid: int) -> str:
+    """
+    Get the name prefix of the shared memory segments of the frame rings a process creates.
+
+    Args:
+        pid (int): The ID of the process that creates the frame rings.
+
+    Returns:
+        str: The prefix of the segment names.
+    """
+    return f"flatfoot_ring_{pid}_"
+
+
+def remove_segments(pid: int) -> int:
+    """
+    Remove the shared memory segments of the frame rings of a dead process.
+
+    Args:
+        pid (int): The ID of the process that created the frame rings. The process must not be
+            running.
+
+    Returns:
+        int: The number of segments removed.
+    """
+    try:
+        names = os.listdir(_SHARED_MEMORY_DIR)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        if not name.startswith(segment_prefix(pid)):
+            continue
+        try:
+            memory = multiprocessing.shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        memory.close()
+        memory.unlink()
+        removed += 1
+    return removed
+
+
+def add_frame_ring_parameter(parser: argparse.ArgumentParser) -> argparse.Action:
+    """
+    Add the ``--frame-ring-slots`` parameter to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Add the parameter to this parser.
+
+    Returns:
+        argparse.Action: This function returns the :py:class:`argparse.Action` that represents the
+        command line argument. The caller can tweak the action if necessary.
+    """
+    return parser.add_argument(
+        "--frame-ring-slots",
+        help="Decode frames in a separate process, up to this many frames ahead of the tracker. "
+        "Use 0 to decode frames in the tracker process.",
+        type=int,
+        default=0,
+    )
+
+
+@contextlib.contextmanager
+def decoded_frames(image_paths: list, decoder, slots: int):
+    """
+    Decode a sequence of frames, in process or through a :py:class:`FrameRing`.
+
+    The tracker consumes ``PIL.Image.Image`` objects, so in the frame ring case each view is
+    converted to an image as the tracker requests it. That conversion is the only copy of the
+    frame.
+
+    Args:
+        image_paths (list): Decode these images, in order.
+        decoder: Decode images with this :py:mod:`experiments.image_decoder` backend.
+        slots (int): The number of frame ring slots. If this is 0, decode the frames in this
+            process.
+
+    Yields:
+        An iterator of ``PIL.Image.Image`` objects in RGB mode.
+    """
+    if slots == 0:
+        yield (decoder.decode(image_path) for image_path in image_paths)
+        return
+    with FrameRing(image_paths, decoder, slots) as ring:
+        yield (PIL.Image.fromarray(frame) for frame in ring)
@@ -0,0 +1,492 @@
+"""
+Measure the speed of flatfoot's own hot paths.
+
+This module times the harness code around the trackers: table output, report assembly, result
+discovery, and the pilot study loop. Every benchmark runs offline on synthetic data in a temporary
+directory. The module compares the timings to a stored baseline, so harness regressions show up
+before they slow down a real experiment.
+
+=================================== ===============================================================
+Benchmark                           Measures
+=================================== ===============================================================
+``write_table[csv,R]``              :py:func:`experiments.table.write_table()`, R x 10 CSV table.
+``write_table[tex,R]``              :py:func:`experiments.table.write_table()`, R x 10 LaTeX table.
+``finalize_data_table``             ``experiments.table._finalize_data_table()``, 1000 x 10 table.
+``make_pilot_study_data_table``     ``experiments.report._make_pilot_study_data_table()``, 50
+                                    trackers x 1000 sequences.
+``load_pilot_study_database``       ``experiments.report._load_pilot_study_database()``, the same
+                                    data as JSON.
+``find_benchmarks``                 ``experiments.report._find_benchmarks()``, 100 benchmark
+                                    directories among 1000 other entries.
+``find_trackers``                   ``experiments.report._find_trackers()``, 1000 trackers.
+``pilot_loop``                      ``experiments.pilot_study._track_sequence()``, 1000 frames with
+                                    a tracker and decoder that do no work.
+=================================== ===============================================================
+
+Each benchmark calls its function in batches big enough to take at least 50 ms, repeats the batch,
+and records the best and median time per call. The comparison uses the best time, which is the
+least sensitive to other load on the machine.
+
+Running this Module as a Script
+-------------------------------
+
+You can run this module as a stand-alone script.
+
+.. literalinclude:: generated/bench_harness_help.rst
+    :language: text
+
+Reference
+---------
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import numpy
+import experiments.command_line as command_line
+import experiments.pilot_study as pilot_study
+import experiments.report as report
+import experiments.table as table
+
+DEFAULT_BASELINE = os.path.expanduser("~/.cache/flatfoot/harness_baseline.json")
+TABLE_SIZES = [10, 100, 1000, 10000]
+
+
+def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Create the command line parser for the harness benchmark.
+
+    This function supports filling in a subparser or a root parser. In both cases, this function
+    overwrites certain parser attributes, such as the description.
+
+    Args:
+        parser (argparse.ArgumentParser): Fill out this argument parser. This can be a root parser
+            or a subparser created with `add_subparsers()
+            <https://docs.python.org/3/library/argparse.html#argparse.ArgumentParser.add_subparsers>`_.
+
+    Returns:
+        The parser, filled with parameters and attributes, ready for command line parsing.
+    """
+    parser.description = (
+        "Measure the speed of flatfoot's table output, report assembly, result discovery, and "
+        "pilot study loop on synthetic data, and compare the timings to a stored baseline."
+    )
+    parser.formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    parser.set_defaults(func=main)
+    parser.add_argument(
+        "--baseline",
+        help="Compare the timings to the baseline in this JSON file.",
+        default=DEFAULT_BASELINE,
+        action=command_line.PathSanitizer,
+    )
+    parser.add_argument(
+        "--save-baseline",
+        help="Save the timings as the new baseline instead of comparing to the baseline.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--output",
+        help="Also save the timings to this JSON file.",
+        action=command_line.PathSanitizer,
+    )
+    parser.add_argument(
+        "--tolerance",
+        help="Report a regression if a benchmark is slower than the baseline by more than this "
+        "fraction.",
+        type=float,
+        default=0.25,
+    )
+    parser.add_argument(
+        "--repeat",
+        help="Time each benchmark this many times.",
+        type=int,
+        default=5,
+    )
+    parser.add_argument(
+        "benchmarks",
+        help="Run the benchmarks whose names start with these prefixes. By default, run every "
+        "benchmark.",
+        nargs="*",
+        metavar="benchmark",
+    )
+    return parser
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """
+    The main entry point for the harness benchmark.
+
+    The process exits with status 1 if any benchmark regressed.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
+            have these attributes: ``baseline``, ``save_baseline``, ``output``, ``tolerance``,
+            ``repeat``, and ``benchmarks``.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        timings = run_benchmarks(work_dir, arguments.benchmarks, arguments.repeat)
+    results = {
+        "time": datetime.datetime.today().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": timings,
+    }
+    if arguments.output:
+        _save_results(results, arguments.output)
+    if arguments.save_baseline:
+        _save_results(results, arguments.baseline)
+        command_line.print_information("Saved the baseline to", arguments.baseline)
+        _print_timings(timings, {}, arguments.tolerance)
+        return
+    baseline = _load_baseline(arguments.baseline)
+    if not _print_timings(timings, baseline, arguments.tolerance):
+        sys.exit(1)
+
+
+def run_benchmarks(work_dir: str, prefixes: list = None, repeat: int = 5) -> dict:
+    """
+    Run the harness benchmarks.
+
+    Args:
+        work_dir (str): Write the synthetic data to this directory.
+        prefixes (list): Run the benchmarks whose names start with one of these prefixes. If this
+            is ``None`` or empty, run every benchmark.
+        repeat (int): Time each benchmark this many times.
+
+    Returns:
+        dict: The timings. The keys are the benchmark names, and each value is a dictionary with
+        the ``best`` and ``median`` time per call, in seconds, and the number of ``calls`` per
+        batch.
+    """
+    timings = {}
+    for name, setup in _BENCHMARKS:
+        if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+            continue
+        try:
+            function = setup(work_dir)
+        except RuntimeError as error:
+            command_line.print_warning(f"Skipping {name}: {error}")
+            continue
+        timings[name] = _time_function(function, repeat)
+    return timings
+
+
+def _time_function(function, repeat: int) -> dict:
+    """
+    Time a function.
+
+    Args:
+        function: Time this callable. It takes no arguments.
+        repeat (int): Time this many batches of calls.
+
+    Returns:
+        dict: The ``best`` and ``median`` time per call, in seconds, and the number of ``calls``
+        per batch.
+    """
+    calls = 1
+    while True:
+        batch_time = _time_batch(function, calls)
+        if batch_time >= 0.05:
+            break
+        calls *= 2
+    batch_times = [batch_time] + [_time_batch(function, calls) for _ in range(repeat - 1)]
+    return {
+        "best": min(batch_times) / calls,
+        "median": float(numpy.median(batch_times)) / calls,
+        "calls": calls,
+    }
+
+
+def _time_batch(function, calls: int) -> float:
+    """
+    Time a batch of calls to a function.
+
+    Args:
+        function: Call this function.
+        calls (int): Call the function this many times.
+
+    Returns:
+        float: The time for the whole batch, in seconds.
+    """
+    start_time = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return time.perf_counter() - start_time
+
+
+def _save_results(results: dict, file_path: str) -> None:
+    """
+    Save benchmark results to a JSON file.
+
+    Args:
+        results (dict): Save these results.
+        file_path (str): Write the results to this file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, "w") as results_file:
+        json.dump(results, results_file, indent=2)
+
+
+def _load_baseline(file_path: str) -> dict:
+    """
+    Load the baseline timings.
+
+    Args:
+        file_path (str): Read the baseline from this JSON file.
+
+    Returns:
+        dict: The baseline timings of each benchmark. This is empty if there is no baseline.
+    """
+    if not os.path.isfile(file_path):
+        command_line.print_warning(
+            f"{file_path} does not exist. Run with --save-baseline to create it."
+        )
+        return {}
+    with open(file_path, "r") as baseline_file:
+        return json.load(baseline_file)["benchmarks"]
+
+
+def _print_timings(timings: dict, baseline: dict, tolerance: float) -> bool:
+    """
+    Print the timings, and compare them to the baseline.
+
+    Args:
+        timings (dict): The timings from :py:func:`run_benchmarks()`.
+        baseline (dict): The baseline timings.
+        tolerance (float): A benchmark regressed if its best time is more than ``1 + tolerance``
+            times its baseline best time.
+
+    Returns:
+        bool: ``True`` if no benchmark regressed.
+    """
+    passed = True
+    width = max((len(name) for name in timings), default=0)
+    for name, timing in timings.items():
+        line = f"{name:<{width}}  {_format_seconds(timing['best'])}"
+        if name in baseline:
+            ratio = timing["best"] / baseline[name]["best"]
+            line += f"  {ratio:6.2f}x baseline"
+            if ratio > 1.0 + tolerance:
+                command_line.print_warning(line + "  REGRESSION")
+                passed = False
+                continue
+        print(line)
+    return passed
+
+
+def _format_seconds(seconds: float) -> str:
+    """
+    Format a duration with a readable unit.
+
+    Args:
+        seconds (float): The duration, in seconds.
+
+    Returns:
+        str: The duration in s, ms, or µs, right aligned in 10 columns.
+    """
+    if seconds >= 1.0:
+        return f"{seconds:8.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:7.3f} ms"
+    return f"{seconds * 1e6:7.3f} µs"
+
+
+# ==================================================================================================
+# Benchmarks
+#
+# Each setup function writes its synthetic data to the work directory and returns the callable to
+# time. A setup function raises RuntimeError if the benchmark cannot run here.
+# ==================================================================================================
+def _make_table(rows: int, columns: int = 10) -> table.DataTable:
+    """
+    Make a table of random scores.
+
+    Args:
+        rows (int): The number of rows.
+        columns (int): The number of columns.
+
+    Returns:
+        table.DataTable: The table, with the mean and median rows, best marks, and pretty format.
+    """
+    data = table.DataTable(
+        [f"Sequence_{row}" for row in range(rows)],
+        [f"tracker_{column}" for column in range(columns)],
+    )
+    data.data = numpy.random.default_rng(0).random((rows, columns))
+    data.format_spec.mark_best = True
+    data.format_spec.pretty_format = True
+    data.caption = "Benchmark Table"
+    data.label = "benchmark_table"
+    return data
+
+
+def _make_write_table(extension: str, rows: int):
+    def setup(work_dir: str):
+        if extension == "tex" and shutil.which("latexindent") is None:
+            raise RuntimeError("LaTeX output requires latexindent.")
+        data = _make_table(rows)
+        file_path = os.path.join(work_dir, f"table.{extension}")
+        return lambda: table.write_table(data, file_path)
+
+    return setup
+
+
+def _setup_finalize_data_table(work_dir: str):  # pylint: disable=unused-argument
+    data = _make_table(1000)
+    return lambda: table._finalize_data_table(data)  # pylint: disable=protected-access
+
+
+def _make_pilot_results() -> dict:
+    """
+    Make a synthetic pilot study database.
+
+    Returns:
+        dict: The database of 50 trackers x 1000 sequences. Every fifth tracker skips every third
+        sequence, so the table has missing cells.
+    """
+    generator = numpy.random.default_rng(0)
+    sequences = [f"Sequence_{sequence}" for sequence in range(1000)]
+    return {
+        f"tracker_{tracker}": {
+            "scores": {
+                sequence: float(generator.random())
+                for index, sequence in enumerate(sequences)
+                if tracker % 5 != 0 or index % 3 != 0
+            },
+            "tags": [],
+        }
+        for tracker in range(50)
+    }
+
+
+def _setup_make_pilot_study_data_table(work_dir: str):  # pylint: disable=unused-argument
+    pilot_results = _make_pilot_results()
+    return lambda: report._make_pilot_study_data_table(  # pylint: disable=protected-access
+        pilot_results
+    )
+
+
+def _setup_load_pilot_study_database(work_dir: str):
+    results_dir = os.path.join(work_dir, "pilot")
+    os.makedirs(results_dir, exist_ok=True)
+    with open(os.path.join(results_dir, "pilot_results.json"), "w") as results_file:
+        json.dump(_make_pilot_results(), results_file, indent=2)
+    return lambda: report._load_pilot_study_database(  # pylint: disable=protected-access
+        results_dir
+    )
+
+
+def _setup_find_benchmarks(work_dir: str):
+    results_dir = os.path.join(work_dir, "benchmarks")
+    for benchmark in range(100):
+        os.makedirs(os.path.join(results_dir, f"OTB{benchmark}"), exist_ok=True)
+    for entry in range(1000):
+        os.makedirs(os.path.join(results_dir, f"other_{entry}"), exist_ok=True)
+    return _quiet(lambda: report._find_benchmarks(results_dir))  # pylint: disable=protected-access
+
+
+def _setup_find_trackers(work_dir: str):
+    result_dir = os.path.join(work_dir, "trackers")
+    for tracker in range(1000):
+        os.makedirs(os.path.join(result_dir, f"tracker_{tracker}"), exist_ok=True)
+    return lambda: report._find_trackers(  # pylint: disable=protected-access
+        result_dir, "tracker_500"
+    )
+
+
+class _NullTracker:
+    """A tracker that does no work, so the pilot loop's own overhead is all that is timed."""
+
+    def initialize(self, image, box) -> None:  # pylint: disable=no-self-use
+        """Ignore the first frame."""
+
+    def find_target(self, image) -> numpy.ndarray:  # pylint: disable=no-self-use
+        """Return a fixed box."""
+        return numpy.array([10.0, 10.0, 20.0, 20.0])
+
+
+class _NullDecoder:
+    """A decoder that returns the same blank frame for every path."""
+
+    name = "null"
+
+    def __init__(self) -> None:
+        self.__frame = numpy.zeros((48, 64, 3), dtype=numpy.uint8)
+
+    def decode(self, image_path: str) -> numpy.ndarray:  # pylint: disable=unused-argument
+        """Return the blank frame."""
+        return self.__frame
+
+
+class _NullProgressBar:
+    """A progress bar that prints nothing, so the loop runs without a terminal."""
+
+    def __init__(self) -> None:
+        self.label = ""
+        self.maximum = 0
+
+    def print(self, i: int) -> None:
+        """Do nothing."""
+
+
+def _setup_pilot_loop(work_dir: str):  # pylint: disable=unused-argument
+    frames = 1000
+    images = [f"{frame:04d}.jpg" for frame in range(frames)]
+    groundtruth = numpy.tile([10.0, 10.0, 20.0, 20.0], (frames, 1))
+    tracker = _NullTracker()
+    decoder = _NullDecoder()
+    progress_bar = _NullProgressBar()
+    return _quiet(
+        lambda: pilot_study._track_sequence(  # pylint: disable=protected-access
+            tracker, "Synthetic", images, groundtruth, progress_bar, decoder
+        )
+    )
+
+
+def _quiet(function):
+    """
+    Wrap a function so it does not print to the console.
+
+    Args:
+        function: Wrap this callable. It takes no arguments.
+
+    Returns:
+        A callable that calls ``function`` with standard output sent to a discarded buffer.
+    """
+
+    def quiet_function():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function()
+
+    return quiet_function
+
+
+_BENCHMARKS = (
+    [
+        (f"write_table[{extension},{rows}]", _make_write_table(extension, rows))
+        for extension in ["csv", "tex"]
+        for rows in TABLE_SIZES
+    ]
+    + [
+        ("finalize_data_table", _setup_finalize_data_table),
+        ("make_pilot_study_data_table", _setup_make_pilot_study_data_table),
+        ("load_pilot_study_database", _setup_load_pilot_study_database),
+        ("find_benchmarks", _setup_find_benchmarks),
+        ("find_trackers", _setup_find_trackers),
+        ("pilot_loop", _setup_pilot_loop),
+    ]
+)
+
+
+if __name__ == "__main__":
+    PARSER = fill_command_line_parser(argparse.ArgumentParser())
+    ARGUMENTS = PARSER.parse_args()
+    ARGUMENTS.func(ARGUMENTS)
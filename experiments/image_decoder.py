@@ -0,0 +1,386 @@
+"""
+Decode image frames for trackers.
+
+This module provides interchangeable image decoder backends for the pilot study and experiment
+frame paths. Every backend produces the same ``PIL.Image.Image`` in RGB mode that
+``PIL.Image.open(path).convert("RGB")`` produces. Backends that rely on a different JPEG
+implementation must pass :py:func:`verify_decoder()` before the results they feed to a tracker are
+trustworthy.
+
+============= ======================================================================================
+Backend       Description
+============= ======================================================================================
+``pil``       Decode with Pillow. This is the reference backend.
+``opencv``    Decode with OpenCV. This requires the ``cv2`` package.
+``turbojpeg`` Decode JPEG files with libjpeg-turbo through the ``turbojpeg`` package. Other file
+              types fall back to Pillow.
+``cache``     Decode once with Pillow, then read raw frames from an on-disk frame cache.
+============= ======================================================================================
+
+Running this Module as a Script
+-------------------------------
+
+You can run this module as a stand-alone script. The script measures the decoding throughput of
+each backend on one OTB-100 sequence.
+
+.. literalinclude:: generated/bench_decode_help.rst
+    :language: text
+
+Reference
+---------
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from typing import Optional
+import numpy
+import PIL.Image
+import got10k.datasets
+import experiments.command_line as command_line
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    import turbojpeg
+except ImportError:
+    turbojpeg = None
+
+DEFAULT_FRAME_CACHE_DIR = os.path.expanduser("~/.cache/flatfoot/frames")
+
+
+class PilDecoder:
+    """
+    Decode images with Pillow.
+
+    This is the reference decoder. The other decoders must produce identical pixels.
+
+    Attributes:
+        name (str): The name of the backend.
+    """
+
+    name = "pil"
+
+    def decode(self, image_path: str) -> PIL.Image.Image:  # pylint: disable=no-self-use
+        """
+        Decode an image file.
+
+        Args:
+            image_path (str): The path to the image file.
+
+        Returns:
+            PIL.Image.Image: The decoded image, in RGB mode.
+        """
+        return PIL.Image.open(image_path).convert("RGB")
+
+
+class OpenCvDecoder:
+    """
+    Decode images with OpenCV.
+
+    Attributes:
+        name (str): The name of the backend.
+    """
+
+    name = "opencv"
+
+    def __init__(self) -> None:
+        if cv2 is None:
+            raise RuntimeError("The opencv decoder requires the cv2 package.")
+
+    def decode(self, image_path: str) -> PIL.Image.Image:  # pylint: disable=no-self-use
+        """
+        Decode an image file.
+
+        Args:
+            image_path (str): The path to the image file.
+
+        Returns:
+            PIL.Image.Image: The decoded image, in RGB mode.
+
+        Raises:
+            OSError: This is raised if OpenCV cannot read the image file.
+        """
+        image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise OSError(f"OpenCV cannot read {image_path}")
+        return PIL.Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+
+class TurboJpegDecoder:
+    """
+    Decode JPEG images with libjpeg-turbo.
+
+    Files that are not JPEG images are decoded with :py:class:`PilDecoder`.
+
+    Attributes:
+        name (str): The name of the backend.
+    """
+
+    name = "turbojpeg"
+
+    def __init__(self) -> None:
+        if turbojpeg is None:
+            raise RuntimeError("The turbojpeg decoder requires the turbojpeg package.")
+        self.__jpeg = turbojpeg.TurboJPEG()
+        self.__fallback = PilDecoder()
+
+    def decode(self, image_path: str) -> PIL.Image.Image:
+        """
+        Decode an image file.
+
+        Args:
+            image_path (str): The path to the image file.
+
+        Returns:
+            PIL.Image.Image: The decoded image, in RGB mode.
+        """
+        if os.path.splitext(image_path)[1].lower() not in [".jpg", ".jpeg"]:
+            return self.__fallback.decode(image_path)
+        with open(image_path, "rb") as image_file:
+            image = self.__jpeg.decode(image_file.read(), pixel_format=turbojpeg.TJPF_RGB)
+        return PIL.Image.fromarray(image)
+
+
+class FrameCacheDecoder:
+    """
+    Decode images once, then read the raw frames from a cache directory.
+
+    The cache stores each frame as an uncompressed ``.npy`` file. The cache key includes the
+    image's path, size, and modification time, so editing an image invalidates its cached frame.
+
+    Args:
+        cache_dir (str): Store the cached frames in this directory.
+        source (optional): Decode frames missing from the cache with this decoder. The default is
+            a :py:class:`PilDecoder`.
+
+    Attributes:
+        name (str): The name of the backend.
+        cache_dir (str): The directory holding the cached frames.
+    """
+
+    name = "cache"
+
+    def __init__(self, cache_dir: str = DEFAULT_FRAME_CACHE_DIR, source=None) -> None:
+        self.cache_dir = cache_dir
+        self.__source = PilDecoder() if source is None else source
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def decode(self, image_path: str) -> PIL.Image.Image:
+        """
+        Decode an image file, or read it from the frame cache.
+
+        Args:
+            image_path (str): The path to the image file.
+
+        Returns:
+            PIL.Image.Image: The decoded image, in RGB mode.
+        """
+        cache_path = self.__cache_path(image_path)
+        try:
+            return PIL.Image.fromarray(numpy.load(cache_path, mmap_mode="r"))
+        except (OSError, ValueError):
+            pass
+        image = self.__source.decode(image_path)
+        # Write to a temporary file and rename it, so concurrent readers never see a partial frame.
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as cache_file:
+            numpy.save(cache_file, numpy.asarray(image))
+        os.replace(temporary_path, cache_path)
+        return image
+
+    def __cache_path(self, image_path: str) -> str:
+        status = os.stat(image_path)
+        key = f"{os.path.abspath(image_path)}:{status.st_size}:{status.st_mtime_ns}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+
+
+DECODERS = {
+    PilDecoder.name: PilDecoder,
+    OpenCvDecoder.name: OpenCvDecoder,
+    TurboJpegDecoder.name: TurboJpegDecoder,
+    FrameCacheDecoder.name: FrameCacheDecoder,
+}
+
+
+def available_decoders() -> list:
+    """
+    Get the names of the decoder backends that can run in this environment.
+
+    Returns:
+        list: The names of the backends with all their dependencies installed.
+    """
+    return [
+        name
+        for name in DECODERS
+        if (name != OpenCvDecoder.name or cv2 is not None)
+        and (name != TurboJpegDecoder.name or turbojpeg is not None)
+    ]
+
+
+def make_decoder(name: str, cache_dir: Optional[str] = None):
+    """
+    Make an image decoder.
+
+    Args:
+        name (str): The name of the decoder backend. See :py:data:`DECODERS` for valid names.
+        cache_dir (str | None): The frame cache directory. This only applies to the ``cache``
+            backend. If this is ``None``, the decoder uses :py:data:`DEFAULT_FRAME_CACHE_DIR`.
+
+    Returns:
+        The requested decoder.
+
+    Raises:
+        ValueError: This is raised if ``name`` is not a known backend.
+        RuntimeError: This is raised if the backend's dependencies are not installed.
+    """
+    if name not in DECODERS:
+        raise ValueError(f"Unknown image decoder '{name}'.")
+    if name == FrameCacheDecoder.name:
+        return FrameCacheDecoder(DEFAULT_FRAME_CACHE_DIR if cache_dir is None else cache_dir)
+    return DECODERS[name]()
+
+
+def verify_decoder(decoder, image_paths: list) -> None:
+    """
+    Check that a decoder produces the same pixels as Pillow.
+
+    Args:
+        decoder: Check this decoder.
+        image_paths (list): Decode these images with both ``decoder`` and :py:class:`PilDecoder`
+            and compare the results.
+
+    Raises:
+        RuntimeError: This is raised if any image decoded by ``decoder`` differs from the Pillow
+            result.
+    """
+    if isinstance(decoder, PilDecoder):
+        return
+    reference = PilDecoder()
+    for image_path in image_paths:
+        if not numpy.array_equal(
+            numpy.asarray(decoder.decode(image_path)), numpy.asarray(reference.decode(image_path))
+        ):
+            raise RuntimeError(
+                f"The {decoder.name} decoder does not match the pil decoder on {image_path}."
+            )
+
+
+def add_decoder_parameters(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the ``--decoder`` and ``--frame-cache-dir`` parameters to a command line parser.
+
+    This allows the user to select the image decoder backend for a command that reads frames.
+
+    Args:
+        parser (argparse.ArgumentParser): Add the parameters to this parser.
+    """
+    parser.add_argument(
+        "--decoder",
+        help="Decode frames with this backend. Backends other than 'pil' are checked against "
+        "'pil' on the first frame of each sequence.",
+        choices=list(DECODERS.keys()),
+        default=PilDecoder.name,
+    )
+    _add_frame_cache_dir_parameter(parser)
+
+
+def _add_frame_cache_dir_parameter(parser: argparse.ArgumentParser) -> argparse.Action:
+    return parser.add_argument(
+        "--frame-cache-dir",
+        help="Store cached frames for the cache decoder in this directory.",
+        default=DEFAULT_FRAME_CACHE_DIR,
+        action=command_line.PathSanitizer,
+    )
+
+
+def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Create the command line parser for the decoder benchmark.
+
+    This function supports filling in a subparser or a root parser. In both cases, this function
+    overwrites certain parser attributes, such as the description.
+
+    Args:
+        parser (argparse.ArgumentParser): Fill out this argument parser. This can be a root parser
+            or a subparser created with `add_subparsers()
+            <https://docs.python.org/3/library/argparse.html#argparse.ArgumentParser.add_subparsers>`_.
+
+    Returns:
+        The parser, filled with parameters and attributes, ready for command line parsing.
+    """
+    parser.description = (
+        "Measure the throughput, in frames per second, of each image decoder backend on one "
+        "OTB-100 sequence. Also check that each backend matches the pil backend bit for bit."
+    )
+    parser.formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    parser.set_defaults(func=main)
+    command_line.add_dataset_dir_parameter(parser, "~/Videos/otb")
+    parser.add_argument(
+        "--decoders",
+        help="Benchmark these decoder backends.",
+        nargs="+",
+        choices=list(DECODERS.keys()),
+        default=available_decoders(),
+    )
+    _add_frame_cache_dir_parameter(parser)
+    parser.add_argument(
+        "sequence",
+        help="Decode the frames of this OTB-100 sequence. The name is case-sensitive.",
+    )
+    return parser
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """
+    The main entry point for the decoder benchmark.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
+            have these attributes: ``dataset_dir``, ``decoders``, ``frame_cache_dir``, and
+            ``sequence``.
+    """
+    images, _ = got10k.datasets.OTB(arguments.dataset_dir, version="tb100")[arguments.sequence]
+    for name in arguments.decoders:
+        try:
+            decoder = make_decoder(name, arguments.frame_cache_dir)
+        except RuntimeError as error:
+            command_line.print_warning(str(error))
+            continue
+        if isinstance(decoder, FrameCacheDecoder):
+            # Fill the cache first, so the measurement reflects a warm cache.
+            _measure_throughput(decoder, images)
+        frames_per_second = _measure_throughput(decoder, images)
+        try:
+            verify_decoder(decoder, images)
+            exact = "bit-exact"
+        except RuntimeError:
+            exact = "NOT bit-exact"
+        print(f"{name:>10}: {frames_per_second:8.1f} frames/s  ({exact})")
+
+
+def _measure_throughput(decoder, image_paths: list) -> float:
+    """
+    Measure how fast a decoder decodes a list of images.
+
+    Args:
+        decoder: Measure this decoder.
+        image_paths (list): Decode these images.
+
+    Returns:
+        float: The throughput in frames per second.
+    """
+    start_time = time.perf_counter()
+    for image_path in image_paths:
+        decoder.decode(image_path)
+    return len(image_paths) / (time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    PARSER = fill_command_line_parser(argparse.ArgumentParser())
+    ARGUMENTS = PARSER.parse_args()
+    ARGUMENTS.func(ARGUMENTS)
@@ -0,0 +1,361 @@
+"""
+Run each tracking sequence in a supervised child process.
+
+A native crash, an out-of-memory kill, or a hang in one sequence stops a whole benchmark run if the
+sequences share a process. A :py:class:`Supervisor` runs each sequence in a child process, so a
+failure only loses that sequence. Each child creates and loads its own tracker, so every attempt,
+including a retry, pays the tracker's startup time. The supervisor enforces these limits on each
+child:
+
+====================== ============================================================================
+Parameter              Limit
+====================== ============================================================================
+``--sequence-timeout`` The wall clock time, in seconds, a sequence can take before the supervisor
+                       kills the child. If this is 0, there is no time limit.
+``--memory-limit``     The ``RLIMIT_DATA`` limit of the child, in MiB. This covers the heap and
+                       anonymous memory maps, which is where a tracker's resident memory grows;
+                       Linux does not enforce ``RLIMIT_RSS``. Allocations beyond the limit fail
+                       with ``MemoryError``. If this is 0, there is no memory limit.
+``--retries``          The number of times to try a failed sequence again.
+====================== ============================================================================
+
+Each child leads its own process group. When a child fails, the supervisor kills the whole group,
+so processes the child started, such as a :py:class:`experiments.frame_ring.FrameRing` decoder, do
+not outlive it, and then removes the child's frame ring shared memory segments.
+
+A forked child cannot use CUDA if its parent has initialized CUDA, so the supervisor refuses to fork
+a process that has. The function a child runs must create a CUDA tracker itself.
+
+A :py:class:`RunManifest` records the outcome of each sequence: whether it finished or failed, how
+many attempts it took, why the last attempt failed, and the ID of the run in the
+:py:mod:`experiments.event_log`. The manifest is ``run_manifest.json`` in the tracker's results
+directory. A later run tracks the failed sequences again, because they have no results.
+
+Reference
+---------
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+import time
+import traceback
+import experiments.command_line as command_line
+import experiments.frame_ring as frame_ring
+
+MANIFEST_FILE_NAME = "run_manifest.json"
+
+
+def add_isolation_parameters(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the sequence isolation parameters to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Add the parameters to this parser.
+    """
+    parser.add_argument(
+        "--isolate",
+        help="Track each sequence in a supervised child process, so a crash, hang, or memory "
+        "blow up only fails that sequence.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--sequence-timeout",
+        help="With --isolate, fail a sequence that takes longer than this many seconds. If this "
+        "is 0, there is no time limit.",
+        type=float,
+        default=3600.0,
+    )
+    parser.add_argument(
+        "--memory-limit",
+        help="With --isolate, limit each sequence's heap to this many MiB. If this is 0, there is "
+        "no memory limit.",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "--retries",
+        help="With --isolate, try a failed sequence this many more times.",
+        type=int,
+        default=1,
+    )
+
+
+class IsolationError(RuntimeError):
+    """
+    A child process failed.
+
+    Args:
+        message (str): Why the child failed.
+        attempts (int): The number of attempts that failed.
+
+    Attributes:
+        attempts (int): The number of attempts that failed.
+    """
+
+    def __init__(self, message: str, attempts: int = 1) -> None:
+        super().__init__(message)
+        self.attempts = attempts
+
+
+class Supervisor:
+    """
+    Run functions in child processes with a time limit, a memory limit, and retries.
+
+    Args:
+        timeout (float): Kill a child after this many seconds. If this is 0, there is no limit.
+        memory_limit (int): Limit each child's heap to this many MiB. If this is 0, there is no
+            limit.
+        retries (int): Try a failed function this many more times.
+
+    Attributes:
+        timeout (float): Kill a child after this many seconds. If this is 0, there is no limit.
+        memory_limit (int): Limit each child's heap to this many MiB. If this is 0, there is no
+            limit.
+        retries (int): Try a failed function this many more times.
+    """
+
+    def __init__(self, timeout: float = 0.0, memory_limit: int = 0, retries: int = 0) -> None:
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.retries = retries
+
+    def run(self, function) -> tuple:
+        """
+        Call a function in a child process, and try again if it fails.
+
+        Args:
+            function: Call this function, with no arguments. It runs in a forked child process,
+                so changes it makes to objects do not reach this process. The return value must
+                be picklable.
+
+        Returns:
+            tuple: A tuple of (object, int); the function's return value and the number of
+            attempts it took.
+
+        Raises:
+            IsolationError: This is raised if every attempt fails. The message is the reason for
+                the last failure.
+        """
+        attempts = 1 + max(self.retries, 0)
+        attempt = 1
+        while True:
+            try:
+                return run_isolated(function, self.timeout, self.memory_limit), attempt
+            except IsolationError as error:
+                if attempt == attempts:
+                    raise IsolationError(str(error), attempt) from error
+                command_line.print_warning(f"Attempt {attempt} of {attempts} failed: {error}")
+            attempt += 1
+
+
+def run_isolated(function, timeout: float = 0.0, memory_limit: int = 0):
+    """
+    Call a function once in a child process.
+
+    The child uses the ``fork`` start method, so ``function`` does not need to be picklable.
+
+    Args:
+        function: Call this function, with no arguments. The return value must be picklable.
+        timeout (float): Kill the child after this many seconds. If this is 0, there is no limit.
+        memory_limit (int): Limit the child's heap to this many MiB. If this is 0, there is no
+            limit.
+
+    Returns:
+        The function's return value.
+
+    Raises:
+        IsolationError: This is raised if the function raises an exception, the child exceeds a
+            limit, or the child dies.
+        RuntimeError: This is raised if this process has initialized CUDA, which a forked child
+            cannot use.
+    """
+    if _cuda_initialized():
+        raise RuntimeError(
+            "This process has initialized CUDA, so a forked child process cannot use it. Create "
+            "the tracker in the child process."
+        )
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    # The child is not a daemon, so the tracker can start its own processes, like a frame ring.
+    process = context.Process(
+        target=_child_main, args=(function, sender, memory_limit), name="flatfoot-sequence"
+    )
+    process.start()
+    sender.close()
+    _set_process_group(process.pid)
+    try:
+        if not receiver.poll(timeout if timeout > 0 else None):
+            raise IsolationError(f"timed out after {timeout:g} s")
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            process.join()
+            raise IsolationError(_describe_exit(process.exitcode)) from None
+    finally:
+        _kill_process_group(process)
+        receiver.close()
+    if status == "ok":
+        return value
+    error_type, summary = value
+    if error_type == "MemoryError" and memory_limit > 0:
+        raise IsolationError(f"exceeded the {memory_limit} MiB memory limit")
+    raise IsolationError(summary)
+
+
+def _child_main(function, sender, memory_limit: int) -> None:
+    """
+    Call a function and send the outcome to the parent process.
+
+    Args:
+        function: Call this function, with no arguments.
+        sender (multiprocessing.connection.Connection): Send ('ok', value) or ('error',
+            (exception type name, exception summary)) through this connection. The child prints
+            the full traceback of an exception to standard error.
+        memory_limit (int): Limit the process's heap to this many MiB. If this is 0, there is no
+            limit.
+    """
+    _set_process_group(0)
+    try:
+        if memory_limit > 0:
+            limit = memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+        outcome = ("ok", function())
+    except BaseException as error:  # pylint: disable=broad-except
+        traceback.print_exc()
+        summary = traceback.format_exception_only(type(error), error)[-1].strip()
+        outcome = ("error", (type(error).__name__, summary))
+    try:
+        sender.send(outcome)
+    finally:
+        sender.close()
+
+
+def _set_process_group(pid: int) -> None:
+    """
+    Make a child process the leader of its own process group.
+
+    Both the parent and the child call this, so the group exists before either one relies on it.
+
+    Args:
+        pid (int): The ID of the child process, or 0 for the calling process.
+    """
+    try:
+        os.setpgid(pid, 0)
+    except OSError:
+        # The child has already exited, or has already made its group.
+        pass
+
+
+def _kill_process_group(process: multiprocessing.Process) -> None:
+    """
+    Kill a child process and every process in its group, and remove its frame ring segments.
+
+    Args:
+        process (multiprocessing.Process): The child process. It leads its process group.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        # The group is empty. The child may still be alive if it has not made its group yet.
+        if process.is_alive():
+            process.kill()
+    process.join()
+    frame_ring.remove_segments(process.pid)
+
+
+def _cuda_initialized() -> bool:
+    """
+    Check whether this process has initialized CUDA.
+
+    Returns:
+        bool: ``True`` if PyTorch is imported and has initialized CUDA.
+    """
+    torch = sys.modules.get("torch")
+    return torch is not None and torch.cuda.is_initialized()
+
+
+def _describe_exit(exit_code: int) -> str:
+    """
+    Describe how a child process that sent no result ended.
+
+    Args:
+        exit_code (int): The ``multiprocessing.Process.exitcode``.
+
+    Returns:
+        str: The reason the child failed.
+    """
+    if exit_code is not None and exit_code < 0:
+        name = signal.Signals(-exit_code).name
+        if -exit_code == signal.SIGKILL:
+            return f"was killed by {name}; the system may have run out of memory"
+        return f"crashed with {name}"
+    return f"exited with code {exit_code} before it sent a result"
+
+
+class RunManifest:
+    """
+    The outcome of each sequence of a tracker's runs.
+
+    The manifest is saved after every change, so it is current even if the run itself dies.
+
+    .. code-block:: json
+
+        {
+            "Basketball": {
+                "status": "failed",
+                "attempts": 2,
+                "error": "timed out after 3600 s",
+                "run": "0e3fee15efe94527861f9b7a996db259",
+                "time": 1792384849.5
+            }
+        }
+
+    Args:
+        file_path (str): The path to the manifest file.
+
+    Attributes:
+        file_path (str): The path to the manifest file.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        try:
+            with open(self.file_path, "r") as manifest_file:
+                self.__entries = json.load(manifest_file)
+        except (OSError, ValueError):
+            self.__entries = {}
+
+    def record(
+        self, sequence_name: str, status: str, attempts: int, error: str = None, run: str = None
+    ) -> None:
+        """
+        Record the outcome of a sequence, and save the manifest.
+
+        Args:
+            sequence_name (str): The name of the sequence.
+            status (str): 'finished' or 'failed'.
+            attempts (int): The number of attempts.
+            error (str | None): Why the last attempt failed.
+            run (str | None): The ID of the run.
+        """
+        self.__entries[sequence_name] = {
+            "status": status,
+            "attempts": attempts,
+            "error": error,
+            "run": run,
+            "time": time.time(),
+        }
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        temporary_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(self.__entries, manifest_file, indent=2)
+        os.replace(temporary_path, self.file_path)
@@ -0,0 +1,108 @@
+"""
+Memoize per-sequence tracking metrics.
+
+A :py:class:`MetricCache` stores the metrics of each (tracker, sequence) pair of one benchmark,
+keyed by a content hash of the sequence's results. Report engines look up every pair before
+computing anything, and only compute the pairs whose results changed. Adding one tracker to a report
+of many baselines therefore only computes the new tracker.
+
+The cache is a JSON file in the benchmark's report directory:
+
+.. code-block:: json
+
+    {
+        "MDNet": {
+            "Basketball": {
+                "key": "3f786850e387550fdab836ed7e6dc881de23001b",
+                "metrics": {"success_curve": [1.0, 0.98], "speed_fps": 1.2}
+            }
+        }
+    }
+
+Reference
+---------
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_FILE_NAME = "metric_cache.json"
+
+
+def content_key(*arrays) -> str:
+    """
+    Make a cache key from the content of NumPy arrays.
+
+    Args:
+        arrays: Hash the bytes of these arrays, in order.
+
+    Returns:
+        str: The hexadecimal SHA-1 digest of the array content.
+    """
+    digest = hashlib.sha1()
+    for array in arrays:
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class MetricCache:
+    """
+    Per-sequence metrics for the trackers of one benchmark.
+
+    Args:
+        report_dir (str): The benchmark's report directory, such as ``reports/OTBtb100``.
+
+    Attributes:
+        file_path (str): The path to the cache file.
+    """
+
+    def __init__(self, report_dir: str) -> None:
+        self.file_path = os.path.join(report_dir, CACHE_FILE_NAME)
+        try:
+            with open(self.file_path, "r") as cache_file:
+                self.__entries = json.load(cache_file)
+        except (OSError, ValueError):
+            self.__entries = {}
+
+    def get(self, tracker_name: str, sequence_name: str, key: str) -> dict:
+        """
+        Look up the metrics of a tracker on a sequence.
+
+        Args:
+            tracker_name (str): The name of the tracker.
+            sequence_name (str): The name of the sequence.
+            key (str): The content key of the tracker's results on the sequence.
+
+        Returns:
+            dict | None: The cached metrics, or ``None`` if the cache has no metrics for this
+            ``key``.
+        """
+        entry = self.__entries.get(tracker_name, {}).get(sequence_name)
+        if entry is None or entry["key"] != key:
+            return None
+        return entry["metrics"]
+
+    def put(self, tracker_name: str, sequence_name: str, key: str, metrics: dict) -> None:
+        """
+        Store the metrics of a tracker on a sequence.
+
+        Args:
+            tracker_name (str): The name of the tracker.
+            sequence_name (str): The name of the sequence.
+            key (str): The content key of the tracker's results on the sequence.
+            metrics (dict): The metrics. The values must be serializable to JSON.
+        """
+        self.__entries.setdefault(tracker_name, {})[sequence_name] = {
+            "key": key,
+            "metrics": metrics,
+        }
+
+    def save(self) -> None:
+        """Write the cache to disk."""
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        temporary_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as cache_file:
+            json.dump(self.__entries, cache_file)
+        os.replace(temporary_path, self.file_path)
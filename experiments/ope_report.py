@@ -0,0 +1,551 @@
+"""
+Compute one-pass evaluation (OPE) reports for OTB and UAV123 benchmarks.
+
+This module is a vectorized replacement for ``got10k.experiments.ExperimentOTB.report()`` and
+``got10k.experiments.ExperimentUAV123.report()``. It loads the results of every tracker on every
+sequence into one trackers x frames x 4 NumPy array, with the sequences concatenated along the frame
+axis, computes the overlap and center error of every frame with one broadcast, and bins them into
+success and precision curves with one histogram per metric. The ``performance.json`` it writes has
+the same layout and values as the GOT-10k report, so :py:mod:`experiments.report` reads both the
+same way. Tracking results are read through :py:mod:`experiments.results_cache`.
+
+The per-sequence curves and speeds are memoized in a
+:py:class:`experiments.metric_cache.MetricCache`, keyed by the content of each tracker's results on
+each sequence. A report only computes the trackers whose results changed since the last report, and
+assembles the rest from the cache.
+
+Reference
+---------
+"""
+
+import json
+import os
+import numpy
+import experiments.command_line as command_line
+import experiments.metric_cache as metric_cache
+import experiments.results_cache as results_cache
+
+# These match the bins of the GOT-10k OTB and UAV123 experiments.
+SUCCESS_THRESHOLDS = numpy.linspace(0, 1, 21)
+PRECISION_THRESHOLDS = numpy.arange(0, 51)
+
+
+def report(
+    dataset,
+    result_dir: str,
+    report_dir: str,
+    tracker_names: list,
+    plot_curves: bool = True,
+    partial: bool = False,
+) -> dict:
+    """
+    Compute the OPE performance of trackers and write it to ``performance.json``.
+
+    Args:
+        dataset: The GOT-10k OTB or UAV123 dataset the trackers ran on.
+        result_dir (str): The path to the benchmark results, such as ``results/OTBtb100``.
+        report_dir (str): The path to the benchmark reports, such as ``reports/OTBtb100``.
+        tracker_names (list): Report these trackers. The first tracker is the primary tracker; the
+            function writes the report in its subdirectory of ``report_dir``.
+        plot_curves (bool): Also render the success and precision plots.
+        partial (bool): Report only the sequences that every tracker has complete results for,
+            instead of requiring results for every sequence. Use this to score experiments that
+            are still running.
+
+    Returns:
+        dict: The performance data, in the same layout as the GOT-10k report.
+
+    Raises:
+        RuntimeError: This is raised if a tracker's results are missing or do not match the
+            dataset annotations. If ``partial`` is set, this is only raised if no sequence has
+            complete results.
+    """
+    annotations, offsets = _load_annotations(dataset)
+    metrics = metric_cache.MetricCache(report_dir)
+    results = [results_cache.load_tracker_results(result_dir, name) for name in tracker_names]
+    sequence_names = dataset.seq_names
+    if partial:
+        sequence_names, annotations, offsets = _complete_sequences(
+            results, sequence_names, annotations, offsets
+        )
+        command_line.print_information(
+            f"Scoring {len(sequence_names)} of {len(dataset.seq_names)} sequences."
+        )
+    keys = [
+        _sequence_keys(name, tracker_results, sequence_names, annotations, offsets)
+        for name, tracker_results in zip(tracker_names, results)
+    ]
+    stale = [
+        t
+        for t, name in enumerate(tracker_names)
+        if any(
+            metrics.get(name, sequence, key) is None
+            for sequence, key in zip(sequence_names, keys[t])
+        )
+    ]
+    if stale:
+        command_line.print_information(
+            "Computing metrics for", ", ".join(tracker_names[t] for t in stale)
+        )
+        _compute_metrics(
+            metrics,
+            [tracker_names[t] for t in stale],
+            [results[t] for t in stale],
+            [keys[t] for t in stale],
+            sequence_names,
+            annotations,
+            offsets,
+        )
+        metrics.save()
+    performance = {}
+    for name, tracker_keys in zip(tracker_names, keys):
+        sequence_metrics = [
+            metrics.get(name, sequence, key)
+            for sequence, key in zip(sequence_names, tracker_keys)
+        ]
+        performance[name] = _tracker_performance(
+            sequence_names,
+            numpy.array([m["success_curve"] for m in sequence_metrics]),
+            numpy.array([m["precision_curve"] for m in sequence_metrics]),
+            numpy.array([m["speed"] for m in sequence_metrics]),
+        )
+    tracker_report_dir = os.path.join(report_dir, tracker_names[0])
+    os.makedirs(tracker_report_dir, exist_ok=True)
+    with open(os.path.join(tracker_report_dir, "performance.json"), "w") as report_file:
+        json.dump(performance, report_file, indent=4)
+    if plot_curves:
+        _plot_curves(performance, tracker_report_dir)
+    return performance
+
+
+def rect_iou(boxes: numpy.ndarray, annotations: numpy.ndarray) -> numpy.ndarray:
+    """
+    Compute the intersection over union of rectangles.
+
+    This is the same computation as ``got10k.utils.metrics.rect_iou()``, but it broadcasts over any
+    number of leading dimensions.
+
+    Args:
+        boxes (numpy.ndarray): A ... x 4 array of (left, top, width, height) rectangles.
+        annotations (numpy.ndarray): A ... x 4 array of (left, top, width, height) rectangles. The
+            shape must broadcast with ``boxes``.
+
+    Returns:
+        numpy.ndarray: The overlap of each pair of rectangles.
+    """
+    left = numpy.maximum(boxes[..., 0], annotations[..., 0])
+    top = numpy.maximum(boxes[..., 1], annotations[..., 1])
+    right = numpy.minimum(boxes[..., 0] + boxes[..., 2], annotations[..., 0] + annotations[..., 2])
+    bottom = numpy.minimum(
+        boxes[..., 1] + boxes[..., 3], annotations[..., 1] + annotations[..., 3]
+    )
+    intersection = numpy.maximum(right - left, 0) * numpy.maximum(bottom - top, 0)
+    union = boxes[..., 2] * boxes[..., 3] + annotations[..., 2] * annotations[..., 3] - intersection
+    return numpy.clip(intersection / (union + numpy.finfo(float).eps), 0.0, 1.0)
+
+
+def center_error(boxes: numpy.ndarray, annotations: numpy.ndarray) -> numpy.ndarray:
+    """
+    Compute the distance between the centers of rectangles.
+
+    This is the same computation as ``got10k.utils.metrics.center_error()``.
+
+    Args:
+        boxes (numpy.ndarray): A ... x 4 array of (left, top, width, height) rectangles.
+        annotations (numpy.ndarray): A ... x 4 array of (left, top, width, height) rectangles. The
+            shape must broadcast with ``boxes``.
+
+    Returns:
+        numpy.ndarray: The center error of each pair of rectangles.
+    """
+    box_centers = boxes[..., :2] + (boxes[..., 2:] - 1) / 2
+    annotation_centers = annotations[..., :2] + (annotations[..., 2:] - 1) / 2
+    return numpy.sqrt(numpy.sum(numpy.power(box_centers - annotation_centers, 2), axis=-1))
+
+
+def _load_annotations(dataset) -> tuple:
+    """
+    Load the annotations of every sequence into one array.
+
+    Args:
+        dataset: The GOT-10k dataset.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray). The first array is the frames x 4
+        annotations of all the sequences, concatenated. The second array is the offset of each
+        sequence's first frame, followed by the total number of frames.
+    """
+    sequence_annotations = [dataset[s][1] for s in range(len(dataset.seq_names))]
+    offsets = numpy.cumsum([0] + [len(a) for a in sequence_annotations])
+    return numpy.concatenate(sequence_annotations).reshape(-1, 4), offsets
+
+
+def _complete_sequences(
+    results: list, sequence_names: list, annotations: numpy.ndarray, offsets: numpy.ndarray
+) -> tuple:
+    """
+    Select the sequences that every tracker has complete results for.
+
+    Args:
+        results (list): The :py:class:`results_cache.TrackerResults` of each tracker.
+        sequence_names (list): Select from these sequences.
+        annotations (numpy.ndarray): The frames x 4 annotations of all the sequences.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+
+    Returns:
+        tuple: A tuple of (list, numpy.ndarray, numpy.ndarray); the selected sequence names, and
+        their annotations and offsets in the same layout as ``annotations`` and ``offsets``.
+
+    Raises:
+        RuntimeError: This is raised if no sequence has complete results.
+    """
+    lengths = numpy.diff(offsets)
+    selected = [
+        s
+        for s, sequence_name in enumerate(sequence_names)
+        if all(
+            sequence_name in tracker_results
+            and len(tracker_results[sequence_name][0]) == lengths[s]
+            for tracker_results in results
+        )
+    ]
+    if not selected:
+        raise RuntimeError("No sequence has complete results from every tracker.")
+    return (
+        [sequence_names[s] for s in selected],
+        numpy.concatenate([annotations[offsets[s] : offsets[s + 1]] for s in selected]),
+        numpy.cumsum([0] + [lengths[s] for s in selected]),
+    )
+
+
+def _sequence_keys(
+    tracker_name: str,
+    tracker_results: results_cache.TrackerResults,
+    sequence_names: list,
+    annotations: numpy.ndarray,
+    offsets: numpy.ndarray,
+) -> list:
+    """
+    Make the metric cache key of each sequence of a tracker.
+
+    Args:
+        tracker_name (str): The name of the tracker.
+        tracker_results (results_cache.TrackerResults): The tracker's results.
+        sequence_names (list): Make keys for these sequences.
+        annotations (numpy.ndarray): The frames x 4 annotations of all the sequences.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+
+    Returns:
+        list: The key of each sequence, from the tracker's boxes and times and the annotations.
+
+    Raises:
+        RuntimeError: This is raised if a sequence's results are missing or have the wrong length.
+    """
+    keys = []
+    for s, sequence_name in enumerate(sequence_names):
+        if sequence_name not in tracker_results:
+            raise RuntimeError(f"{tracker_name} has no results for {sequence_name}.")
+        boxes, times = tracker_results[sequence_name]
+        if len(boxes) != offsets[s + 1] - offsets[s]:
+            raise RuntimeError(
+                f"{tracker_name} has {len(boxes)} boxes for {sequence_name}; the annotations have "
+                f"{offsets[s + 1] - offsets[s]}."
+            )
+        keys.append(
+            metric_cache.content_key(boxes, times, annotations[offsets[s] : offsets[s + 1]])
+        )
+    return keys
+
+
+def _compute_metrics(
+    metrics: metric_cache.MetricCache,
+    tracker_names: list,
+    results: list,
+    keys: list,
+    sequence_names: list,
+    annotations: numpy.ndarray,
+    offsets: numpy.ndarray,
+) -> None:
+    """
+    Compute the per-sequence curves and speeds of trackers, and store them in the metric cache.
+
+    Args:
+        metrics (metric_cache.MetricCache): Store the metrics in this cache.
+        tracker_names (list): The names of the trackers to compute.
+        results (list): The :py:class:`experiments.results_cache.TrackerResults` of each tracker.
+        keys (list): The metric cache key of each tracker and sequence.
+        sequence_names (list): The names of the sequences.
+        annotations (numpy.ndarray): The frames x 4 annotations of all the sequences.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+    """
+    sequence_ids = numpy.repeat(numpy.arange(len(offsets) - 1), numpy.diff(offsets))
+    boxes, times = _load_results(results, sequence_names, offsets)
+    # GOT-10k replaces the first result of each sequence with the initial annotation.
+    boxes[:, offsets[:-1]] = annotations[offsets[:-1]]
+    valid = ~numpy.any(numpy.isnan(annotations), axis=-1)
+    success_curves = _success_curves(rect_iou(boxes, annotations), sequence_ids, valid)
+    precision_curves = _precision_curves(center_error(boxes, annotations), sequence_ids, valid)
+    speeds = _sequence_speeds(times, sequence_ids)
+    for t, tracker_name in enumerate(tracker_names):
+        for s, sequence_name in enumerate(sequence_names):
+            metrics.put(
+                tracker_name,
+                sequence_name,
+                keys[t][s],
+                {
+                    "success_curve": success_curves[t, s].tolist(),
+                    "precision_curve": precision_curves[t, s].tolist(),
+                    "speed": float(speeds[t, s]),
+                },
+            )
+
+
+def _load_results(results: list, sequence_names: list, offsets: numpy.ndarray) -> tuple:
+    """
+    Load the tracking results of every tracker and sequence into one array.
+
+    Args:
+        results (list): The :py:class:`experiments.results_cache.TrackerResults` of each tracker.
+        sequence_names (list): Load results for these sequences.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray). The first array is the trackers x frames
+        x 4 boxes, with the sequences concatenated. The second array is the trackers x frames
+        times.
+    """
+    boxes = numpy.empty((len(results), offsets[-1], 4))
+    times = numpy.empty((len(results), offsets[-1]))
+    for t, tracker_results in enumerate(results):
+        for s, sequence_name in enumerate(sequence_names):
+            boxes[t, offsets[s] : offsets[s + 1]], times[t, offsets[s] : offsets[s + 1]] = (
+                tracker_results[sequence_name]
+            )
+    return boxes, times
+
+
+def _sequence_speeds(times: numpy.ndarray, sequence_ids: numpy.ndarray) -> numpy.ndarray:
+    """
+    Compute the mean speed of every tracker on every sequence.
+
+    Args:
+        times (numpy.ndarray): The trackers x frames times. Frames without a time are NaN.
+        sequence_ids (numpy.ndarray): The sequence index of each frame.
+
+    Returns:
+        numpy.ndarray: The trackers x sequences mean speed, in frames per second. The speed is 0 if
+        no frame of the sequence has a positive time.
+    """
+    sequences = sequence_ids[-1] + 1
+    series = (numpy.arange(times.shape[0])[:, numpy.newaxis] * sequences + sequence_ids).ravel()
+    timed = (times > 0).ravel()
+    frame_speeds = numpy.zeros(times.size)
+    frame_speeds[timed] = 1.0 / times.ravel()[timed]
+    length = times.shape[0] * sequences
+    totals = numpy.bincount(series, weights=frame_speeds, minlength=length)
+    counts = numpy.bincount(series[timed], minlength=length)
+    speeds = numpy.divide(totals, counts, out=numpy.zeros(length), where=counts > 0)
+    return speeds.reshape(times.shape[0], sequences)
+
+
+def _success_curves(
+    ious: numpy.ndarray, sequence_ids: numpy.ndarray, valid: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Compute the success curve of every tracker and sequence.
+
+    Args:
+        ious (numpy.ndarray): The trackers x frames overlaps.
+        sequence_ids (numpy.ndarray): The sequence index of each frame.
+        valid (numpy.ndarray): The mask of frames to score.
+
+    Returns:
+        numpy.ndarray: The trackers x sequences x thresholds success curves.
+    """
+    # The number of thresholds each overlap exceeds. A NaN overlap exceeds none of them.
+    exceeded = numpy.searchsorted(SUCCESS_THRESHOLDS, ious, side="left")
+    exceeded[numpy.isnan(ious)] = 0
+    counts = _count_bins(exceeded, sequence_ids, valid, len(SUCCESS_THRESHOLDS) + 1)
+    # An overlap succeeds at threshold k if it exceeds more than k thresholds.
+    successes = numpy.cumsum(counts[..., ::-1], axis=-1)[..., ::-1][..., 1:]
+    return successes / _valid_frame_counts(sequence_ids, valid)
+
+
+def _precision_curves(
+    errors: numpy.ndarray, sequence_ids: numpy.ndarray, valid: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Compute the precision curve of every tracker and sequence.
+
+    Args:
+        errors (numpy.ndarray): The trackers x frames center errors.
+        sequence_ids (numpy.ndarray): The sequence index of each frame.
+        valid (numpy.ndarray): The mask of frames to score.
+
+    Returns:
+        numpy.ndarray: The trackers x sequences x thresholds precision curves.
+    """
+    # The number of thresholds below each error. A NaN error is above all of them.
+    below = numpy.searchsorted(PRECISION_THRESHOLDS, errors, side="left")
+    counts = _count_bins(below, sequence_ids, valid, len(PRECISION_THRESHOLDS) + 1)
+    # An error is precise at threshold k if at most k thresholds are below it.
+    precise = numpy.cumsum(counts, axis=-1)[..., :-1]
+    return precise / _valid_frame_counts(sequence_ids, valid)
+
+
+def _count_bins(
+    bins: numpy.ndarray, sequence_ids: numpy.ndarray, valid: numpy.ndarray, bin_count: int
+) -> numpy.ndarray:
+    """
+    Count the valid frames in each bin, for every tracker and sequence.
+
+    Args:
+        bins (numpy.ndarray): The trackers x frames bin index of each frame.
+        sequence_ids (numpy.ndarray): The sequence index of each frame.
+        valid (numpy.ndarray): The mask of frames to count.
+        bin_count (int): The number of bins.
+
+    Returns:
+        numpy.ndarray: The trackers x sequences x bins counts.
+    """
+    trackers = bins.shape[0]
+    sequences = sequence_ids[-1] + 1
+    series = numpy.arange(trackers)[:, numpy.newaxis] * sequences + sequence_ids
+    counts = numpy.bincount(
+        (series * bin_count + bins)[:, valid].ravel(),
+        minlength=trackers * sequences * bin_count,
+    )
+    return counts.reshape(trackers, sequences, bin_count)
+
+
+def _valid_frame_counts(sequence_ids: numpy.ndarray, valid: numpy.ndarray) -> numpy.ndarray:
+    """
+    Count the valid frames in each sequence.
+
+    Args:
+        sequence_ids (numpy.ndarray): The sequence index of each frame.
+        valid (numpy.ndarray): The mask of frames to count.
+
+    Returns:
+        numpy.ndarray: A sequences x 1 array of counts, ready to divide bin counts.
+    """
+    return numpy.bincount(sequence_ids[valid], minlength=sequence_ids[-1] + 1)[:, numpy.newaxis]
+
+
+def _tracker_performance(
+    sequence_names: list,
+    success_curves: numpy.ndarray,
+    precision_curves: numpy.ndarray,
+    speeds: numpy.ndarray,
+) -> dict:
+    """
+    Assemble the performance data of one tracker.
+
+    Args:
+        sequence_names (list): The names of the sequences.
+        success_curves (numpy.ndarray): The sequences x thresholds success curves.
+        precision_curves (numpy.ndarray): The sequences x thresholds precision curves.
+        speeds (numpy.ndarray): The mean speed on each sequence; 0 if it is unknown.
+
+    Returns:
+        dict: The performance data, in the same layout as one tracker in the GOT-10k report.
+    """
+    sequence_wise = {
+        name: _curve_performance(success_curves[s], precision_curves[s], speeds[s])
+        for s, name in enumerate(sequence_names)
+    }
+    if numpy.count_nonzero(speeds) > 0:
+        speed = numpy.sum(speeds) / numpy.count_nonzero(speeds)
+    else:
+        speed = -1
+    return {
+        "overall": _curve_performance(
+            numpy.mean(success_curves, axis=0), numpy.mean(precision_curves, axis=0), speed
+        ),
+        "seq_wise": sequence_wise,
+    }
+
+
+def _curve_performance(
+    success_curve: numpy.ndarray, precision_curve: numpy.ndarray, speed: float
+) -> dict:
+    """
+    Summarize success and precision curves.
+
+    Args:
+        success_curve (numpy.ndarray): The success curve.
+        precision_curve (numpy.ndarray): The precision curve.
+        speed (float): The tracking speed, in frames per second.
+
+    Returns:
+        dict: The curves, the success and precision scores, the success rate, and the speed.
+    """
+    return {
+        "success_curve": success_curve.tolist(),
+        "precision_curve": precision_curve.tolist(),
+        "success_score": float(numpy.mean(success_curve)),
+        "precision_score": float(precision_curve[20]),
+        "success_rate": float(success_curve[len(SUCCESS_THRESHOLDS) // 2]),
+        "speed_fps": float(speed) if speed > 0 else -1,
+    }
+
+
+def _plot_curves(performance: dict, report_dir: str) -> None:
+    """
+    Plot the overall success and precision curves of all trackers.
+
+    This imports matplotlib only when it is called.
+
+    Args:
+        performance (dict): The performance data from :py:func:`report()`.
+        report_dir (str): Write ``success_plots.png`` and ``precision_plots.png`` to this
+            directory.
+    """
+    import matplotlib.pyplot  # pylint: disable=import-outside-toplevel
+
+    for curve, score, thresholds, labels, file_name in [
+        (
+            "success_curve",
+            "success_score",
+            SUCCESS_THRESHOLDS,
+            ("Overlap threshold", "Success rate", "Success plots of OPE"),
+            "success_plots.png",
+        ),
+        (
+            "precision_curve",
+            "precision_score",
+            PRECISION_THRESHOLDS,
+            ("Location error threshold", "Precision", "Precision plots of OPE"),
+            "precision_plots.png",
+        ),
+    ]:
+        figure, axes = matplotlib.pyplot.subplots()
+        names = sorted(performance, key=lambda n, s=score: performance[n]["overall"][s])[::-1]
+        for i, name in enumerate(names):
+            axes.plot(
+                thresholds,
+                performance[name]["overall"][curve],
+                ["-", "--", "-."][i // 10 % 3],
+                label=f"{name}: [{performance[name]['overall'][score]:.3f}]",
+            )
+        legend = axes.legend(loc="center left", bbox_to_anchor=(1, 0.5), fontsize=7.4)
+        axes.set(
+            xlabel=labels[0],
+            ylabel=labels[1],
+            xlim=(0, thresholds.max()),
+            ylim=(0, 1),
+            title=labels[2],
+        )
+        axes.grid(True)
+        figure.tight_layout()
+        figure.savefig(
+            os.path.join(report_dir, file_name),
+            bbox_extra_artists=(legend,),
+            bbox_inches="tight",
+            dpi=300,
+        )
+        matplotlib.pyplot.close(figure)
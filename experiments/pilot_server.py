@@ -0,0 +1,536 @@
+"""
+Keep pilot study state resident in a server process.
+
+Every pilot study run pays for Python startup, importing PyTorch, indexing the dataset, and loading
+the model before it tracks the first frame. The pilot server pays those costs once. It listens on a
+local Unix socket, and ``flatfoot.py pilot`` sends its job to the server when the server is running.
+The server keeps these resident between jobs:
+
+* the imported tracker code, which the server reloads when a source file changes,
+* the loaded model for each ``tracking/options.yaml``; each sequence tracks with a copy,
+* the dataset index of each dataset directory, and the frame list and annotations of each sequence,
+* optionally, the decoded frames, up to a memory limit.
+
+The server runs one job at a time, in the client's working directory. The client prints the
+server's console output as it arrives, so the progress bar looks the same as a local run. Start
+the server with the same ``PYTHONPATH`` as the pilot command, so it imports the same tracker code.
+
+Protocol
+--------
+
+The client sends one JSON line with the job. The server replies with JSON lines; each is one of
+``{"output": text}``, ``{"result": results}``, or ``{"error": message}``. The result or error is
+the last line.
+
+Running this Module as a Script
+-------------------------------
+
+You can run this module as a stand-alone script to start the server.
+
+.. literalinclude:: generated/serve_help.rst
+    :language: text
+
+Reference
+---------
+"""
+
+import argparse
+import collections
+import copy
+import contextlib
+import importlib
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import got10k.datasets
+import experiments.adaptive_pilot as adaptive_pilot
+import experiments.command_line as command_line
+import experiments.image_decoder as image_decoder
+import experiments.tracking_cache as tracking_cache
+
+DEFAULT_SOCKET = os.path.expanduser("~/.cache/flatfoot/pilot.sock")
+
+
+def add_socket_parameter(parser: argparse.ArgumentParser) -> argparse.Action:
+    """
+    Add the ``--server-socket`` parameter to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Add the parameter to this parser.
+
+    Returns:
+        argparse.Action: This function returns the :py:class:`argparse.Action` that represents the
+        command line argument. The caller can tweak the action if necessary.
+    """
+    return parser.add_argument(
+        "--server-socket",
+        help="The Unix socket of the pilot server.",
+        default=DEFAULT_SOCKET,
+        action=command_line.PathSanitizer,
+    )
+
+
+def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Create the command line parser for the pilot server.
+
+    This function supports filling in a subparser or a root parser. In both cases, this function
+    overwrites certain parser attributes, such as the description.
+
+    Args:
+        parser (argparse.ArgumentParser): Fill out this argument parser. This can be a root parser
+            or a subparser created with `add_subparsers()
+            <https://docs.python.org/3/library/argparse.html#argparse.ArgumentParser.add_subparsers>`_.
+
+    Returns:
+        The parser, filled with parameters and attributes, ready for command line parsing.
+    """
+    parser.description = (
+        "Run a pilot study server. The server keeps the tracker code, models, and dataset indexes "
+        "loaded between pilot studies. The pilot command uses the server while it is running."
+    )
+    parser.formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    parser.set_defaults(func=main)
+    add_socket_parameter(parser)
+    parser.add_argument(
+        "--keep-frames",
+        help="Keep decoded frames in memory between pilot studies. Pilot studies on the server "
+        "then decode frames in the server process.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--frame-memory",
+        help="Keep at most this many MiB of decoded frames.",
+        type=int,
+        default=4096,
+    )
+    return parser
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """
+    The main entry point for the pilot server.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
+            have these attributes: ``server_socket``, ``keep_frames``, and ``frame_memory``.
+    """
+    # The pilot study module imports this module to submit jobs, so import it here.
+    import experiments.pilot_study as pilot_study  # pylint: disable=import-outside-toplevel
+
+    state = _ResidentPilot(
+        pilot_study,
+        arguments.frame_memory * 2 ** 20 if arguments.keep_frames else 0,
+    )
+    serve(arguments.server_socket, state.run)
+
+
+def make_request(
+    arguments: argparse.Namespace, sequences: list = None, sequential_test: dict = None
+) -> dict:
+    """
+    Make a pilot server job from pilot study command line arguments.
+
+    Args:
+        arguments (argparse.Namespace): The parsed pilot study command line arguments.
+        sequences (list): Track these sequences, in this order. If this is ``None``, track
+            ``arguments.sequences``.
+        sequential_test (dict): If this is not ``None``, the job is an adaptive pilot study. These
+            are the keyword arguments for :py:class:`experiments.adaptive_pilot.SignTest`.
+
+    Returns:
+        dict: The job. Relative paths in the job are relative to ``cwd``.
+    """
+    return {
+        "cwd": os.getcwd(),
+        "columns": shutil.get_terminal_size()[0],
+        "sequences": arguments.sequences if sequences is None else sequences,
+        "dataset_dir": arguments.dataset_dir,
+        "decoder": arguments.decoder,
+        "frame_cache_dir": arguments.frame_cache_dir,
+        "frame_ring_slots": arguments.frame_ring_slots,
+        "sequential_test": sequential_test,
+        "use_cache": not arguments.no_cache,
+    }
+
+
+def submit(socket_path: str, request: dict):
+    """
+    Run a job on the pilot server.
+
+    The function prints the server's console output as it arrives.
+
+    Args:
+        socket_path (str): The path to the server's Unix socket.
+        request (dict): The job, from :py:func:`make_request()`.
+
+    Returns:
+        dict | None: The job results, or ``None`` if no server is listening on ``socket_path``.
+
+    Raises:
+        RuntimeError: This is raised if the job fails on the server.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+    with client, client.makefile("r") as replies:
+        client.sendall((json.dumps(request) + "\n").encode())
+        for line in replies:
+            reply = json.loads(line)
+            if "output" in reply:
+                sys.stdout.write(reply["output"])
+                sys.stdout.flush()
+            elif "error" in reply:
+                raise RuntimeError(f"The pilot server failed: {reply['error']}")
+            else:
+                return reply["result"]
+    raise RuntimeError("The pilot server closed the connection without a result.")
+
+
+def serve(socket_path: str, handler) -> None:
+    """
+    Serve jobs on a Unix socket until the process is interrupted.
+
+    Args:
+        socket_path (str): Listen on this Unix socket.
+        handler: A callable that takes a job dictionary and returns the results dictionary. Its
+            console output goes to the client.
+
+    Raises:
+        RuntimeError: This is raised if another server is already listening on ``socket_path``.
+    """
+    if is_running(socket_path):
+        raise RuntimeError(f"A pilot server is already listening on {socket_path}.")
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        command_line.print_information("Listening on", socket_path)
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                _handle_connection(connection, handler)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+
+
+def is_running(socket_path: str) -> bool:
+    """
+    Check if a server is listening on a socket.
+
+    Args:
+        socket_path (str): Check this Unix socket.
+
+    Returns:
+        bool: ``True`` if a server accepts connections on ``socket_path``.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+def _handle_connection(connection: socket.socket, handler) -> None:
+    """
+    Run one job from a client.
+
+    Args:
+        connection (socket.socket): The client connection.
+        handler: Run the job with this callable.
+    """
+    with connection.makefile("r") as requests:
+        line = requests.readline()
+    if not line:
+        return
+    writer = _ReplyWriter(connection)
+    try:
+        request = json.loads(line)
+        command_line.print_information("Running", " ".join(request["sequences"]))
+        with contextlib.redirect_stdout(writer):
+            results = handler(request)
+    except Exception as error:  # pylint: disable=broad-except
+        command_line.print_warning(str(error))
+        reply = {"error": str(error)}
+    else:
+        reply = {"result": results}
+    # If the client is gone, there is nobody to tell.
+    with contextlib.suppress(OSError):
+        writer.send(reply)
+
+
+class _ReplyWriter(io.TextIOBase):
+    """
+    A text stream that sends what it receives to the client as ``output`` replies.
+
+    Args:
+        connection (socket.socket): Send replies on this connection.
+    """
+
+    def __init__(self, connection: socket.socket) -> None:
+        super().__init__()
+        self.__connection = connection
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self.send({"output": text})
+        return len(text)
+
+    def send(self, reply: dict) -> None:
+        """
+        Send a reply to the client.
+
+        Args:
+            reply (dict): Send this reply as one JSON line.
+        """
+        self.__connection.sendall((json.dumps(reply) + "\n").encode())
+
+
+class _ResidentPilot:
+    """
+    Run pilot study jobs with resident trackers, datasets, and frames.
+
+    Args:
+        pilot_study: The :py:mod:`experiments.pilot_study` module.
+        frame_memory (int): Keep at most this many bytes of decoded frames. If this is 0, do not
+            keep frames.
+    """
+
+    def __init__(self, pilot_study, frame_memory: int) -> None:
+        self.__pilot_study = pilot_study
+        self.__datasets = {}
+        self.__trackers = {}
+        self.__frames = _FrameCache(frame_memory) if frame_memory > 0 else None
+        # Import the tracker now, so the first job does not pay for it.
+        import tracking.mdnet  # pylint: disable=import-outside-toplevel
+
+        self.__sources = _SourceWatcher(os.path.dirname(os.path.dirname(tracking.mdnet.__file__)))
+
+    def run(self, request: dict) -> dict:
+        """
+        Run a pilot study job.
+
+        Args:
+            request (dict): The job, from :py:func:`make_request()`.
+
+        Returns:
+            dict: The results from :py:func:`experiments.pilot_study.run_study()`.
+        """
+        if self.__sources.reload_changed():
+            command_line.print_information("Reloaded the tracker code.")
+            self.__trackers.clear()
+        os.chdir(request["cwd"])
+        os.environ["COLUMNS"] = str(request["columns"])
+        decoder = image_decoder.make_decoder(request["decoder"], request["frame_cache_dir"])
+        frame_ring_slots = request["frame_ring_slots"]
+        if self.__frames is not None:
+            decoder = self.__frames.wrap(decoder)
+            frame_ring_slots = 0
+        return self.__pilot_study.run_study(
+            request["sequences"],
+            self.__dataset(request["dataset_dir"]),
+            decoder,
+            frame_ring_slots,
+            self.__make_tracker,
+            None
+            if request.get("sequential_test") is None
+            else adaptive_pilot.SignTest(**request["sequential_test"]).update,
+            tracking_cache.TrackingCache() if request.get("use_cache") else None,
+        )
+
+    def __dataset(self, dataset_dir: str) -> "_IndexedDataset":
+        if dataset_dir not in self.__datasets:
+            self.__datasets[dataset_dir] = _IndexedDataset(
+                got10k.datasets.OTB(dataset_dir, version="tb100")
+            )
+        return self.__datasets[dataset_dir]
+
+    def __make_tracker(self):
+        configuration = os.path.abspath("tracking/options.yaml")
+        key = (configuration, os.stat(configuration).st_mtime_ns)
+        if key not in self.__trackers:
+            # pylint: disable-next=protected-access
+            self.__trackers[key] = self.__pilot_study._make_mdnet()
+        return copy.deepcopy(self.__trackers[key])
+
+
+class _IndexedDataset:
+    """
+    A dataset wrapper that remembers each sequence's frame list and annotations.
+
+    Args:
+        dataset: Wrap this GOT-10k style dataset.
+    """
+
+    def __init__(self, dataset) -> None:
+        self.__dataset = dataset
+        self.__sequences = {}
+
+    def __getitem__(self, sequence_name: str) -> tuple:
+        if sequence_name not in self.__sequences:
+            self.__sequences[sequence_name] = self.__dataset[sequence_name]
+        return self.__sequences[sequence_name]
+
+
+class _FrameCache:
+    """
+    Keep recently decoded frames in memory.
+
+    Args:
+        capacity (int): Keep at most this many bytes of frames. The least recently used frames are
+            dropped first.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.__capacity = capacity
+        self.__size = 0
+        self.__frames = collections.OrderedDict()
+
+    def wrap(self, decoder) -> "_CachedDecoder":
+        """
+        Make a decoder that reads frames through this cache.
+
+        Args:
+            decoder: Decode frames that are not in the cache with this decoder.
+
+        Returns:
+            _CachedDecoder: The caching decoder.
+        """
+        return _CachedDecoder(self, decoder)
+
+    def get(self, key: tuple):
+        """
+        Get a frame.
+
+        Args:
+            key (tuple): The (decoder name, image path) of the frame.
+
+        Returns:
+            PIL.Image.Image | None: The frame, or ``None`` if it is not in the cache.
+        """
+        frame = self.__frames.get(key)
+        if frame is not None:
+            self.__frames.move_to_end(key)
+        return frame
+
+    def put(self, key: tuple, frame) -> None:
+        """
+        Add a frame to the cache.
+
+        Args:
+            key (tuple): The (decoder name, image path) of the frame.
+            frame (PIL.Image.Image): The decoded frame.
+        """
+        self.__frames[key] = frame
+        self.__size += _frame_bytes(frame)
+        while self.__size > self.__capacity and self.__frames:
+            _, dropped = self.__frames.popitem(last=False)
+            self.__size -= _frame_bytes(dropped)
+
+
+class _CachedDecoder:
+    """
+    A decoder that reads frames through a :py:class:`_FrameCache`.
+
+    Args:
+        cache (_FrameCache): Read and add frames to this cache.
+        decoder: Decode frames that are not in the cache with this decoder.
+
+    Attributes:
+        name (str): The name of the wrapped decoder.
+    """
+
+    def __init__(self, cache: _FrameCache, decoder) -> None:
+        self.name = decoder.name
+        self.__cache = cache
+        self.__decoder = decoder
+
+    def decode(self, image_path: str):
+        """
+        Decode an image, or get it from the cache.
+
+        Args:
+            image_path (str): The path to the image.
+
+        Returns:
+            PIL.Image.Image: The decoded image.
+        """
+        key = (self.name, image_path)
+        frame = self.__cache.get(key)
+        if frame is None:
+            frame = self.__decoder.decode(image_path)
+            self.__cache.put(key, frame)
+        return frame
+
+
+def _frame_bytes(frame) -> int:
+    return frame.width * frame.height * len(frame.getbands())
+
+
+class _SourceWatcher:
+    """
+    Reload the modules under a directory when their source files change.
+
+    Args:
+        root (str): Watch the modules whose files are in this directory.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.__root = os.path.join(os.path.abspath(root), "")
+        self.__times = self.__source_times()
+
+    def reload_changed(self) -> bool:
+        """
+        Reload the watched modules if any source file changed.
+
+        All the watched modules are reloaded, in the reverse of the order they were first imported.
+        A module enters ``sys.modules`` before the modules it imports, so this reloads the imported
+        modules first, and modules that import names from a changed module see the new code.
+
+        Returns:
+            bool: ``True`` if the function reloaded the modules.
+        """
+        times = self.__source_times()
+        if all(times.get(name, mtime) == mtime for name, mtime in self.__times.items()):
+            # Modules imported since the last check are new, not changed.
+            self.__times = times
+            return False
+        for name in reversed(list(times)):
+            if name in sys.modules:
+                importlib.reload(sys.modules[name])
+        self.__times = self.__source_times()
+        return True
+
+    def __source_times(self) -> dict:
+        times = {}
+        for name, module in list(sys.modules.items()):
+            file_path = getattr(module, "__file__", None)
+            if file_path and os.path.abspath(file_path).startswith(self.__root):
+                with contextlib.suppress(OSError):
+                    times[name] = os.stat(file_path).st_mtime_ns
+        return times
+
+
+if __name__ == "__main__":
+    PARSER = fill_command_line_parser(argparse.ArgumentParser())
+    ARGUMENTS = PARSER.parse_args()
+    ARGUMENTS.func(ARGUMENTS)
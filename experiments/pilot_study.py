@@ -4,6 +4,23 @@ Run a fast pilot study of a tracker.
 This module runs a pilot tracking study. The primary use cases are rapid feedback of tracker
 performance, and quick testing of changes to tracker code.
 
+If a :py:mod:`experiments.pilot_server` is running, the pilot study runs on the server, which
+already has the tracker, model, and dataset loaded. Otherwise, the pilot study runs in this
+process.
+
+With ``--baseline``, the pilot study is adaptive. It compares the tracker to a baseline tracker in
+the pilot study database, and stops as soon as the comparison is settled. See
+:py:mod:`experiments.adaptive_pilot` for the sequence order and the sequential test. An adaptive
+study that stops early only tracks some of the sequences, so its scores are merged into the
+tracker's scores in the database instead of replacing them. The baseline cannot be the tracker
+itself.
+
+The mean time of a sequence is the mean time the tracker takes to find the target in each frame
+after the first. Each frame is decoded before its timer starts, either in this process or in a
+:py:mod:`experiments.frame_ring`, so the time does not include decoding. Pilot studies saved by
+earlier versions decoded each frame inside ``find_target()``, so their times include decoding; run
+the baseline again before comparing times with it.
+
 Running this Module as a Script
 -------------------------------
 
@@ -43,17 +60,20 @@ Reference
 """
 
 import argparse
+import importlib
 import json
 import os
+import shutil
 import sys
 import time
 import numpy
-import PIL.Image
-import got10k.experiments
+import got10k.datasets
+import experiments.adaptive_pilot
 import experiments.command_line
-import modules.utils
-import tracking.gen_config
-import tracking.mdnet
+import experiments.frame_ring
+import experiments.image_decoder
+import experiments.pilot_server
+import experiments.tracking_cache
 
 
 def fill_command_line_parser(
@@ -88,6 +108,32 @@ def fill_command_line_parser(
         help="The path to the root Python tracker module.",
         action=experiments.command_line.PathSanitizer,
     )
+    experiments.image_decoder.add_decoder_parameters(parser)
+    experiments.frame_ring.add_frame_ring_parameter(parser)
+    experiments.pilot_server.add_socket_parameter(parser)
+    experiments.tracking_cache.add_cache_parameter(parser)
+    parser.add_argument(
+        "--no-server",
+        help="Run the pilot study in this process, even if a pilot server is running.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Compare the tracker to this tracker in the pilot study database, and stop as soon as "
+        "a sequential test settles whether the tracker is better or worse.",
+    )
+    parser.add_argument(
+        "--alpha",
+        help="The significance level of the adaptive pilot study's sequential test.",
+        type=float,
+        default=0.05,
+    )
+    parser.add_argument(
+        "--tie-margin",
+        help="In an adaptive pilot study, IoU differences this small count as ties.",
+        type=float,
+        default=0.01,
+    )
     parser.add_argument(
         "sequences",
         help="Track this sequences in the pilot study. These must name a sequence in the OTB-100"
@@ -109,28 +155,153 @@ def main(arguments: argparse.Namespace) -> None:
 
     Args:
         arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
-            have these attributes: ``sequences``, ``dataset_dir``, ``tracker_name``, and
-            ``results_dir``.
+            have these attributes: ``sequences``, ``dataset_dir``, ``tracker_name``,
+            ``results_dir``, ``decoder``, ``frame_cache_dir``, ``frame_ring_slots``,
+            ``server_socket``, ``no_server``, ``baseline``, ``alpha``, ``tie_margin``, and
+            ``no_cache``.
     """
-    progress_bar = _ProgressBar((len(max(arguments.sequences, key=len)) + 1, 0), 0, "")
-    dataset = got10k.datasets.OTB(arguments.dataset_dir, version="tb100")
-    results = {sequence: {} for sequence in arguments.sequences}
-    for sequence in arguments.sequences:
-        sequence_result = _run_sequence(sequence, dataset, progress_bar)
-        results[sequence] = {
-            "mean iou": sequence_result[0],
-            "mean time": sequence_result[1],
-        }
+    sequences = arguments.sequences
+    sequential_test = None
+    if arguments.baseline:
+        sequences, sequential_test = _plan_adaptive_study(arguments)
+    results = None
+    if not arguments.no_server:
+        results = experiments.pilot_server.submit(
+            arguments.server_socket,
+            experiments.pilot_server.make_request(arguments, sequences, sequential_test),
+        )
+    if results is None:
+        results = run_study(
+            sequences,
+            got10k.datasets.OTB(arguments.dataset_dir, version="tb100"),
+            experiments.image_decoder.make_decoder(arguments.decoder, arguments.frame_cache_dir),
+            arguments.frame_ring_slots,
+            stop=None
+            if sequential_test is None
+            else experiments.adaptive_pilot.SignTest(**sequential_test).update,
+            cache=None if arguments.no_cache else experiments.tracking_cache.TrackingCache(),
+        )
     for sequence, data in results.items():
         print(sequence)
         print(f"  Mean IoU = {data['mean iou']:.3f}")
-        print(f"  Mean t   = {data['mean time']:.3f}")
+        print(f"  Mean t   = {data['mean time']:.3f}" + (" (cached)" if data["cached"] else ""))
     if arguments.tracker_name:
         _save_results(
             arguments.tracker_name,
             arguments.results_dir,
             {sequence: data["mean iou"] for sequence, data in results.items()},
+            merge=sequential_test is not None,
+        )
+    if sequential_test is not None:
+        _print_adaptive_outcome(arguments.baseline, sequential_test, results)
+
+
+def run_study(
+    sequences: list,
+    dataset,
+    decoder,
+    frame_ring_slots: int = 0,
+    make_tracker=None,
+    stop=None,
+    cache: experiments.tracking_cache.TrackingCache = None,
+) -> dict:
+    """
+    Track each pilot study sequence.
+
+    Args:
+        sequences (list): Track these sequences.
+        dataset: Read the sequences from this GOT-10k style dataset.
+        decoder: Decode frames with this :py:mod:`experiments.image_decoder` backend.
+        frame_ring_slots (int): Decode frames in a separate process with a frame ring of this many
+            slots. If this is 0, decode frames in this process.
+        make_tracker: A callable that takes no arguments and returns a new tracker for each
+            sequence. If this is ``None``, each sequence uses a new MDNet tracker configured by
+            ``tracking/options.yaml``.
+        stop: If this is not ``None``, call it with each sequence name and mean IoU after the
+            sequence. If it returns ``True``, skip the remaining sequences.
+        cache (experiments.tracking_cache.TrackingCache): If this is not ``None``, reuse tracker
+            output from this cache, and store new output in it.
+
+    Returns:
+        dict: The results, in tracking order. The keys are the sequence names, and each value is a
+        dictionary with the sequence's ``mean iou`` and ``mean time``, and ``cached``, which is
+        ``True`` if the output came from the tracking cache. The mean time of a cached sequence
+        was measured by the run that stored the output.
+    """
+    progress_bar = _ProgressBar((len(max(sequences, key=len)) + 1, 0), 0, "")
+    results = {}
+    for sequence in sequences:
+        sequence_result = _run_sequence(
+            sequence,
+            dataset,
+            progress_bar,
+            decoder,
+            frame_ring_slots,
+            _make_mdnet if make_tracker is None else make_tracker,
+            cache,
         )
+        results[sequence] = {
+            "mean iou": sequence_result[0],
+            "mean time": sequence_result[1],
+            "cached": sequence_result[2],
+        }
+        if stop is not None and stop(sequence, sequence_result[0]):
+            break
+    return results
+
+
+def _plan_adaptive_study(arguments: argparse.Namespace) -> tuple:
+    """
+    Order the sequences and configure the sequential test of an adaptive pilot study.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        tuple: A tuple of (list, dict); the sequences in tracking order, and the keyword arguments
+        for :py:class:`experiments.adaptive_pilot.SignTest`.
+
+    Raises:
+        RuntimeError: This is raised if the baseline is not in the pilot study database, or if the
+            baseline is the tracker itself.
+    """
+    if arguments.baseline == arguments.tracker_name:
+        raise RuntimeError(
+            f"{arguments.baseline} cannot be its own baseline; use a different --tracker-name."
+        )
+    results_path = os.path.join(arguments.results_dir, "pilot_results.json")
+    pilot_results = {}
+    if os.path.isfile(results_path):
+        with open(results_path, "r") as results_file:
+            pilot_results = json.load(results_file)
+    if arguments.baseline not in pilot_results:
+        raise RuntimeError(
+            f"{arguments.baseline} is not in the pilot study database {results_path}."
+        )
+    sequences = experiments.adaptive_pilot.order_sequences(
+        arguments.sequences, pilot_results, arguments.baseline
+    )
+    experiments.command_line.print_information("Adaptive order:", " ".join(sequences))
+    return sequences, {
+        "baseline_scores": pilot_results[arguments.baseline]["scores"],
+        "sequences": sequences,
+        "alpha": arguments.alpha,
+        "tie_margin": arguments.tie_margin,
+    }
+
+
+def _print_adaptive_outcome(baseline: str, sequential_test: dict, results: dict) -> None:
+    test = experiments.adaptive_pilot.SignTest(**sequential_test)
+    for sequence, data in results.items():
+        test.update(sequence, data["mean iou"])
+    summary = (
+        f"{test.wins} wins, {test.losses} losses, and {test.ties} ties against {baseline} after "
+        f"{len(results)} of {len(sequential_test['sequences'])} sequences."
+    )
+    if test.outcome in (experiments.adaptive_pilot.BETTER, experiments.adaptive_pilot.WORSE):
+        experiments.command_line.print_information(f"The tracker is {test.outcome}:", summary)
+    else:
+        experiments.command_line.print_warning("The comparison is inconclusive:", summary)
 
 
 class _ProgressBar:
@@ -155,7 +326,7 @@ class _ProgressBar:
         Args:
             i (int): The current value of the progress bar.
         """
-        bar_capacity = os.get_terminal_size()[0] - self.margins[0] - self.margins[1] - 2
+        bar_capacity = shutil.get_terminal_size()[0] - self.margins[0] - self.margins[1] - 2
         bar_width = int(float(i) / self.maximum * bar_capacity)
         space_width = bar_capacity - bar_width
         print(
@@ -170,56 +341,146 @@ class _ProgressBar:
         )
 
 
-
 def _import_tracker(module_path: str) -> None:
     if not os.path.isfile(module_path):
         raise FileNotFoundError(f"Invalid path to the tracker module: {module_path}")
     sys.path.append(os.path.dirname(module_path))
-    importlib.
+    importlib.import_module(os.path.splitext(os.path.basename(module_path))[0])
+
+
+def _make_mdnet(options: dict = None):
+    # py-MDNet imports PyTorch, so only import it when a tracker is needed. A pilot study that
+    # runs on a pilot server never needs it in the client.
+    import tracking.mdnet  # pylint: disable=import-outside-toplevel
+
+    configuration = tracking.mdnet.read_configuration("tracking/options.yaml")
+    if options:
+        configuration.update(options)
+    return tracking.mdnet.Mdnet(configuration)
+
 
 def _run_sequence(
-    sequence_name: str, dataset: got10k.datasets.OTB, progress_bar: _ProgressBar
+    sequence_name: str,
+    dataset: got10k.datasets.OTB,
+    progress_bar: _ProgressBar,
+    decoder,
+    frame_ring_slots: int = 0,
+    make_tracker=_make_mdnet,
+    cache: experiments.tracking_cache.TrackingCache = None,
 ) -> None:
     # Ensure the random generators are seeded. This makes the study deterministic; if the test
-    # fails, we KNOW it's from our code changes instead of randomness.
-    mdnet = tracking.mdnet.Mdnet(
-        tracking.mdnet.read_configuration("tracking/options.yaml")
-    )
+    # fails, we KNOW it's from our code changes instead of randomness. It also makes the output
+    # safe to reuse from the tracking cache.
+    mdnet = make_tracker()
     mdnet.opts["random_seed"] = 0
     images, groundtruth = dataset[sequence_name]
+    key = None
+    output = None
+    if cache is not None:
+        key = experiments.tracking_cache.tracking_key(mdnet, sequence_name, images, groundtruth[0])
+        output = cache.get(key)
+    cached = output is not None
+    if output is None:
+        experiments.image_decoder.verify_decoder(decoder, images[:1])
+        output = _track_sequence(
+            mdnet, sequence_name, images, groundtruth, progress_bar, decoder, frame_ring_slots
+        )
+        if cache is not None:
+            cache.put(key, *output)
+    else:
+        print(sequence_name, "is in the tracking cache.")
+    boxes, frame_processing_times = output
+    return (
+        _overlaps(boxes, groundtruth).mean(),
+        frame_processing_times[1:].mean(),
+        cached,
+    )
+
+
+def _overlaps(boxes: numpy.ndarray, groundtruth: numpy.ndarray) -> numpy.ndarray:
+    """
+    Measure the overlap of tracked boxes with the ground truth.
+
+    Args:
+        boxes (numpy.ndarray): The frames x 4 tracked boxes.
+        groundtruth (numpy.ndarray): The frames x 4 ground truth boxes.
+
+    Returns:
+        numpy.ndarray: The IoU of each frame. The first frame is the initialization frame; its IoU
+        is 1.
+    """
+    import modules.utils  # pylint: disable=import-outside-toplevel
+
+    ious = numpy.ones(len(boxes))
+    for i in range(1, len(boxes)):
+        ious[i] = modules.utils.overlap_ratio(boxes[i], groundtruth[i])
+    return ious
+
+
+def _track_sequence(
+    tracker,
+    sequence_name: str,
+    images: list,
+    groundtruth: numpy.ndarray,
+    progress_bar: _ProgressBar,
+    decoder,
+    frame_ring_slots: int = 0,
+) -> tuple:
+    """
+    Track one sequence, and measure the processing time of each frame.
+
+    Args:
+        tracker: Track the target with this object. It must provide ``initialize(image, box)`` and
+            ``find_target(image)``, like ``tracking.mdnet.Mdnet``.
+        sequence_name (str): The name of the sequence, for the progress bar.
+        images (list): The paths to the sequence frames.
+        groundtruth (numpy.ndarray): The frames x 4 ground truth boxes.
+        progress_bar (_ProgressBar): Show the tracking progress with this progress bar.
+        decoder: Decode frames with this :py:mod:`experiments.image_decoder` backend.
+        frame_ring_slots (int): Decode frames in a separate process with a frame ring of this many
+            slots. If this is 0, decode frames in this process.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the frames x 4 boxes and the processing
+        time, in seconds, of each frame. The processing time does not include decoding the frame.
+        The first frame is the initialization frame; its box is the ground truth and its time is
+        0.
+    """
     progress_bar.label = sequence_name
     progress_bar.maximum = len(images)
     print("Initializing", sequence_name, "on frame 0...", end="\r")
-    mdnet.initialize(_load_image(images[0]), groundtruth[0])
-    ious = numpy.zeros(len(images))
+    boxes = numpy.zeros((len(images), 4))
+    boxes[0] = groundtruth[0]
     frame_processing_times = numpy.zeros(len(images))
-    ious[0] = 1.0
-    for i, (image_file, gt) in enumerate(zip(images[1:], groundtruth[1:]), start=1):
-        progress_bar.print(i)
-        start_time = time.time()
-        target = mdnet.find_target(_load_image(image_file))
-        frame_processing_times[i] = time.time() - start_time
-        ious[i] = modules.utils.overlap_ratio(target, gt)
+    with experiments.frame_ring.decoded_frames(images, decoder, frame_ring_slots) as frames:
+        tracker.initialize(next(frames), groundtruth[0])
+        for i, image in enumerate(frames, start=1):
+            progress_bar.print(i)
+            start_time = time.time()
+            boxes[i] = tracker.find_target(image)
+            frame_processing_times[i] = time.time() - start_time
     progress_bar.print(progress_bar.maximum)
     print()
-    return ious.mean(), frame_processing_times[1:].mean()
-
+    return boxes, frame_processing_times
 
-def _load_image(image_path: str) -> PIL.Image.Image:
-    return PIL.Image.open(image_path).convert("RGB")
 
-
-def _save_results(tracker_name: str, results_dir: str, results: dict) -> None:
+def _save_results(
+    tracker_name: str, results_dir: str, results: dict, tags: list = None, merge: bool = False
+) -> None:
     results_path = os.path.join(results_dir, "pilot_results.json")
     if os.path.isfile(results_path):
         with open(results_path, "r") as results_file:
             current_data = json.load(results_file)
     else:
         current_data = {}
-    if tracker_name in current_data:
+    if tracker_name in current_data and merge:
+        current_data[tracker_name]["scores"].update(results)
+    elif tracker_name in current_data:
         current_data[tracker_name]["scores"] = results
     else:
         current_data[tracker_name] = {"scores": results, "tags": []}
+    if tags is not None:
+        current_data[tracker_name]["tags"] = tags
     with open(results_path, "w") as results_file:
         json.dump(current_data, results_file, indent=2)
 
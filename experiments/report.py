@@ -2,7 +2,10 @@
 Generate tracking reports.
 
 This module generates tracking reports for known experiment benchmarks, and summary tables of the
-results. You must independently run tracking experiments before using this module.
+results. You must independently run tracking experiments before using this module. Reports read
+each benchmark's dataset from the directory the experiment command recorded in the results
+directory; see :py:func:`experiments.results_manifest.read_dataset_dir()`. Results without that
+record use the default dataset locations under ``~/Videos``.
 
 Running this Module as a Script
 -------------------------------
@@ -43,13 +46,23 @@ Reference
 """
 
 import argparse
+import concurrent.futures
 import datetime
 import glob
+import itertools
 import json
 import os.path
-import got10k.experiments
+import numpy
+import got10k.datasets
+import experiments.bootstrap as bootstrap
 import experiments.command_line as command_line
+import experiments.ope_report as ope_report
+import experiments.results_manifest as results_manifest
+import experiments.results_watcher as results_watcher
+import experiments.speed_report as speed_report
+import experiments.synthetic_dataset as synthetic_dataset
 import experiments.table as table
+import experiments.vot_report as vot_report
 
 
 def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
@@ -91,10 +104,65 @@ def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.Argume
     )
     parser.add_argument(
         "--summary-format",
-        help="Write summary tables in this format.",
-        choices=["csv", "tex"],
+        help="Write summary tables in this format. 'npz' and 'jsonl' keep the full precision data "
+        "for other tools; see table.write_table().",
+        choices=["csv", "tex", "npz", "jsonl"],
         default="tex",
     )
+    parser.add_argument(
+        "--force",
+        help="Regenerate every benchmark report, even if its results have not changed since the "
+        "last report.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--engine",
+        help="Compute reports with this engine. 'native' computes all trackers in one vectorized "
+        "pass; 'got10k' uses the GOT-10k toolkit.",
+        choices=["native", "got10k"],
+        default="native",
+    )
+    parser.add_argument(
+        "--no-plots",
+        help="Only compute the performance data for the summary tables; do not render success "
+        "and precision plots. OTB and UAV123 reports use the native engine in this mode, so "
+        "matplotlib is never imported.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--jobs",
+        help="Generate up to this many benchmark reports concurrently, each in its own process.",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--watch",
+        help="Keep running, and update the reports whenever new results land in the results "
+        "directory. Reports score only the sequences that every tracker has finished, and use "
+        "the native engine in this mode. Press Ctrl+C to stop.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--debounce",
+        help="In watch mode, wait until the results directory has been quiet for this many "
+        "seconds before updating the reports.",
+        type=float,
+        default=5.0,
+    )
+    parser.add_argument(
+        "--bootstrap",
+        help="Resample each OTB and UAV123 benchmark's sequences this many times, and write a "
+        "table per benchmark with each tracker's confidence interval and its probability of "
+        "beating every other tracker. Use 0 to skip the bootstrap.",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "--confidence",
+        help="The confidence level of the bootstrap intervals.",
+        type=float,
+        default=0.95,
+    )
     command_line.add_results_dir_parameter(parser)
     return parser
 
@@ -109,10 +177,38 @@ def main(arguments: argparse.Namespace) -> None:
 
     Args:
         arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
-            have these attributes: ``results_dir`` and ``report_dir``.
+            have these attributes: ``results_dir``, ``report_dir``, ``tracker_name``,
+            ``transpose_tables``, ``summary_format``, ``force``, ``engine``, ``no_plots``,
+            ``jobs``, ``watch``, ``debounce``, ``bootstrap``, and ``confidence``.
     """
-    _print_experiment_reports(arguments)
-    _print_pilot_study_report(arguments)
+    if arguments.watch:
+        results_watcher.watch(
+            arguments.results_dir, lambda: _update_reports(arguments), arguments.debounce
+        )
+    else:
+        _print_experiment_reports(arguments)
+        _print_pilot_study_report(arguments)
+
+
+def _update_reports(command_arguments: argparse.Namespace) -> None:
+    """
+    Update the reports in watch mode.
+
+    Results files may be incomplete while an experiment writes them. This function reports errors
+    reading them as warnings, so the next change in the results directory can try again.
+
+    Args:
+        command_arguments (argparse.Namespace): The command line arguments specified by the user.
+    """
+    try:
+        _print_experiment_reports(command_arguments)
+        _print_pilot_study_report(command_arguments)
+    except (OSError, ValueError, RuntimeError) as error:
+        command_line.print_warning(error)
+    except AssertionError as error:
+        # The GOT-10k report engine asserts that each results file has a box for every frame, so a
+        # results file the experiment is still writing raises AssertionError.
+        command_line.print_warning(f"The results are incomplete; waiting for changes. {error}")
 
 
 def _today_label() -> str:
@@ -133,24 +229,39 @@ def _print_experiment_reports(command_arguments: argparse.Namespace) -> None:
     benchmarks = _find_benchmarks(command_arguments.results_dir)
     if not benchmarks:
         return
+    manifest = results_manifest.ReportManifest(command_arguments.report_dir)
+    if command_arguments.jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(command_arguments.jobs) as executor:
+            reports = list(
+                executor.map(
+                    _report_benchmark,
+                    itertools.repeat(command_arguments),
+                    benchmarks,
+                    itertools.repeat(manifest),
+                )
+            )
+    else:
+        reports = [
+            _report_benchmark(command_arguments, benchmark, manifest) for benchmark in benchmarks
+        ]
     overlap_scores = {}
     robustness_scores = {}
-    for benchmark in benchmarks:
-        _generate_experiment_report(
-            command_arguments.results_dir,
-            command_arguments.report_dir,
-            benchmark,
-            command_arguments.tracker_name,
-        )
-        try:
-            benchmark_overlaps, benchmark_robustess = _load_benchmark_overlap_success(
-                command_arguments.report_dir, benchmark, command_arguments.tracker_name
+    speeds = {}
+    for benchmark, fingerprints, benchmark_overlaps, benchmark_robustness, benchmark_speeds in (
+        reports
+    ):
+        if fingerprints is not None:
+            manifest.update(
+                benchmark,
+                command_arguments.tracker_name,
+                fingerprints,
+                command_arguments.watch,
+                command_arguments.engine,
             )
-            overlap_scores.update(benchmark_overlaps)
-            if benchmark_robustess is not None:
-                robustness_scores.update(benchmark_robustess)
-        except OSError as error:
-            command_line.print_warning(error)
+        overlap_scores.update(benchmark_overlaps)
+        robustness_scores.update(benchmark_robustness)
+        speeds.update(benchmark_speeds)
+    manifest.save()
     data = _make_experiment_data_table(
         overlap_scores, "Overlap Success", _today_label() + "_overlap_success"
     )
@@ -172,6 +283,141 @@ def _print_experiment_reports(command_arguments: argparse.Namespace) -> None:
                 command_arguments.report_dir, f"vot_robustness.{command_arguments.summary_format}"
             ),
         )
+    if speeds:
+        table.write_table(
+            _make_speed_data_table(speeds, command_arguments.transpose_tables),
+            os.path.join(
+                command_arguments.report_dir, f"speed_summary.{command_arguments.summary_format}"
+            ),
+        )
+
+
+def _report_benchmark(
+    command_arguments: argparse.Namespace,
+    benchmark: str,
+    manifest: results_manifest.ReportManifest,
+) -> tuple:
+    """
+    Generate the report for one benchmark and load its summary scores.
+
+    If the user requested a bootstrap, this function also writes the benchmark's bootstrap table.
+    This function is independent of the other benchmarks, so it can run in a worker process.
+
+    Args:
+        command_arguments (argparse.Namespace): The command line arguments specified by the user.
+        benchmark (str): Report this benchmark.
+        manifest (results_manifest.ReportManifest): Check this manifest for an up to date report.
+
+    Returns:
+        tuple: A tuple of (str, dict|``None``, dict, dict, dict). The elements are the
+        ``benchmark``, the result fingerprints to record in the ``manifest`` if this function
+        generated a new report, the overlap success data, the VOT robustness data, and the speed
+        data from :py:func:`_load_benchmark_speeds()`. The score dictionaries are empty if the
+        report's performance data is not available.
+    """
+    fingerprints = _generate_experiment_report(
+        command_arguments.results_dir,
+        command_arguments.report_dir,
+        benchmark,
+        command_arguments.tracker_name,
+        manifest,
+        command_arguments.force,
+        command_arguments.engine,
+        not command_arguments.no_plots,
+        command_arguments.watch,
+    )
+    try:
+        benchmark_overlaps, benchmark_robustness = _load_benchmark_overlap_success(
+            command_arguments.report_dir, benchmark, command_arguments.tracker_name
+        )
+    except OSError as error:
+        command_line.print_warning(error)
+        return benchmark, fingerprints, {}, {}, {}
+    if command_arguments.bootstrap > 0 and benchmark[:3] in ["OTB", "UAV"]:
+        _write_bootstrap_table(command_arguments, benchmark)
+    return (
+        benchmark,
+        fingerprints,
+        benchmark_overlaps,
+        benchmark_robustness or {},
+        _load_benchmark_speeds(command_arguments.results_dir, benchmark, benchmark_overlaps),
+    )
+
+
+def _load_benchmark_speeds(results_dir: str, benchmark: str, benchmark_overlaps: dict) -> dict:
+    """
+    Summarize the speed of every tracker in a benchmark report.
+
+    Args:
+        results_dir (str): The path to the experiment results.
+        benchmark (str): Summarize the trackers on this benchmark.
+        benchmark_overlaps (dict): The benchmark's overlap success data, from
+            :py:func:`_load_benchmark_overlap_success()`. Summarize the trackers in this data.
+
+    Returns:
+        dict: The speed data. The keys are row labels that combine the benchmark and the tracker.
+        The values are the speed summaries from :py:func:`speed_report.speed_summary()`.
+    """
+    entry = _benchmark_to_table_entry(benchmark)
+    return {
+        f"{entry} {tracker}": speed_report.speed_summary(
+            os.path.join(results_dir, benchmark), benchmark, tracker
+        )
+        for tracker in benchmark_overlaps.get(entry, {})
+    }
+
+
+def _write_bootstrap_table(command_arguments: argparse.Namespace, benchmark: str) -> None:
+    """
+    Write the bootstrap confidence intervals and win probabilities of an OTB or UAV123 benchmark.
+
+    The table has a row for each tracker. The columns are the tracker's overlap success, the bounds
+    of its confidence interval, and its probability of beating the tracker in each remaining
+    column.
+
+    Args:
+        command_arguments (argparse.Namespace): The command line arguments specified by the user.
+        benchmark (str): Write the table for this benchmark.
+    """
+    with open(
+        _performance_file_path(
+            command_arguments.report_dir, benchmark, command_arguments.tracker_name
+        ),
+        "r",
+    ) as file:
+        performance = json.load(file)
+    trackers = list(performance.keys())
+    sequences = list(performance[trackers[0]]["seq_wise"].keys())
+    scores = numpy.array(
+        [
+            [performance[tracker]["seq_wise"][sequence]["success_score"] for sequence in sequences]
+            for tracker in trackers
+        ]
+    )
+    means = bootstrap.resample_means(scores, command_arguments.bootstrap)
+    lower, upper = bootstrap.confidence_intervals(means, command_arguments.confidence)
+    data = table.DataTable(
+        trackers, ["Success", "CI Low", "CI High"] + [f"vs {tracker}" for tracker in trackers]
+    )
+    data[:, 0] = scores.mean(axis=1)
+    data[:, 1] = lower
+    data[:, 2] = upper
+    data[:, 3:] = bootstrap.win_probabilities(means)
+    data.caption = (
+        f"{_benchmark_to_table_entry(benchmark)} Overlap Success with "
+        rf"{command_arguments.confidence * 100:.0f}\% Confidence Intervals and Win Probabilities"
+    )
+    data.label = f"{_today_label()}_{benchmark.lower()}_bootstrap"
+    data.format_spec.include_mean = False
+    data.format_spec.include_median = False
+    data.format_spec.transpose = command_arguments.transpose_tables
+    table.write_table(
+        data,
+        os.path.join(
+            command_arguments.report_dir,
+            f"bootstrap_{benchmark}.{command_arguments.summary_format}",
+        ),
+    )
 
 
 def _make_experiment_data_table(raw_data: dict, caption: str, label: str) -> table.DataTable:
@@ -199,19 +445,33 @@ def _make_experiment_data_table(raw_data: dict, caption: str, label: str) -> tab
         label (str): The cross reference label for the table output.
 
     Returns:
-        table.DataTable: A data in a table ready for output.
+        table.DataTable: A data in a table ready for output. Cells missing from ``raw_data`` are
+        NaN.
     """
-    row_labels = list(raw_data.keys())
-    column_labels = list(raw_data[row_labels[0]].keys())
-    data = table.DataTable(row_labels, column_labels)
-    data.row_labels = row_labels
-    data.column_labels = column_labels
+    data = table.DataTable.from_nested_dict(raw_data)
     data.caption = caption
     data.label = label
-    for row_index, row_label in enumerate(data.row_labels):
-        for column_index, column_label in enumerate(data.column_labels):
-            if column_label in raw_data[row_label]:
-                data[row_index, column_index] = raw_data[row_label][column_label]
+    return data
+
+
+def _make_speed_data_table(speeds: dict, transpose: bool) -> table.DataTable:
+    """
+    Create a data table summarizing tracking speed.
+
+    Args:
+        speeds (dict): The speed data from :py:func:`_load_benchmark_speeds()`, for all benchmarks.
+        transpose (bool): Transpose the table when writing it.
+
+    Returns:
+        table.DataTable: The speed data in a table ready for output.
+    """
+    data = table.DataTable(list(speeds.keys()), list(speed_report.COLUMNS))
+    data.data = numpy.array(list(speeds.values()), dtype=float)
+    data.caption = "Tracking Speed"
+    data.label = _today_label() + "_speed"
+    data.format_spec.include_mean = False
+    data.format_spec.include_median = False
+    data.format_spec.transpose = transpose
     return data
 
 
@@ -241,11 +501,23 @@ def _find_benchmarks(results_dir: str) -> list:
 
 
 def _generate_experiment_report(
-    result_dir: str, report_dir: str, benchmark: str, tracker_name: str
-) -> None:
+    result_dir: str,
+    report_dir: str,
+    benchmark: str,
+    tracker_name: str,
+    manifest: results_manifest.ReportManifest,
+    force: bool = False,
+    engine: str = "native",
+    plot_curves: bool = True,
+    partial: bool = False,
+) -> dict:
     """
     Generate a report for a benchmark.
 
+    If the ``manifest`` shows that the benchmark's results have not changed since the last report,
+    and that report still exists with plots if ``plot_curves`` is set, this function leaves the
+    report as it is.
+
     Args:
         result_dir (str): The path to the benchmark results.
         report_dir (str): The path to write the reports.
@@ -253,18 +525,70 @@ def _generate_experiment_report(
             'VOT2019'.
         tracker_name (str): Use this tracker as the primary tracker in the report. List this
             tracker first in the report, and write report files in this tracker's subdirectory.
+        manifest (results_manifest.ReportManifest): Check this manifest for an up to date report.
+        force (bool): Generate the report even if the ``manifest`` shows it is up to date.
+        engine (str): Compute reports with this engine, either 'native' or 'got10k'. See
+            :py:mod:`experiments.ope_report` and :py:mod:`experiments.vot_report` for the native
+            engine.
+        plot_curves (bool): Render success and precision plots for OTB and UAV123 reports. If
+            this is ``False``, OTB and UAV123 reports always use the native engine.
+        partial (bool): Report benchmarks on the sequences that every tracker has complete results
+            for. Reports always use the native engine in this mode.
+
+    Returns:
+        dict | None: The fingerprints of the results used for a newly generated report. The caller
+        should record them in the ``manifest``. This is ``None`` if the function did not generate
+        a report.
     """
     command_line.print_information("Generating reports for", benchmark)
     try:
-        experiment = _make_experiment(result_dir, report_dir, benchmark)
+        trackers = _find_trackers(os.path.join(result_dir, benchmark), tracker_name)
     except RuntimeError as error:
-        command_line.print_warning(str(error))
-        return
+        command_line.print_warning(error)
+        return None
+    fingerprints = results_manifest.fingerprint_results(
+        os.path.join(result_dir, benchmark), trackers
+    )
+    if (
+        not force
+        and manifest.is_current(benchmark, tracker_name, fingerprints, partial, engine)
+        and os.path.isfile(_performance_file_path(report_dir, benchmark, tracker_name))
+        and (
+            not plot_curves
+            or benchmark[:3] == "VOT"
+            or os.path.isfile(
+                os.path.join(report_dir, benchmark, tracker_name, "success_plots.png")
+            )
+        )
+    ):
+        command_line.print_information("Results for", benchmark, "are unchanged.")
+        return None
     try:
-        trackers = _find_trackers(os.path.join(result_dir, benchmark), tracker_name)
-        experiment.report(trackers)
+        if benchmark[:3] in ["OTB", "UAV"] and (
+            engine == "native" or not plot_curves or partial
+        ):
+            ope_report.report(
+                _make_dataset(result_dir, benchmark),
+                os.path.join(result_dir, benchmark),
+                os.path.join(report_dir, benchmark),
+                trackers,
+                plot_curves,
+                partial,
+            )
+        elif benchmark[:3] == "VOT" and (engine == "native" or partial):
+            vot_report.report(
+                _make_dataset(result_dir, benchmark),
+                os.path.join(result_dir, benchmark),
+                os.path.join(report_dir, benchmark),
+                trackers,
+                partial,
+            )
+        else:
+            _make_experiment(result_dir, report_dir, benchmark).report(trackers)
     except RuntimeError as error:
         command_line.print_warning(error)
+        return None
+    return fingerprints
 
 
 def _make_experiment(result_dir: str, report_dir: str, benchmark: str):
@@ -280,22 +604,32 @@ def _make_experiment(result_dir: str, report_dir: str, benchmark: str):
     Returns:
         A GOT-10k experiment object for the requested ``benchmark``.
     """
+    # The GOT-10k experiments import matplotlib, so only import them when they are needed.
+    import got10k.experiments  # pylint: disable=import-outside-toplevel
+
+    if benchmark[3:] == synthetic_dataset.BENCHMARK_VERSION:
+        return synthetic_dataset.make_experiment(
+            _dataset_dir(result_dir, benchmark),
+            benchmark[:3].lower(),
+            result_dir,
+            report_dir,
+        )
     if benchmark[:3] == "OTB":
         return got10k.experiments.ExperimentOTB(
-            os.path.expanduser("~/Videos/otb"),
+            _dataset_dir(result_dir, benchmark),
             version=benchmark[3:],
             result_dir=result_dir,
             report_dir=report_dir,
         )
     if benchmark == "UAV123":
         return got10k.experiments.ExperimentUAV123(
-            os.path.expanduser("~/Videos/uav123"),
+            _dataset_dir(result_dir, benchmark),
             result_dir=result_dir,
             report_dir=report_dir,
         )
     if benchmark[:3] == "VOT":
         return got10k.experiments.ExperimentVOT(
-            os.path.expanduser("~/Videos/vot/2019"),
+            _dataset_dir(result_dir, benchmark),
             version=int(benchmark[3:]),
             experiments="supervised",
             result_dir=result_dir,
@@ -304,6 +638,69 @@ def _make_experiment(result_dir: str, report_dir: str, benchmark: str):
     raise RuntimeError(f"Unknown benchmark {benchmark}.")
 
 
+def _make_dataset(result_dir: str, benchmark: str):
+    """
+    Make the GOT-10k dataset for a benchmark.
+
+    The dataset locations and options match :py:func:`_make_experiment()`.
+
+    Args:
+        result_dir (str): The path to the experiment results.
+        benchmark (str): Create the dataset for this benchmark. Examples are 'OTBtb100' and
+            'VOT2019'.
+
+    Returns:
+        A GOT-10k dataset object for the requested ``benchmark``.
+
+    Raises:
+        RuntimeError: This is raised if ``benchmark`` is not a known benchmark.
+    """
+    if benchmark[3:] == synthetic_dataset.BENCHMARK_VERSION:
+        return synthetic_dataset.SyntheticDataset(
+            _dataset_dir(result_dir, benchmark), benchmark[:3].lower()
+        )
+    if benchmark[:3] == "OTB":
+        return got10k.datasets.OTB(
+            _dataset_dir(result_dir, benchmark), version=benchmark[3:], download=True
+        )
+    if benchmark == "UAV123":
+        return got10k.datasets.UAV123(_dataset_dir(result_dir, benchmark), version=benchmark)
+    if benchmark[:3] == "VOT":
+        return got10k.datasets.VOT(
+            _dataset_dir(result_dir, benchmark),
+            version=int(benchmark[3:]),
+            anno_type="default",
+            download=True,
+            return_meta=True,
+        )
+    raise RuntimeError(f"Unknown benchmark {benchmark}.")
+
+
+def _dataset_dir(result_dir: str, benchmark: str) -> str:
+    """
+    Find the dataset directory of a benchmark.
+
+    Args:
+        result_dir (str): The path to the experiment results.
+        benchmark (str): Find the dataset for this benchmark. Examples are 'OTBtb100' and
+            'VOT2019'.
+
+    Returns:
+        str: The dataset directory the experiment command recorded in the results directory. If
+        it did not record one, such as for results from older versions, this is the default
+        location of the benchmark's dataset.
+    """
+    if benchmark[3:] == synthetic_dataset.BENCHMARK_VERSION:
+        default = os.path.join(synthetic_dataset.DEFAULT_DATASET_DIR, benchmark[:3].lower())
+    elif benchmark[:3] == "OTB":
+        default = os.path.expanduser("~/Videos/otb")
+    elif benchmark == "UAV123":
+        default = os.path.expanduser("~/Videos/uav123")
+    else:
+        default = os.path.expanduser("~/Videos/vot/2019")
+    return results_manifest.read_dataset_dir(result_dir, benchmark, default)
+
+
 def _find_trackers(result_dir: str, tracker_name: str) -> list:
     """
     Get the trackers available for an experiment benchmark.
@@ -349,8 +746,7 @@ def _load_benchmark_overlap_success(report_dir: str, benchmark: str, tracker_nam
     """
     if benchmark[:3] not in ["OTB", "UAV", "VOT"]:
         raise RuntimeError(f"Unknown benchmark {benchmark}.")
-    file_path = os.path.join(report_dir, benchmark, tracker_name, "performance.json")
-    with open(file_path, "r") as file:
+    with open(_performance_file_path(report_dir, benchmark, tracker_name), "r") as file:
         data = json.load(file)
     if benchmark[:3] in ["OTB", "UAV"]:
         return (
@@ -377,6 +773,21 @@ def _load_benchmark_overlap_success(report_dir: str, benchmark: str, tracker_nam
     )
 
 
+def _performance_file_path(report_dir: str, benchmark: str, tracker_name: str) -> str:
+    """
+    Get the path to the performance data written by a benchmark report.
+
+    Args:
+        report_dir (str): The directory with the reports.
+        benchmark (str): The name of the benchmark.
+        tracker_name (str): The primary tracker of the report.
+
+    Returns:
+        str: The path to the report's ``performance.json`` file.
+    """
+    return os.path.join(report_dir, benchmark, tracker_name, "performance.json")
+
+
 def _benchmark_to_table_entry(benchmark: str) -> str:
     """
     Convert a GOT-10k benchmark label to a string suitable for printing in a report.
@@ -387,6 +798,8 @@ def _benchmark_to_table_entry(benchmark: str) -> str:
     Returns:
         str: The benchmark label converted for use in a report.
     """
+    if benchmark[3:] == synthetic_dataset.BENCHMARK_VERSION:
+        return f"Synthetic {benchmark[:3]}"
     if benchmark.startswith("UAV"):
         return benchmark
     if benchmark.startswith("OTB"):
@@ -453,19 +866,20 @@ def _make_pilot_study_data_table(pilot_results: dict) -> table.DataTable:
         pilot_results (dict): The raw data read from the pilot study database.
 
     Returns:
-        table.DataTable: The pilot study data in a table, ready for output.
+        table.DataTable: The pilot study data in a table, ready for output. The rows are the
+        sequences, and the columns are the trackers. If a tracker has no score for a sequence, the
+        cell is NaN.
     """
-    sequences = set()
-    for tracker_data in pilot_results.values():
-        sequences.update(set(tracker_data["scores"].keys()))
-    data = table.DataTable(sequences, list(pilot_results.keys()))
+    records = [
+        (sequence, tracker, score)
+        for tracker, tracker_data in pilot_results.items()
+        for sequence, score in tracker_data["scores"].items()
+    ]
+    data = table.DataTable.from_records(
+        records, sorted({record[0] for record in records}), list(pilot_results.keys())
+    )
     data.caption = "Pilot Study Overlap Success"
     data.label = _today_label() + "_pilot_study"
-    data.column_labels = list(pilot_results.keys())
-    data.row_labels = sorted(list(sequences))
-    for row_index, row_label in enumerate(data.row_labels):
-        for column_index, column_label in enumerate(data.column_labels):
-            data[row_index, column_index] = pilot_results[column_label]["scores"][row_label]
     return data
 
 
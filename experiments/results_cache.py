@@ -0,0 +1,292 @@
+"""
+Cache one-pass (OTB and UAV123) tracking results in a columnar format.
+
+GOT-10k writes one text file of boxes and one text file of frame times per tracker and sequence.
+Parsing thousands of small text files dominates report time, especially on network storage. This
+module imports each tracker's results for one benchmark into a few NumPy arrays:
+
+=============== ===================================================================================
+File            Content
+=============== ===================================================================================
+``boxes.npy``   The frames x 4 boxes of all sequences, concatenated in sequence order.
+``times.npy``   The time, in seconds, of each frame. Frames without a time are NaN.
+``offsets.npy`` The offset of each sequence's first frame, followed by the total number of frames.
+``index.json``  The sequence names, and the fingerprints of the text files the arrays came from.
+=============== ===================================================================================
+
+The cache for a tracker lives in ``<benchmark results>/.cache/<tracker>``. The arrays are
+uncompressed so readers can memory-map them. The cache refreshes itself whenever a text file
+changes; only the sequences whose text files changed are parsed again.
+
+Running this Module as a Script
+-------------------------------
+
+You can run this module as a stand-alone script to import all the results in a results directory.
+
+.. literalinclude:: generated/import_results_help.rst
+    :language: text
+
+Reference
+---------
+"""
+
+import argparse
+import glob
+import json
+import os
+import numpy
+import experiments.command_line as command_line
+import experiments.results_manifest as results_manifest
+
+CACHE_DIR_NAME = ".cache"
+
+
+class TrackerResults:
+    """
+    The cached results of one tracker on one benchmark.
+
+    Args:
+        sequence_names (list): The names of the sequences, in storage order.
+        boxes (numpy.ndarray): The frames x 4 boxes of all the sequences.
+        times (numpy.ndarray): The time of each frame, NaN if it is not known.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+
+    Attributes:
+        sequence_names (list): The names of the sequences, in storage order.
+        boxes (numpy.ndarray): The frames x 4 boxes of all the sequences.
+        times (numpy.ndarray): The time of each frame, NaN if it is not known.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+    """
+
+    def __init__(
+        self,
+        sequence_names: list,
+        boxes: numpy.ndarray,
+        times: numpy.ndarray,
+        offsets: numpy.ndarray,
+    ) -> None:
+        self.sequence_names = sequence_names
+        self.boxes = boxes
+        self.times = times
+        self.offsets = offsets
+        self.__indices = {name: index for index, name in enumerate(sequence_names)}
+
+    def __contains__(self, sequence_name: str) -> bool:
+        return sequence_name in self.__indices
+
+    def __getitem__(self, sequence_name: str) -> tuple:
+        """
+        Get the results of one sequence.
+
+        Args:
+            sequence_name (str): The name of the sequence.
+
+        Returns:
+            tuple: A tuple of (numpy.ndarray, numpy.ndarray); views of the sequence's boxes and
+            frame times.
+
+        Raises:
+            KeyError: This is raised if the tracker has no results for ``sequence_name``.
+        """
+        index = self.__indices[sequence_name]
+        frames = slice(self.offsets[index], self.offsets[index + 1])
+        return self.boxes[frames], self.times[frames]
+
+
+def load_tracker_results(benchmark_results_dir: str, tracker_name: str) -> TrackerResults:
+    """
+    Load the cached results of a tracker, refreshing the cache if the text files changed.
+
+    Args:
+        benchmark_results_dir (str): The path to the benchmark results, such as
+            ``results/OTBtb100``.
+        tracker_name (str): Load this tracker's results.
+
+    Returns:
+        TrackerResults: The tracker's results. The arrays are memory-mapped, read-only.
+    """
+    tracker_dir = os.path.join(benchmark_results_dir, tracker_name)
+    cache_dir = _cache_dir(benchmark_results_dir, tracker_name)
+    fingerprints = results_manifest.fingerprint_directory(tracker_dir)
+    index = _read_index(cache_dir)
+    if index is None or index["fingerprints"] != fingerprints:
+        _import_tracker_results(tracker_dir, cache_dir, fingerprints, index)
+        index = _read_index(cache_dir)
+    return TrackerResults(
+        index["sequences"],
+        numpy.load(os.path.join(cache_dir, "boxes.npy"), mmap_mode="r"),
+        numpy.load(os.path.join(cache_dir, "times.npy"), mmap_mode="r"),
+        numpy.load(os.path.join(cache_dir, "offsets.npy")),
+    )
+
+
+def _cache_dir(benchmark_results_dir: str, tracker_name: str) -> str:
+    return os.path.join(benchmark_results_dir, CACHE_DIR_NAME, tracker_name)
+
+
+def _read_index(cache_dir: str) -> dict:
+    """
+    Read a cache index.
+
+    Args:
+        cache_dir (str): The tracker's cache directory.
+
+    Returns:
+        dict | None: The index, or ``None`` if the cache is missing or incomplete.
+    """
+    try:
+        with open(os.path.join(cache_dir, "index.json"), "r") as index_file:
+            return json.load(index_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _import_tracker_results(
+    tracker_dir: str, cache_dir: str, fingerprints: dict, old_index: dict
+) -> None:
+    """
+    Import the text results of a tracker into its cache.
+
+    Args:
+        tracker_dir (str): The tracker's results directory.
+        cache_dir (str): Write the cache to this directory.
+        fingerprints (dict): The current fingerprints of the files in ``tracker_dir``.
+        old_index (dict | None): The index of the existing cache. Sequences whose text files have
+            the same fingerprints are copied from the existing cache instead of parsed.
+    """
+    command_line.print_information("Importing results from", tracker_dir)
+    sequence_names = sorted(
+        os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(tracker_dir, "*.txt"))
+    )
+    old_results = None
+    if old_index is not None:
+        old_results = TrackerResults(
+            old_index["sequences"],
+            numpy.load(os.path.join(cache_dir, "boxes.npy"), mmap_mode="r"),
+            numpy.load(os.path.join(cache_dir, "times.npy"), mmap_mode="r"),
+            numpy.load(os.path.join(cache_dir, "offsets.npy")),
+        )
+    boxes = []
+    times = []
+    for sequence_name in sequence_names:
+        sources = _sequence_sources(sequence_name)
+        if old_results is not None and sequence_name in old_results and all(
+            fingerprints.get(s) == old_index["fingerprints"].get(s) for s in sources
+        ):
+            sequence_boxes, sequence_times = old_results[sequence_name]
+        else:
+            sequence_boxes, sequence_times = _parse_sequence(tracker_dir, sequence_name)
+        boxes.append(numpy.array(sequence_boxes))
+        times.append(numpy.array(sequence_times))
+    del old_results
+    os.makedirs(cache_dir, exist_ok=True)
+    # Remove the index first, so an interrupted import leaves an incomplete cache that readers
+    # rebuild, rather than arrays that do not match the index.
+    if os.path.exists(os.path.join(cache_dir, "index.json")):
+        os.remove(os.path.join(cache_dir, "index.json"))
+    offsets = numpy.cumsum([0] + [len(b) for b in boxes])
+    _save_array(cache_dir, "boxes.npy", numpy.concatenate(boxes) if boxes else numpy.empty((0, 4)))
+    _save_array(cache_dir, "times.npy", numpy.concatenate(times) if times else numpy.empty(0))
+    _save_array(cache_dir, "offsets.npy", offsets)
+    with open(os.path.join(cache_dir, "index.json"), "w") as index_file:
+        json.dump({"sequences": sequence_names, "fingerprints": fingerprints}, index_file)
+
+
+def _sequence_sources(sequence_name: str) -> list:
+    """
+    Get the text files, relative to the tracker directory, that hold a sequence's results.
+
+    Args:
+        sequence_name (str): The name of the sequence.
+
+    Returns:
+        list: The relative paths of the box file and the times file.
+    """
+    return [f"{sequence_name}.txt", os.path.join("times", f"{sequence_name}_time.txt")]
+
+
+def _parse_sequence(tracker_dir: str, sequence_name: str) -> tuple:
+    """
+    Parse the text results of one sequence.
+
+    Args:
+        tracker_dir (str): The tracker's results directory.
+        sequence_name (str): The name of the sequence.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the frames x 4 boxes, and the time of
+        each frame. The times are NaN if the times file does not exist.
+    """
+    box_file, time_file = [
+        os.path.join(tracker_dir, source) for source in _sequence_sources(sequence_name)
+    ]
+    boxes = numpy.loadtxt(box_file, delimiter=",", ndmin=2).reshape(-1, 4)
+    times = numpy.full(len(boxes), numpy.nan)
+    if os.path.isfile(time_file):
+        file_times = numpy.loadtxt(time_file, ndmin=1)
+        times[: min(len(times), len(file_times))] = file_times[: len(times)]
+    return boxes, times
+
+
+def _save_array(cache_dir: str, file_name: str, array: numpy.ndarray) -> None:
+    """
+    Save an array in the cache without disturbing readers of the previous version.
+
+    Args:
+        cache_dir (str): The tracker's cache directory.
+        file_name (str): The name of the array file.
+        array (numpy.ndarray): The array to save.
+    """
+    temporary_path = os.path.join(cache_dir, f"{file_name}.{os.getpid()}.tmp")
+    with open(temporary_path, "wb") as array_file:
+        numpy.save(array_file, array)
+    os.replace(temporary_path, os.path.join(cache_dir, file_name))
+
+
+def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Create the command line parser for this module.
+
+    This function supports filling in a subparser or a root parser. In both cases, this function
+    overwrites certain parser attributes, such as the description.
+
+    Args:
+        parser (argparse.ArgumentParser): Fill out this argument parser. This can be a root parser
+            or a subparser created with `add_subparsers()
+            <https://docs.python.org/3/library/argparse.html#argparse.ArgumentParser.add_subparsers>`_.
+
+    Returns:
+        The parser, filled with parameters and attributes, ready for command line parsing.
+    """
+    parser.description = (
+        "Import OTB and UAV123 tracking results into the columnar results cache. Reports import "
+        "results on demand; use this command to prepare the cache ahead of time."
+    )
+    parser.formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    parser.set_defaults(func=main)
+    command_line.add_results_dir_parameter(parser)
+    return parser
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """
+    The main entry point for this module.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
+            have the ``results_dir`` attribute.
+    """
+    for benchmark_dir in sorted(glob.glob(os.path.join(arguments.results_dir, "*"))):
+        if os.path.basename(benchmark_dir)[0:3] not in ["OTB", "UAV"]:
+            continue
+        for tracker_dir in sorted(glob.glob(os.path.join(benchmark_dir, "*"))):
+            load_tracker_results(benchmark_dir, os.path.basename(tracker_dir))
+
+
+if __name__ == "__main__":
+    PARSER = fill_command_line_parser(argparse.ArgumentParser())
+    ARGUMENTS = PARSER.parse_args()
+    ARGUMENTS.func(ARGUMENTS)
@@ -0,0 +1,211 @@
+"""
+Track which experiment results each benchmark report was built from.
+
+The report command uses a :py:class:`ReportManifest` to skip benchmarks whose tracking results have
+not changed since the last report. The manifest is a JSON file in the report directory. For each
+benchmark it records the primary tracker, the report engine, and a fingerprint of every result file
+of every tracker in the report:
+
+.. code-block:: json
+
+    {
+        "OTBtb100": {
+            "tracker_name": "MDNet",
+            "engine": "native",
+            "results": {
+                "MDNet": {
+                    "Basketball.txt": [12345, 1600000000000000000],
+                    "times/Basketball_time.txt": [2345, 1600000000000000000]
+                }
+            }
+        }
+    }
+
+A fingerprint is the file size and modification time, in nanoseconds. The report is current if the
+fingerprints of the report's trackers are identical to the recorded fingerprints, and the report
+was built with the same engine. A report built
+from incomplete results, such as a live report in watch mode, also records ``"partial": true``; it
+is only current for another partial report.
+
+The experiment command also records the dataset directory of each benchmark in
+:py:data:`DATASETS_FILE_NAME`, in the results directory, so reports read the same dataset the
+experiment ran on:
+
+.. code-block:: json
+
+    {
+        "OTBsynthetic": "/home/user/Videos/synthetic/otb"
+    }
+
+Reference
+---------
+"""
+
+import json
+import os
+
+MANIFEST_FILE_NAME = "report_manifest.json"
+DATASETS_FILE_NAME = "datasets.json"
+
+
+def fingerprint_results(benchmark_results_dir: str, trackers: list) -> dict:
+    """
+    Fingerprint the result files of trackers for one benchmark.
+
+    Args:
+        benchmark_results_dir (str): The path to the benchmark results, such as
+            ``results/OTBtb100``.
+        trackers (list): Fingerprint the results of these trackers.
+
+    Returns:
+        dict: The fingerprints. The keys are tracker names. Each value is a dictionary that maps a
+        result file path, relative to the tracker directory, to a list of [size, mtime].
+    """
+    return {
+        tracker: fingerprint_directory(os.path.join(benchmark_results_dir, tracker))
+        for tracker in trackers
+    }
+
+
+def fingerprint_directory(directory: str) -> dict:
+    """
+    Fingerprint all the files in a directory tree.
+
+    Args:
+        directory (str): Fingerprint the files in this directory, recursively.
+
+    Returns:
+        dict: A dictionary that maps relative file paths to a list of [size, mtime].
+    """
+    fingerprints = {}
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            status = os.stat(os.path.join(root, file_name))
+            relative_path = os.path.relpath(os.path.join(root, file_name), directory)
+            fingerprints[relative_path] = [status.st_size, status.st_mtime_ns]
+    return fingerprints
+
+
+class ReportManifest:
+    """
+    The record of which results each benchmark report was built from.
+
+    Args:
+        report_dir (str): Read and write the manifest in this directory.
+
+    Attributes:
+        file_path (str): The path to the manifest file.
+    """
+
+    def __init__(self, report_dir: str) -> None:
+        self.file_path = os.path.join(report_dir, MANIFEST_FILE_NAME)
+        try:
+            with open(self.file_path, "r") as manifest_file:
+                self.__entries = json.load(manifest_file)
+        except (OSError, ValueError):
+            self.__entries = {}
+
+    def is_current(
+        self,
+        benchmark: str,
+        tracker_name: str,
+        fingerprints: dict,
+        partial: bool = False,
+        engine: str = "native",
+    ) -> bool:
+        """
+        Determine if a benchmark report is up to date.
+
+        Args:
+            benchmark (str): The name of the benchmark, such as 'OTBtb100'.
+            tracker_name (str): The primary tracker of the report.
+            fingerprints (dict): The current fingerprints of the report's results, from
+                :py:func:`fingerprint_results()`.
+            partial (bool): Accept a report of only the sequences with complete results.
+            engine (str): The report engine, either 'native' or 'got10k'.
+
+        Returns:
+            bool: ``True`` if the report was built for ``tracker_name`` from exactly these
+            ``fingerprints`` with the ``engine``, ``False`` otherwise.
+        """
+        entry = self.__entries.get(benchmark)
+        return (
+            entry is not None
+            and entry["tracker_name"] == tracker_name
+            and entry.get("engine") == engine
+            and entry["results"] == fingerprints
+            and (partial or not entry.get("partial", False))
+        )
+
+    def update(
+        self,
+        benchmark: str,
+        tracker_name: str,
+        fingerprints: dict,
+        partial: bool = False,
+        engine: str = "native",
+    ) -> None:
+        """
+        Record the results a benchmark report was built from.
+
+        Args:
+            benchmark (str): The name of the benchmark, such as 'OTBtb100'.
+            tracker_name (str): The primary tracker of the report.
+            fingerprints (dict): The fingerprints of the report's results, from
+                :py:func:`fingerprint_results()`.
+            partial (bool): The report only includes the sequences with complete results.
+            engine (str): The report engine, either 'native' or 'got10k'.
+        """
+        self.__entries[benchmark] = {
+            "tracker_name": tracker_name,
+            "engine": engine,
+            "results": fingerprints,
+        }
+        if partial:
+            self.__entries[benchmark]["partial"] = True
+
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with open(self.file_path, "w") as manifest_file:
+            json.dump(self.__entries, manifest_file, indent=2)
+
+
+def record_dataset_dir(results_dir: str, benchmark: str, dataset_dir: str) -> None:
+    """
+    Record the dataset directory of a benchmark in the results directory.
+
+    Args:
+        results_dir (str): The path to the tracking results of every benchmark.
+        benchmark (str): The name of the benchmark, such as 'OTBtb100'.
+        dataset_dir (str): The path to the benchmark's dataset.
+    """
+    dataset_dirs = _read_dataset_dirs(results_dir)
+    dataset_dirs[benchmark] = os.path.abspath(dataset_dir)
+    os.makedirs(results_dir, exist_ok=True)
+    with open(os.path.join(results_dir, DATASETS_FILE_NAME), "w") as datasets_file:
+        json.dump(dataset_dirs, datasets_file, indent=2)
+
+
+def read_dataset_dir(results_dir: str, benchmark: str, default: str) -> str:
+    """
+    Read the dataset directory of a benchmark from the results directory.
+
+    Args:
+        results_dir (str): The path to the tracking results of every benchmark.
+        benchmark (str): The name of the benchmark, such as 'OTBtb100'.
+        default (str): Return this if the results directory does not record the benchmark's
+            dataset directory.
+
+    Returns:
+        str: The path to the benchmark's dataset.
+    """
+    return _read_dataset_dirs(results_dir).get(benchmark, default)
+
+
+def _read_dataset_dirs(results_dir: str) -> dict:
+    try:
+        with open(os.path.join(results_dir, DATASETS_FILE_NAME), "r") as datasets_file:
+            return json.load(datasets_file)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,200 @@
+"""
+Watch a results directory for new tracking results.
+
+The report command uses this module for its watch mode. :py:func:`watch()` runs a callback once,
+then again each time the results directory changes. A burst of changes, such as an experiment
+writing a box file and a times file, or several sequences finishing together, triggers one callback
+after the directory has been quiet for the debounce interval.
+
+On Linux, with the optional ``inotify_simple`` package installed, the watcher uses inotify.
+Otherwise it polls the directory tree for changed file sizes and modification times.
+
+Hidden files and directories, such as the :py:mod:`experiments.results_cache` directories, are
+ignored; the callback's own cache writes do not trigger another callback.
+
+Reference
+---------
+"""
+
+import os
+import time
+from typing import Optional
+import experiments.command_line as command_line
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+
+class PollingWatcher:
+    """
+    Detect changes in a directory tree by polling file fingerprints.
+
+    Args:
+        directory (str): Watch this directory, recursively.
+        interval (float): Poll the directory this often, in seconds.
+    """
+
+    def __init__(self, directory: str, interval: float = 2.0) -> None:
+        self.__directory = directory
+        self.__interval = interval
+        self.__snapshot = self.__take_snapshot()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Wait for the directory tree to change.
+
+        Args:
+            timeout (float | None): Wait at most this long, in seconds. If this is ``None``, wait
+                until the directory changes.
+
+        Returns:
+            bool: ``True`` if the directory changed, ``False`` if the ``timeout`` expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.__interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return False
+            time.sleep(delay)
+            snapshot = self.__take_snapshot()
+            if snapshot != self.__snapshot:
+                self.__snapshot = snapshot
+                return True
+
+    def __take_snapshot(self) -> dict:
+        snapshot = {}
+        for root in _visible_directories(self.__directory):
+            try:
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(".") or not entry.is_file():
+                            continue
+                        status = entry.stat()
+                        snapshot[entry.path] = (status.st_size, status.st_mtime_ns)
+            except OSError:
+                continue
+        return snapshot
+
+
+class InotifyWatcher:
+    """
+    Detect changes in a directory tree with inotify.
+
+    This requires the ``inotify_simple`` package.
+
+    Args:
+        directory (str): Watch this directory, recursively.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.__inotify = inotify_simple.INotify()
+        flags = inotify_simple.flags
+        self.__mask = (
+            flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.CREATE | flags.DELETE
+        )
+        self.__directories = {}
+        for root in _visible_directories(directory):
+            self.__add_watch(root)
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Wait for the directory tree to change.
+
+        Args:
+            timeout (float | None): Wait at most this long, in seconds. If this is ``None``, wait
+                until the directory changes.
+
+        Returns:
+            bool: ``True`` if the directory changed, ``False`` if the ``timeout`` expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            events = self.__inotify.read(
+                timeout=None if remaining is None else int(remaining * 1000)
+            )
+            if not events:
+                return False
+            changed = False
+            for event in events:
+                if event.name.startswith(".") or event.wd not in self.__directories:
+                    continue
+                changed = True
+                path = os.path.join(self.__directories[event.wd], event.name)
+                if event.mask & inotify_simple.flags.ISDIR and event.mask & (
+                    inotify_simple.flags.CREATE | inotify_simple.flags.MOVED_TO
+                ):
+                    for root in _visible_directories(path):
+                        self.__add_watch(root)
+            if changed:
+                return True
+
+    def __add_watch(self, directory: str) -> None:
+        try:
+            self.__directories[self.__inotify.add_watch(directory, self.__mask)] = directory
+        except OSError as error:
+            command_line.print_warning(f"Cannot watch {directory}: {error}")
+
+
+def make_watcher(directory: str):
+    """
+    Make the best available watcher for a directory tree.
+
+    Args:
+        directory (str): Watch this directory, recursively.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: An :py:class:`InotifyWatcher` if ``inotify_simple`` is
+        installed, otherwise a :py:class:`PollingWatcher`.
+    """
+    if inotify_simple is not None:
+        try:
+            return InotifyWatcher(directory)
+        except OSError as error:
+            command_line.print_warning(f"inotify is not available ({error}); polling instead.")
+    return PollingWatcher(directory)
+
+
+def watch(directory: str, callback, debounce: float = 5.0) -> None:
+    """
+    Run a callback now, and again whenever a directory tree changes, until interrupted.
+
+    Args:
+        directory (str): Watch this directory, recursively.
+        callback: Call this with no arguments.
+        debounce (float): After a change, wait until the directory has been quiet for this many
+            seconds before running the ``callback``.
+    """
+    os.makedirs(directory, exist_ok=True)
+    watcher = make_watcher(directory)
+    try:
+        callback()
+        while True:
+            command_line.print_information("Watching", directory, "for new results.")
+            watcher.wait(None)
+            while watcher.wait(debounce):
+                pass
+            callback()
+    except KeyboardInterrupt:
+        print()
+
+
+def _visible_directories(directory: str) -> list:
+    """
+    List a directory and all its subdirectories, except hidden ones.
+
+    Args:
+        directory (str): The root of the directory tree.
+
+    Returns:
+        list: The paths of the directories.
+    """
+    directories = []
+    for root, children, _ in os.walk(directory):
+        children[:] = [child for child in children if not child.startswith(".")]
+        directories.append(root)
+    return directories
@@ -0,0 +1,152 @@
+"""
+Summarize tracking speed from GOT-10k times files.
+
+GOT-10k experiments record the duration of every frame. The first frame of a one-pass (OTB and
+UAV123) sequence, and every initialization frame of a supervised VOT repetition, is the tracker's
+initialization time; the other frames are update times. This module reduces them to four numbers
+per tracker and benchmark:
+
+============= =====================================================================================
+Column        Meaning
+============= =====================================================================================
+``FPS``       The throughput of the update frames: the number of update frames per second of update
+              time.
+``p50 (ms)``  The median update latency, in milliseconds.
+``p95 (ms)``  The 95th percentile update latency, in milliseconds.
+``Init (ms)`` The mean initialization time, in milliseconds.
+``RT FPS``    The effective frame rate of a real-time simulation: tracked update frames per second
+              of video. This is empty for trackers that did not run in real time. See
+              :py:mod:`experiments.experiment`.
+============= =====================================================================================
+
+Frames without a positive time are ignored, as in the GOT-10k reports. A sequence whose output came
+from the :py:mod:`experiments.tracking_cache` has the times of the run that stored the output; the
+event log marks such sequences as ``cached``.
+
+Reference
+---------
+"""
+
+import glob
+import json
+import os
+import numpy
+import experiments.results_cache as results_cache
+
+COLUMNS = ["FPS", "p50 (ms)", "p95 (ms)", "Init (ms)", "RT FPS"]
+
+# A real-time simulation writes this file to the tracker's results directory.
+REALTIME_FILE_NAME = "realtime.json"
+
+
+def speed_summary(benchmark_results_dir: str, benchmark: str, tracker_name: str) -> list:
+    """
+    Summarize the speed of a tracker on a benchmark.
+
+    Args:
+        benchmark_results_dir (str): The path to the benchmark results, such as
+            ``results/OTBtb100``.
+        benchmark (str): The name of the benchmark, such as 'OTBtb100' or 'VOT2019'.
+        tracker_name (str): Summarize this tracker.
+
+    Returns:
+        list: The values of the :py:data:`COLUMNS`. A value is NaN if the tracker has no times for
+        it.
+    """
+    if benchmark[:3] == "VOT":
+        initialization_times, update_times = _vot_times(benchmark_results_dir, tracker_name)
+    else:
+        initialization_times, update_times = _ope_times(benchmark_results_dir, tracker_name)
+    initialization_times = initialization_times[initialization_times > 0]
+    update_times = update_times[update_times > 0]
+    if len(update_times) > 0:
+        fps = len(update_times) / numpy.sum(update_times)
+        p50, p95 = numpy.percentile(update_times, [50, 95]) * 1000.0
+    else:
+        fps = p50 = p95 = numpy.nan
+    initialization = (
+        numpy.mean(initialization_times) * 1000.0 if len(initialization_times) > 0 else numpy.nan
+    )
+    return [
+        float(fps),
+        float(p50),
+        float(p95),
+        float(initialization),
+        _realtime_fps(benchmark_results_dir, tracker_name),
+    ]
+
+
+def _realtime_fps(benchmark_results_dir: str, tracker_name: str) -> float:
+    """
+    Get the effective frame rate of a tracker's real-time simulation.
+
+    Args:
+        benchmark_results_dir (str): The path to the benchmark results.
+        tracker_name (str): Get this tracker's frame rate.
+
+    Returns:
+        float: The tracked update frames per second of video, over all the sequences. This is NaN
+        if the tracker did not run in real time.
+    """
+    file_path = os.path.join(benchmark_results_dir, tracker_name, REALTIME_FILE_NAME)
+    try:
+        with open(file_path, "r") as summary_file:
+            summary = json.load(summary_file)
+    except (OSError, ValueError):
+        return numpy.nan
+    sequences = summary["sequences"].values()
+    seconds = sum(sequence["frames"] - 1 for sequence in sequences) / summary["camera_fps"]
+    if seconds <= 0:
+        return numpy.nan
+    return float(sum(sequence["tracked"] - 1 for sequence in sequences) / seconds)
+
+
+def _ope_times(benchmark_results_dir: str, tracker_name: str) -> tuple:
+    """
+    Get the initialization and update times of a tracker on an OTB or UAV123 benchmark.
+
+    Args:
+        benchmark_results_dir (str): The path to the benchmark results.
+        tracker_name (str): Get this tracker's times.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the initialization times and the update
+        times, in seconds.
+    """
+    results = results_cache.load_tracker_results(benchmark_results_dir, tracker_name)
+    initialization = numpy.zeros(len(results.times), bool)
+    initialization[results.offsets[:-1][numpy.diff(results.offsets) > 0]] = True
+    return results.times[initialization], results.times[~initialization]
+
+
+def _vot_times(benchmark_results_dir: str, tracker_name: str) -> tuple:
+    """
+    Get the initialization and update times of a tracker on a supervised VOT benchmark.
+
+    Args:
+        benchmark_results_dir (str): The path to the benchmark results.
+        tracker_name (str): Get this tracker's times.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the initialization times and the update
+        times, in seconds.
+    """
+    initialization_times = [numpy.empty(0)]
+    update_times = [numpy.empty(0)]
+    sequence_dirs = glob.glob(os.path.join(benchmark_results_dir, tracker_name, "baseline", "*"))
+    for sequence_dir in sorted(sequence_dirs):
+        sequence_name = os.path.basename(sequence_dir)
+        time_file = os.path.join(sequence_dir, f"{sequence_name}_time.txt")
+        if not os.path.isfile(time_file):
+            continue
+        times = numpy.loadtxt(time_file, delimiter=",", ndmin=2)
+        record_files = sorted(glob.glob(os.path.join(sequence_dir, f"{sequence_name}_[0-9]*.txt")))
+        for repetition, record_file in enumerate(record_files[: times.shape[1]]):
+            with open(record_file, "r") as record:
+                codes = numpy.array(record.read().strip().split("\n"))
+            repetition_times = times[: len(codes), repetition]
+            initialization = codes[: len(repetition_times)] == "1"
+            tracked = numpy.char.find(codes[: len(repetition_times)], ",") >= 0
+            initialization_times.append(repetition_times[initialization])
+            update_times.append(repetition_times[tracked])
+    return numpy.concatenate(initialization_times), numpy.concatenate(update_times)
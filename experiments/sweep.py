@@ -0,0 +1,454 @@
+"""
+Search MDNet options with successive halving.
+
+This module runs a hyperparameter sweep over MDNet options. It runs each configuration through the
+pilot study machinery, and prunes configurations that trail the others after the first few
+sequences, so more of the search space fits in the same compute budget.
+
+Search Space
+------------
+
+The search space is a JSON file that maps ``tracking/options.yaml`` keys to lists of candidate
+values. For example::
+
+    {
+        "lr_update": [0.0001, 0.0002, 0.0003],
+        "n_pos_update": [25, 50, 100],
+        "long_interval": [5, 10]
+    }
+
+The sweep tries every combination of values, or a random sample of them with ``--samples``.
+Options not in the search space keep their values from ``tracking/options.yaml``.
+
+Successive Halving
+------------------
+
+The sweep runs in rungs. The first rung tracks the first ``--min-sequences`` sequences with every
+configuration. Each following rung keeps the best ``1 / --eta`` of the configurations, ranked by
+mean IoU, and tracks ``--eta`` times as many sequences. The last rung tracks every sequence. A
+configuration never tracks a sequence twice; promoted configurations only track the new
+sequences of each rung. ``--jobs`` tracks that many configuration and sequence pairs at once, each
+in its own process. Running a sweep again reuses the tracker output in the
+:py:mod:`experiments.tracking_cache`, unless you use ``--no-cache``.
+
+After each rung, the sweep saves every configuration's scores in the pilot study results database
+as a tracker named ``<name>-<index>``. The tags record the sweep name, the last rung the
+configuration reached, and its options. Pruned configurations have no scores for the sequences
+they did not track; the pilot study report shows those cells as NaN.
+
+Running this Module as a Script
+-------------------------------
+
+You can run this module as a stand-alone script.
+
+.. literalinclude:: generated/sweep_help.rst
+    :language: text
+
+Reference
+---------
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import functools
+import itertools
+import json
+import math
+import os
+import numpy
+import got10k.datasets
+import experiments.command_line as command_line
+import experiments.image_decoder as image_decoder
+import experiments.pilot_study as pilot_study
+import experiments.tracking_cache as tracking_cache
+
+
+def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Create the command line parser for this module.
+
+    This function supports filling in a subparser or a root parser. In both cases, this function
+    overwrites certain parser attributes, such as the description.
+
+    Args:
+        parser (argparse.ArgumentParser): Fill out this argument parser. This can be a root parser
+            or a subparser created with `add_subparsers()
+            <https://docs.python.org/3/library/argparse.html#argparse.ArgumentParser.add_subparsers>`_.
+
+    Returns:
+        The parser, filled with parameters and attributes, ready for command line parsing.
+    """
+    parser.description = (
+        "Search MDNet options with successive halving on OTB-100 pilot study sequences. The "
+        "sweep saves the results in the pilot study database; use the experiments.report module "
+        "to analyze them."
+    )
+    parser.formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    parser.set_defaults(func=main)
+    command_line.add_dataset_dir_parameter(parser, "~/Videos/otb")
+    command_line.add_results_dir_parameter(parser)
+    image_decoder.add_decoder_parameters(parser)
+    tracking_cache.add_cache_parameter(parser)
+    parser.add_argument(
+        "--name",
+        help="Name the sweep. The configurations are saved as '<name>-<index>' trackers.",
+        default="sweep",
+    )
+    parser.add_argument(
+        "--samples",
+        help="Try this many configurations, sampled at random from the search space. If this is "
+        "0, try every configuration.",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "--seed",
+        help="Seed the configuration sampler with this value.",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "--eta",
+        help="Keep 1/eta of the configurations after each rung, and track eta times as many "
+        "sequences in the next rung.",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--min-sequences",
+        help="Track this many sequences in the first rung.",
+        type=int,
+        default=2,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="Track up to this many configuration and sequence pairs concurrently, each in its "
+        "own process.",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "search_space",
+        help="The JSON file with the search space.",
+        action=command_line.PathSanitizer,
+    )
+    parser.add_argument(
+        "sequences",
+        help="Track these OTB-100 sequences, in this order. Put the most informative sequences "
+        "first; early rungs only track the first few.",
+        nargs="+",
+        metavar="sequence",
+    )
+    return parser
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """
+    The main entry point for this module.
+
+    Typically, you don't need to invoke this function; instead use ``arguments.func()`` after you
+    parse the command line arguments. See :py:func:`fill_command_line_parser()` for examples. If
+    you do need to call this function, do so *after* parsing the command line.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
+            have these attributes: ``dataset_dir``, ``results_dir``, ``decoder``,
+            ``frame_cache_dir``, ``no_cache``, ``name``, ``samples``, ``seed``, ``eta``,
+            ``min_sequences``, ``jobs``, ``search_space``, and ``sequences``.
+    """
+    configurations = make_configurations(
+        load_search_space(arguments.search_space), arguments.samples, arguments.seed
+    )
+    names = _configuration_names(arguments.name, len(configurations))
+    command_line.print_information(
+        f"Sweeping {len(configurations)} configurations over {len(arguments.sequences)} sequences."
+    )
+    worker_arguments = (
+        arguments.dataset_dir,
+        arguments.decoder,
+        arguments.frame_cache_dir,
+        not arguments.no_cache,
+    )
+    with _task_runner(arguments.jobs, worker_arguments) as run_tasks:
+        scores = successive_halving(
+            configurations,
+            arguments.sequences,
+            run_tasks,
+            arguments.eta,
+            arguments.min_sequences,
+            functools.partial(
+                _save_rung, arguments.results_dir, arguments.name, names, configurations
+            ),
+        )
+    _print_leaderboard(names, configurations, scores)
+
+
+def load_search_space(file_path: str) -> dict:
+    """
+    Load a search space.
+
+    Args:
+        file_path (str): The path to the JSON search space file.
+
+    Returns:
+        dict: The search space. The keys are option names, and the values are lists of candidate
+        values.
+
+    Raises:
+        ValueError: This is raised if the file does not contain a JSON object of non-empty lists.
+    """
+    with open(file_path, "r") as space_file:
+        space = json.load(space_file)
+    if not isinstance(space, dict) or not space:
+        raise ValueError(f"{file_path} must contain a JSON object of option names.")
+    for key, values in space.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"The candidates for '{key}' in {file_path} must be a non-empty list.")
+    return space
+
+
+def make_configurations(space: dict, samples: int = 0, seed: int = 0) -> list:
+    """
+    Make the configurations to try from a search space.
+
+    Args:
+        space (dict): The search space from :py:func:`load_search_space()`.
+        samples (int): Sample this many configurations at random. If this is 0, or at least the
+            size of the search space, use every configuration.
+        seed (int): Seed the sampler with this value.
+
+    Returns:
+        list: The configurations. Each is a dictionary of option values.
+    """
+    keys = sorted(space)
+    configurations = [
+        dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))
+    ]
+    if 0 < samples < len(configurations):
+        chosen = numpy.random.default_rng(seed).choice(len(configurations), samples, replace=False)
+        configurations = [configurations[index] for index in sorted(chosen)]
+    return configurations
+
+
+def rung_sizes(sequences: int, min_sequences: int, eta: int) -> list:
+    """
+    Compute the number of sequences each rung tracks.
+
+    Args:
+        sequences (int): The total number of sequences.
+        min_sequences (int): The first rung tracks this many sequences.
+        eta (int): Each rung tracks this many times as many sequences as the last.
+
+    Returns:
+        list: The number of sequences of each rung. The last rung tracks every sequence.
+    """
+    sizes = []
+    size = max(min_sequences, 1)
+    while size < sequences:
+        sizes.append(size)
+        size *= max(eta, 2)
+    return sizes + [sequences]
+
+
+def successive_halving(
+    configurations: list,
+    sequences: list,
+    run_tasks,
+    eta: int = 3,
+    min_sequences: int = 2,
+    rung_finished=None,
+) -> list:
+    """
+    Evaluate configurations with successive halving.
+
+    Args:
+        configurations (list): Evaluate these configurations.
+        sequences (list): Track these sequences, in order.
+        run_tasks: A callable that takes a list of (configuration, sequence) tasks and returns an
+            iterable of (mean IoU, mean time) results, in the same order.
+        eta (int): Keep 1/eta of the configurations after each rung.
+        min_sequences (int): The first rung tracks this many sequences.
+        rung_finished: If this is not ``None``, call it after each rung with the rung number, the
+            indices of the configurations that ran in the rung, and the scores.
+
+    Returns:
+        list: The scores of each configuration. Each is a dictionary that maps a sequence name to
+        the mean IoU on that sequence.
+    """
+    scores = [{} for _ in configurations]
+    survivors = list(range(len(configurations)))
+    sizes = rung_sizes(len(sequences), min_sequences, eta)
+    for rung, size in enumerate(sizes):
+        rung_sequences = sequences[:size]
+        tasks = [
+            (index, sequence)
+            for index in survivors
+            for sequence in rung_sequences
+            if sequence not in scores[index]
+        ]
+        command_line.print_information(
+            f"Rung {rung}: {len(survivors)} configurations on {size} sequences."
+        )
+        results = run_tasks([(configurations[index], sequence) for index, sequence in tasks])
+        for (index, sequence), (mean_iou, _) in zip(tasks, results):
+            scores[index][sequence] = mean_iou
+        if rung_finished is not None:
+            rung_finished(rung, survivors, scores)
+        if rung < len(sizes) - 1:
+            survivors.sort(
+                key=lambda i: numpy.mean([scores[i][s] for s in rung_sequences]), reverse=True
+            )
+            survivors = sorted(survivors[: math.ceil(len(survivors) / max(eta, 2))])
+    return scores
+
+
+@contextlib.contextmanager
+def _task_runner(jobs: int, worker_arguments: tuple):
+    """
+    Make a function that runs sweep tasks, in this process or in a pool of processes.
+
+    Args:
+        jobs (int): Run up to this many tasks concurrently. If this is 1, run the tasks in this
+            process.
+        worker_arguments (tuple): The arguments for :py:func:`_initialize_worker()`.
+
+    Yields:
+        A callable that takes a list of (configuration, sequence) tasks and returns an iterator of
+        (mean IoU, mean time) results, in the same order.
+    """
+    if jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            jobs, initializer=_initialize_worker, initargs=worker_arguments
+        ) as executor:
+            yield lambda tasks: executor.map(_run_task, tasks)
+    else:
+        _initialize_worker(*worker_arguments)
+        yield lambda tasks: map(_run_task, tasks)
+
+
+# Each worker process indexes the dataset and makes the decoder and tracking cache once, in
+# _initialize_worker().
+_WORKER_STATE = {}
+
+
+def _initialize_worker(
+    dataset_dir: str, decoder_name: str, frame_cache_dir: str, use_cache: bool
+) -> None:
+    """
+    Prepare a process to run sweep tasks.
+
+    Args:
+        dataset_dir (str): The path to the OTB-100 dataset.
+        decoder_name (str): Decode frames with this :py:mod:`experiments.image_decoder` backend.
+        frame_cache_dir (str): The frame cache directory, for the cache decoder.
+        use_cache (bool): Reuse tracker output from the tracking cache.
+    """
+    with open(os.devnull, "w") as null_file, contextlib.redirect_stdout(null_file):
+        _WORKER_STATE["dataset"] = got10k.datasets.OTB(dataset_dir, version="tb100")
+    _WORKER_STATE["decoder"] = image_decoder.make_decoder(decoder_name, frame_cache_dir)
+    _WORKER_STATE["cache"] = tracking_cache.TrackingCache() if use_cache else None
+
+
+def _run_task(task: tuple) -> tuple:
+    """
+    Track one sequence with one configuration.
+
+    Args:
+        task (tuple): The (configuration, sequence) to run.
+
+    Returns:
+        tuple: The (mean IoU, mean time) of the sequence.
+    """
+    configuration, sequence = task
+    progress_bar = pilot_study._ProgressBar((0, 0), 0, "")  # pylint: disable=protected-access
+    with open(os.devnull, "w") as null_file, contextlib.redirect_stdout(null_file):
+        mean_iou, mean_time, _ = pilot_study._run_sequence(  # pylint: disable=protected-access
+            sequence,
+            _WORKER_STATE["dataset"],
+            progress_bar,
+            _WORKER_STATE["decoder"],
+            make_tracker=functools.partial(
+                pilot_study._make_mdnet, configuration  # pylint: disable=protected-access
+            ),
+            cache=_WORKER_STATE["cache"],
+        )
+    return float(mean_iou), float(mean_time)
+
+
+def _configuration_names(sweep_name: str, count: int) -> list:
+    """
+    Name the configurations of a sweep.
+
+    Args:
+        sweep_name (str): The name of the sweep.
+        count (int): The number of configurations.
+
+    Returns:
+        list: The names, '<sweep_name>-<index>', with zero-padded indices.
+    """
+    digits = len(str(count - 1))
+    return [f"{sweep_name}-{index:0{digits}d}" for index in range(count)]
+
+
+def _save_rung(
+    results_dir: str,
+    sweep_name: str,
+    names: list,
+    configurations: list,
+    rung: int,
+    survivors: list,
+    scores: list,
+) -> None:
+    """
+    Save the scores of the configurations that ran in a rung to the pilot study database.
+
+    Args:
+        results_dir (str): The directory with the pilot study database.
+        sweep_name (str): The name of the sweep.
+        names (list): The name of each configuration.
+        configurations (list): The configurations.
+        rung (int): The rung that finished.
+        survivors (list): The indices of the configurations that ran in the rung.
+        scores (list): The scores of each configuration.
+    """
+    for index in survivors:
+        pilot_study._save_results(  # pylint: disable=protected-access
+            names[index],
+            results_dir,
+            scores[index],
+            [f"sweep:{sweep_name}", f"rung:{rung}"]
+            + [f"{key}={json.dumps(value)}" for key, value in configurations[index].items()],
+        )
+
+
+def _print_leaderboard(names: list, configurations: list, scores: list, rows: int = 10) -> None:
+    """
+    Print the best configurations.
+
+    Configurations that tracked more sequences rank first; ties rank by mean IoU.
+
+    Args:
+        names (list): The name of each configuration.
+        configurations (list): The configurations.
+        scores (list): The scores of each configuration.
+        rows (int): Print this many configurations.
+    """
+    ranking = sorted(
+        range(len(configurations)),
+        key=lambda i: (len(scores[i]), numpy.mean(list(scores[i].values()))),
+        reverse=True,
+    )
+    width = max(len(name) for name in names)
+    for index in ranking[:rows]:
+        options = ", ".join(f"{key}={value}" for key, value in configurations[index].items())
+        print(
+            f"{names[index]:<{width}}  {len(scores[index]):3d} sequences  "
+            f"mean IoU {numpy.mean(list(scores[index].values())):.3f}  {options}"
+        )
+
+
+if __name__ == "__main__":
+    PARSER = fill_command_line_parser(argparse.ArgumentParser())
+    ARGUMENTS = PARSER.parse_args()
+    ARGUMENTS.func(ARGUMENTS)
@@ -0,0 +1,339 @@
+"""
+Generate and read synthetic tracking datasets.
+
+A synthetic dataset has the directory layout of OTB or UAV123, but any number of sequences. Each
+sequence is a solid rectangle that wanders over a blocky noise background, so the frames are real
+JPEG files with realistic decoding costs. Together with ``flatfoot.py experiment --tracker null``,
+a synthetic dataset measures the harness throughput ceiling: frame decoding, result writing, and
+reporting, at scale, with no model and no real data.
+
+======= ==========================================================================================
+Layout  Files
+======= ==========================================================================================
+``otb`` ``<root>/<sequence>/img/0001.jpg`` and ``<root>/<sequence>/groundtruth_rect.txt``
+``uav`` ``<root>/data_seq/UAV123/<sequence>/000001.jpg`` and
+        ``<root>/anno/UAV123/<sequence>.txt``
+======= ==========================================================================================
+
+The experiment command runs the ``synthetic-otb`` and ``synthetic-uav`` benchmarks on these
+datasets, and writes results to the ``OTBsynthetic`` and ``UAVsynthetic`` benchmark directories.
+The report command reads the datasets from ``~/Videos/synthetic/otb`` and
+``~/Videos/synthetic/uav``.
+
+Running this Module as a Script
+-------------------------------
+
+You can run this module as a stand-alone script to generate a dataset.
+
+.. literalinclude:: generated/make_dataset_help.rst
+    :language: text
+
+Reference
+---------
+"""
+
+import argparse
+import glob
+import os
+import numpy
+import PIL.Image
+import experiments.command_line as command_line
+
+LAYOUTS = ["otb", "uav"]
+DEFAULT_DATASET_DIR = os.path.expanduser("~/Videos/synthetic")
+BENCHMARK_VERSION = "synthetic"
+
+
+def fill_command_line_parser(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    Create the command line parser for the dataset generator.
+
+    This function supports filling in a subparser or a root parser. In both cases, this function
+    overwrites certain parser attributes, such as the description.
+
+    Args:
+        parser (argparse.ArgumentParser): Fill out this argument parser. This can be a root parser
+            or a subparser created with `add_subparsers()
+            <https://docs.python.org/3/library/argparse.html#argparse.ArgumentParser.add_subparsers>`_.
+
+    Returns:
+        The parser, filled with parameters and attributes, ready for command line parsing.
+    """
+    parser.description = (
+        "Generate a synthetic tracking dataset with the OTB or UAV123 directory layout. By "
+        "default, the dataset is written to the directory the report command reads it from."
+    )
+    parser.formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    parser.set_defaults(func=main)
+    parser.add_argument(
+        "--dataset-dir",
+        help="Write the dataset to this directory. The default is the layout's subdirectory of "
+        f"{DEFAULT_DATASET_DIR}.",
+        action=command_line.PathSanitizer,
+    )
+    parser.add_argument(
+        "--sequences", help="Generate this many sequences.", type=int, default=1000
+    )
+    parser.add_argument(
+        "--frames", help="Generate this many frames per sequence.", type=int, default=30
+    )
+    parser.add_argument(
+        "--size",
+        help="The width and height of each frame, in pixels.",
+        type=int,
+        nargs=2,
+        default=[320, 240],
+        metavar=("WIDTH", "HEIGHT"),
+    )
+    parser.add_argument(
+        "--quality", help="Encode the frames with this JPEG quality.", type=int, default=90
+    )
+    parser.add_argument(
+        "--seed", help="Seed the random number generator with this value.", type=int, default=0
+    )
+    parser.add_argument("layout", help="Use this directory layout.", choices=LAYOUTS)
+    return parser
+
+
+def main(arguments: argparse.Namespace) -> None:
+    """
+    The main entry point for the dataset generator.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments. The ``arguments`` must
+            have these attributes: ``dataset_dir``, ``sequences``, ``frames``, ``size``,
+            ``quality``, ``seed``, and ``layout``.
+    """
+    dataset_dir = arguments.dataset_dir or os.path.join(DEFAULT_DATASET_DIR, arguments.layout)
+    generate(
+        dataset_dir,
+        arguments.layout,
+        arguments.sequences,
+        arguments.frames,
+        tuple(arguments.size),
+        arguments.quality,
+        arguments.seed,
+    )
+    command_line.print_information(
+        f"Wrote {arguments.sequences} sequences of {arguments.frames} frames to {dataset_dir}."
+    )
+
+
+def generate(
+    dataset_dir: str,
+    layout: str,
+    sequences: int,
+    frames: int,
+    size: tuple = (320, 240),
+    quality: int = 90,
+    seed: int = 0,
+) -> None:
+    """
+    Generate a synthetic dataset.
+
+    Args:
+        dataset_dir (str): Write the dataset to this directory.
+        layout (str): Use this directory layout, either 'otb' or 'uav'.
+        sequences (int): Generate this many sequences.
+        frames (int): Generate this many frames per sequence.
+        size (tuple): The (width, height) of each frame, in pixels.
+        quality (int): Encode the frames with this JPEG quality.
+        seed (int): Seed the random number generator with this value.
+
+    Raises:
+        ValueError: This is raised if ``layout`` is not a known layout.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown dataset layout '{layout}'.")
+    generator = numpy.random.default_rng(seed)
+    digits = len(str(sequences - 1))
+    for sequence in range(sequences):
+        sequence_name = f"Synthetic{sequence:0{digits}d}"
+        image_dir, annotation_file = _sequence_paths(dataset_dir, layout, sequence_name)
+        os.makedirs(image_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(annotation_file), exist_ok=True)
+        boxes = _write_sequence(
+            generator, image_dir, 4 if layout == "otb" else 6, frames, size, quality
+        )
+        numpy.savetxt(annotation_file, boxes, fmt="%d", delimiter=",")
+
+
+def _sequence_paths(dataset_dir: str, layout: str, sequence_name: str) -> tuple:
+    """
+    Get the paths to a sequence's frames and annotations.
+
+    Args:
+        dataset_dir (str): The root directory of the dataset.
+        layout (str): The directory layout, either 'otb' or 'uav'.
+        sequence_name (str): The name of the sequence.
+
+    Returns:
+        tuple: A tuple of (str, str); the frame directory and the annotation file.
+    """
+    if layout == "otb":
+        sequence_dir = os.path.join(dataset_dir, sequence_name)
+        return os.path.join(sequence_dir, "img"), os.path.join(sequence_dir, "groundtruth_rect.txt")
+    return (
+        os.path.join(dataset_dir, "data_seq", "UAV123", sequence_name),
+        os.path.join(dataset_dir, "anno", "UAV123", f"{sequence_name}.txt"),
+    )
+
+
+def _write_sequence(
+    generator: numpy.random.Generator,
+    image_dir: str,
+    digits: int,
+    frames: int,
+    size: tuple,
+    quality: int,
+) -> numpy.ndarray:
+    """
+    Write the frames of one sequence.
+
+    Args:
+        generator (numpy.random.Generator): Draw the background, target, and motion from this
+            generator.
+        image_dir (str): Write the frames to this directory.
+        digits (int): Name the frames with this many digits, starting at 1.
+        frames (int): Write this many frames.
+        size (tuple): The (width, height) of each frame, in pixels.
+        quality (int): Encode the frames with this JPEG quality.
+
+    Returns:
+        numpy.ndarray: The frames x 4 target boxes, as 1-based (x, y, width, height).
+    """
+    width, height = size
+    background = numpy.kron(
+        generator.integers(0, 256, (height // 8 + 1, width // 8 + 1, 3), dtype=numpy.uint8),
+        numpy.ones((8, 8, 1), dtype=numpy.uint8),
+    )[:height, :width]
+    target_size = numpy.array([max(width // 6, 1), max(height // 6, 1)])
+    color = generator.integers(0, 256, 3, dtype=numpy.uint8)
+    limit = numpy.array([width, height]) - target_size
+    steps = generator.normal(0.0, max(width, height) / 100.0, (frames, 2))
+    steps[0] = generator.uniform(0, 1, 2) * limit
+    positions = numpy.empty((frames, 2), dtype=int)
+    position = numpy.zeros(2)
+    for frame in range(frames):
+        position = numpy.clip(position + steps[frame], 0, limit)
+        positions[frame] = position
+    for frame, (x, y) in enumerate(positions):
+        image = background.copy()
+        image[y : y + target_size[1], x : x + target_size[0]] = color
+        PIL.Image.fromarray(image).save(
+            os.path.join(image_dir, f"{frame + 1:0{digits}d}.jpg"), quality=quality
+        )
+    return numpy.hstack([positions + 1, numpy.tile(target_size, (frames, 1))])
+
+
+class SyntheticDataset:
+    """
+    A GOT-10k style dataset of every sequence in an OTB or UAV123 layout directory.
+
+    Unlike the GOT-10k datasets, this dataset does not check for a fixed list of sequences, and
+    never downloads anything.
+
+    Args:
+        root_dir (str): The root directory of the dataset.
+        layout (str): The directory layout, either 'otb' or 'uav'.
+
+    Attributes:
+        root_dir (str): The root directory of the dataset.
+        layout (str): The directory layout.
+        version (str): The benchmark version, for GOT-10k compatibility. This is always
+            'synthetic'.
+        seq_names (list): The names of the sequences, sorted.
+        seq_dirs (list): The frame directory of each sequence.
+        anno_files (list): The annotation file of each sequence.
+
+    Raises:
+        ValueError: This is raised if ``layout`` is not a known layout.
+        RuntimeError: This is raised if ``root_dir`` has no sequences in the ``layout``.
+    """
+
+    def __init__(self, root_dir: str, layout: str = "otb") -> None:
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown dataset layout '{layout}'.")
+        self.root_dir = root_dir
+        self.layout = layout
+        self.version = BENCHMARK_VERSION
+        if layout == "otb":
+            self.anno_files = sorted(glob.glob(os.path.join(root_dir, "*", "groundtruth_rect.txt")))
+            self.seq_names = [os.path.basename(os.path.dirname(f)) for f in self.anno_files]
+        else:
+            self.anno_files = sorted(glob.glob(os.path.join(root_dir, "anno", "UAV123", "*.txt")))
+            self.seq_names = [os.path.splitext(os.path.basename(f))[0] for f in self.anno_files]
+        self.seq_dirs = [_sequence_paths(root_dir, layout, name)[0] for name in self.seq_names]
+        if not self.seq_names:
+            raise RuntimeError(f"{root_dir} has no sequences in the {layout} layout.")
+
+    def __getitem__(self, index) -> tuple:
+        """
+        Get a sequence.
+
+        Args:
+            index (int | str): The index or name of the sequence.
+
+        Returns:
+            tuple: A tuple of (list, numpy.ndarray); the sorted frame paths, and the frames x 4
+            annotations.
+        """
+        if isinstance(index, str):
+            index = self.seq_names.index(index)
+        image_files = sorted(glob.glob(os.path.join(self.seq_dirs[index], "*.jpg")))
+        annotations = numpy.loadtxt(self.anno_files[index], delimiter=",", ndmin=2)
+        return image_files, annotations
+
+    def __len__(self) -> int:
+        return len(self.seq_names)
+
+
+def benchmark_name(layout: str) -> str:
+    """
+    Get the name of the benchmark results directory for a synthetic dataset.
+
+    Args:
+        layout (str): The dataset layout, either 'otb' or 'uav'.
+
+    Returns:
+        str: 'OTBsynthetic' or 'UAVsynthetic'.
+    """
+    return f"{layout.upper()}{BENCHMARK_VERSION}"
+
+
+def make_experiment(
+    root_dir: str, layout: str, result_dir: str = "results", report_dir: str = "reports"
+):
+    """
+    Make a GOT-10k one-pass experiment on a synthetic dataset.
+
+    Args:
+        root_dir (str): The root directory of the dataset.
+        layout (str): The dataset layout, either 'otb' or 'uav'.
+        result_dir (str): Write tracking results to the benchmark directory in this directory.
+        report_dir (str): Write reports to the benchmark directory in this directory.
+
+    Returns:
+        got10k.experiments.ExperimentOTB: The experiment.
+    """
+    # The GOT-10k experiments import matplotlib, so only import them when they are needed.
+    import got10k.experiments  # pylint: disable=import-outside-toplevel
+
+    class SyntheticExperiment(got10k.experiments.ExperimentOTB):
+        """An OTB experiment on a :py:class:`SyntheticDataset`."""
+
+        def __init__(self) -> None:  # pylint: disable=super-init-not-called
+            # ExperimentOTB.__init__() downloads OTB, so set up the same attributes here instead.
+            self.dataset = SyntheticDataset(root_dir, layout)
+            self.result_dir = os.path.join(result_dir, benchmark_name(layout))
+            self.report_dir = os.path.join(report_dir, benchmark_name(layout))
+            self.nbins_iou = 21
+            self.nbins_ce = 51
+
+    return SyntheticExperiment()
+
+
+if __name__ == "__main__":
+    PARSER = fill_command_line_parser(argparse.ArgumentParser())
+    ARGUMENTS = PARSER.parse_args()
+    ARGUMENTS.func(ARGUMENTS)
@@ -1,10 +1,14 @@
 """Represents tracking results in a table format."""
 
 import copy
+import json
+import math
 import os.path
+import struct
 import subprocess
+import zipfile
 import numpy
-import pylatex
+import pylatex.utils
 
 
 class FormatSpec:
@@ -58,8 +62,12 @@ class DataTable:
             initially NaN. The output functions ignore NaN data; they are treated as empty cells.
         label (str): A label to use for cross referencing in the output. Not all output formats use
             the label.
-        row_labels (list): The list of labels for each row.
-        column_labels (list): The list of labels for each column.
+        row_labels (tuple): The labels for each row. Assigning new labels also updates the label
+            index used by :py:meth:`row_index()`. The labels are stored as a tuple, so they cannot
+            change in place and leave the index stale.
+        column_labels (tuple): The labels for each column. Assigning new labels also updates the
+            label index used by :py:meth:`column_index()`. The labels are stored as a tuple, like
+            the ``row_labels``.
         format_spec: A :py:class:`FormatSpec` object describing how to print the data table.
     """
 
@@ -71,6 +79,125 @@ class DataTable:
         self.caption = ""
         self.label = ""
 
+    @classmethod
+    def from_records(
+        cls, records, row_labels: list = None, column_labels: list = None
+    ) -> "DataTable":
+        """
+        Create a data table from (row label, column label, value) records.
+
+        Args:
+            records: An iterable of (row label, column label, value) tuples.
+            row_labels (list): The row labels of the table. If this is ``None``, the rows are the
+                row labels of the ``records``, in the order they first appear.
+            column_labels (list): The column labels of the table. If this is ``None``, the columns
+                are the column labels of the ``records``, in the order they first appear.
+
+        Returns:
+            DataTable: The new table. Cells without a record are NaN. Records with labels that are
+            not in ``row_labels`` or ``column_labels`` are ignored.
+        """
+        records = list(records)
+        if row_labels is None:
+            row_labels = list(dict.fromkeys(record[0] for record in records))
+        if column_labels is None:
+            column_labels = list(dict.fromkeys(record[1] for record in records))
+        table = cls(row_labels, column_labels)
+        records = [
+            (table.__row_indices[row], table.__column_indices[column], value)
+            for row, column, value in records
+            if row in table.__row_indices and column in table.__column_indices
+        ]
+        if records:
+            rows, columns, values = zip(*records)
+            table.data[list(rows), list(columns)] = values
+        return table
+
+    @classmethod
+    def from_nested_dict(
+        cls, raw_data: dict, row_labels: list = None, column_labels: list = None
+    ) -> "DataTable":
+        """
+        Create a data table from a dictionary of dictionaries.
+
+        Args:
+            raw_data (dict): The outer keys are row labels, and the inner keys are column labels:
+
+                .. code-block:: json
+
+                    {
+                        "row1": {"column1": 0.0, "column2": 0.0},
+                        "row2": {"column1": 0.0}
+                    }
+
+            row_labels (list): The row labels of the table. If this is ``None``, the rows are the
+                outer keys of ``raw_data``.
+            column_labels (list): The column labels of the table. If this is ``None``, the columns
+                are the inner keys of ``raw_data``, in the order they first appear.
+
+        Returns:
+            DataTable: The new table. Missing cells are NaN.
+        """
+        return cls.from_records(
+            (
+                (row, column, value)
+                for row, row_data in raw_data.items()
+                for column, value in row_data.items()
+            ),
+            list(raw_data.keys()) if row_labels is None else row_labels,
+            column_labels,
+        )
+
+    @property
+    def row_labels(self) -> tuple:
+        """tuple: The labels for each row."""
+        return self.__row_labels
+
+    @row_labels.setter
+    def row_labels(self, labels: list) -> None:
+        self.__row_labels = tuple(labels)
+        self.__row_indices = {label: index for index, label in enumerate(self.__row_labels)}
+
+    @property
+    def column_labels(self) -> tuple:
+        """tuple: The labels for each column."""
+        return self.__column_labels
+
+    @column_labels.setter
+    def column_labels(self, labels: list) -> None:
+        self.__column_labels = tuple(labels)
+        self.__column_indices = {label: index for index, label in enumerate(self.__column_labels)}
+
+    def row_index(self, label) -> int:
+        """
+        Find a row by its label.
+
+        Args:
+            label: The row label.
+
+        Returns:
+            int: The index of the row.
+
+        Raises:
+            KeyError: This is raised if no row has the ``label``.
+        """
+        return self.__row_indices[label]
+
+    def column_index(self, label) -> int:
+        """
+        Find a column by its label.
+
+        Args:
+            label: The column label.
+
+        Returns:
+            int: The index of the column.
+
+        Raises:
+            KeyError: This is raised if no column has the ``label``.
+        """
+        return self.__column_indices[label]
+
     @property
     def shape(self) -> tuple:
         """
@@ -120,12 +247,107 @@ def number_of_rows(data: DataTable) -> int:
     return data.shape[0]
 
 
+def concatenate(tables: list, axis: int = 0) -> DataTable:
+    """
+    Concatenate data tables, aligning the other axis on its labels.
+
+    Args:
+        tables (list): Concatenate these data tables, in order.
+        axis (int): Stack the rows of the ``tables`` if this is 0, or the columns if this is 1.
+
+    Returns:
+        DataTable: The concatenated table. The labels of the other axis are the union of the
+        ``tables``' labels, in the order they first appear. Cells that a table does not have are
+        NaN. The caption, label, and format specification are copies of the first table's.
+    """
+    if axis == 0:
+        result = DataTable(
+            [label for table in tables for label in table.row_labels],
+            _union_labels([table.column_labels for table in tables]),
+        )
+        start = 0
+        for table in tables:
+            columns = [result.column_index(label) for label in table.column_labels]
+            result.data[start : start + table.shape[0], columns] = table.data
+            start += table.shape[0]
+    else:
+        result = DataTable(
+            _union_labels([table.row_labels for table in tables]),
+            [label for table in tables for label in table.column_labels],
+        )
+        start = 0
+        for table in tables:
+            rows = [result.row_index(label) for label in table.row_labels]
+            result.data[rows, start : start + table.shape[1]] = table.data
+            start += table.shape[1]
+    _copy_presentation(tables[0], result)
+    return result
+
+
+def join(tables: list) -> DataTable:
+    """
+    Join data tables on both their row labels and their column labels.
+
+    Use this to combine tables that hold different cells of the same kind of data, such as the
+    scores of different benchmarks.
+
+    Args:
+        tables (list): Join these data tables.
+
+    Returns:
+        DataTable: The joined table. The row and column labels are the unions of the ``tables``'
+        labels, in the order they first appear. A cell's value comes from the last table that has
+        a value other than NaN for it; cells without a value are NaN. The caption, label, and
+        format specification are copies of the first table's.
+    """
+    result = DataTable(
+        _union_labels([table.row_labels for table in tables]),
+        _union_labels([table.column_labels for table in tables]),
+    )
+    for table in tables:
+        block = numpy.ix_(
+            [result.row_index(label) for label in table.row_labels],
+            [result.column_index(label) for label in table.column_labels],
+        )
+        result.data[block] = numpy.where(numpy.isnan(table.data), result.data[block], table.data)
+    _copy_presentation(tables[0], result)
+    return result
+
+
+def _union_labels(label_lists: list) -> list:
+    """Merge lists of labels, keeping the order in which each label first appears."""
+    return list(dict.fromkeys(label for labels in label_lists for label in labels))
+
+
+def _copy_presentation(source: DataTable, destination: DataTable) -> None:
+    """Copy the caption, label, and format specification of a data table to another table."""
+    destination.caption = source.caption
+    destination.label = source.label
+    destination.format_spec = copy.copy(source.format_spec)
+
+
 def write_table(data: DataTable, file_path: str) -> None:
     """
     Write a data table to a file.
 
     The function determines what type of content to write based on the file extension in
-    ``file_path``. At this time, the function only supports LaTeX files.
+    ``file_path``. At this time, the function supports these files:
+
+    ========== ===================================================================================
+    Extension  Content
+    ========== ===================================================================================
+    ``.tex``   A LaTeX table, formatted according to the ``format_spec``.
+    ``.csv``   A CSV table, formatted according to the ``format_spec``.
+    ``.npz``   An uncompressed NumPy archive of the full precision data, the labels, the caption,
+               and the cross reference label. :py:func:`read_table()` memory-maps the data.
+    ``.jsonl`` JSON lines: a header line with the labels, caption, and cross reference label, then
+               one line per column with the column's full precision values. NaN values are
+               ``null``, and infinite values are the strings ``"Infinity"`` and ``"-Infinity"``,
+               so the file is strict JSON.
+    ========== ===================================================================================
+
+    The ``.npz`` and ``.jsonl`` files ignore the ``format_spec``; they hold the table's data as it
+    is, for other tools to analyze.
 
     Args:
         data (DataTable): Write this ``DataTable`` object.
@@ -135,176 +357,365 @@ def write_table(data: DataTable, file_path: str) -> None:
         ValueError: The function raises this exception if it cannot determine the content type
             from the file extension.
     """
-    data_to_print = _finalize_data_table(data)
     extension = os.path.splitext(file_path)[1]
     if extension == ".tex":
-        _write_latex_table(data_to_print, file_path)
+        _write_latex_table(_finalize_data_table(data), file_path)
     elif extension == ".csv":
-        _write_csv_table(data_to_print, file_path)
+        _write_csv_table(_finalize_data_table(data), file_path)
+    elif extension == ".npz":
+        _write_npz_table(data, file_path)
+    elif extension == ".jsonl":
+        _write_json_lines_table(data, file_path)
     else:
         raise ValueError(f"Unknown table type '{extension}'")
 
 
-def _finalize_data_table(data: DataTable) -> DataTable:
+def read_table(file_path: str, memory_map: bool = True) -> DataTable:
+    """
+    Read a data table written by :py:func:`write_table()` in a ``.npz`` or ``.jsonl`` file.
+
+    Args:
+        file_path (str): Read the data table from this file.
+        memory_map (bool): Memory-map the data of a ``.npz`` file instead of reading it. The data
+            of the table is then read-only. This has no effect on ``.jsonl`` files.
+
+    Returns:
+        DataTable: The data table, with the default format specification.
+
+    Raises:
+        ValueError: The function raises this exception if it cannot determine the content type
+            from the file extension.
+    """
+    extension = os.path.splitext(file_path)[1]
+    if extension == ".npz":
+        return _read_npz_table(file_path, memory_map)
+    if extension == ".jsonl":
+        return _read_json_lines_table(file_path)
+    raise ValueError(f"Unknown table type '{extension}'")
+
+
+class _FinalTable:
+    """
+    The formatted cells of a :py:class:`DataTable`, arranged for printing.
+
+    Attributes:
+        row_labels (list): The label of each row, including special rows.
+        column_labels (list): The label of each column, including special columns.
+        cells (numpy.ndarray): The formatted numbers, as a 2D string array. Cells with NaN or
+            infinite data are empty strings.
+        best (numpy.ndarray): The column index of the best cell in each row, or ``None`` if the
+            best cells are not marked.
+        source (DataTable): The data table these cells came from.
+    """
+
+    def __init__(
+        self,
+        row_labels: list,
+        column_labels: list,
+        cells: numpy.ndarray,
+        best: numpy.ndarray,
+        source: DataTable,
+    ) -> None:
+        self.row_labels = row_labels
+        self.column_labels = column_labels
+        self.cells = cells
+        self.best = best
+        self.source = source
+
+
+def _finalize_data_table(data: DataTable) -> _FinalTable:
     """
-    Copy a data table and make all change necessary to print the data according to the format
-    specification.
+    Arrange a data table for printing according to its format specification.
+
+    The function does not copy the data table. It computes the special rows separately, and
+    formats all the cells at once.
 
     Args:
         data (DataTable): Finalize this DataTable.
 
     Returns:
-        DataTable: A copy of the source ``data``, ready for printing.
-    """
-    final_data = copy.deepcopy(data)
-    if final_data.format_spec.include_mean and number_of_rows(data) > 1:
-        final_data.data = numpy.vstack([final_data.data, numpy.nanmean(data.data, axis=0)])
-        final_data.row_labels.append("Mean")
-    if final_data.format_spec.include_median and number_of_rows(data) > 1:
-        final_data.data = numpy.vstack([final_data.data, numpy.nanmedian(data.data, axis=0)])
-        final_data.row_labels.append("Median")
-    if final_data.format_spec.transpose:
-        final_data.data = numpy.transpose(final_data.data)
-        final_data.row_labels, final_data.column_labels = (
-            final_data.column_labels,
-            final_data.row_labels,
-        )
-    return final_data
+        _FinalTable: The formatted cells of the ``data``, ready for printing.
+    """
+    format_spec = data.format_spec
+    special_labels = []
+    special_rows = []
+    if format_spec.include_mean and number_of_rows(data) > 1:
+        special_labels.append("Mean")
+        special_rows.append(numpy.nanmean(data.data, axis=0))
+    if format_spec.include_median and number_of_rows(data) > 1:
+        special_labels.append("Median")
+        special_rows.append(numpy.nanmedian(data.data, axis=0))
+    special_rows = numpy.reshape(special_rows, (len(special_rows), data.shape[1]))
+    cells = numpy.concatenate(
+        [
+            _format_cells(data.data, format_spec.places),
+            _format_cells(special_rows, format_spec.places),
+        ]
+    )
+    row_labels = list(data.row_labels) + special_labels
+    column_labels = list(data.column_labels)
+    best = None
+    if format_spec.mark_best:
+        values = numpy.concatenate([data.data, special_rows])
+        if format_spec.transpose:
+            values = values.T
+        if values.shape[1] > 1:
+            best = numpy.argmax(values, axis=1)
+    if format_spec.transpose:
+        cells = cells.T
+        row_labels, column_labels = column_labels, row_labels
+    return _FinalTable(row_labels, column_labels, cells, best, data)
+
+
+def _format_cells(values: numpy.ndarray, places: int) -> numpy.ndarray:
+    """
+    Format numbers for printing.
+
+    Args:
+        values (numpy.ndarray): Format these numbers.
+        places (int): The number of places to print after the decimal point.
+
+    Returns:
+        numpy.ndarray: A string array the same shape as ``values``. NaN and infinite values are
+        empty strings.
+    """
+    if values.size == 0:
+        return numpy.zeros(values.shape, dtype=str)
+    # One printf-style operation formats every value, then one split separates the cells.
+    text = (f"%.{places}f\n" * values.size) % tuple(values.ravel().tolist())
+    cells = numpy.array(text.split("\n")[:-1]).reshape(values.shape)
+    cells[~numpy.isfinite(values)] = ""
+    return cells
 
 
 # ==================================================================================================
-# CSV tables
+# NumPy archives
 # ==================================================================================================
-def _write_csv_table(data: DataTable, file_path: str) -> None:
+def _write_npz_table(data: DataTable, file_path: str) -> None:
     """
-    Write a data table to a CSV file.
+    Write a data table to an uncompressed NumPy archive.
 
     Args:
         data (DataTable): Write this ``DataTable``.
         file_path (str): Write the ``data`` to this file.
     """
-    with open(file_path, "w") as csv_file:
-        csv_file.write(",")
-        csv_file.write(",".join(data.column_labels))
-        csv_file.write("\n")
-        for row_index in range(data.shape[0]):
-            csv_file.write(f"{data.row_labels[row_index]},")
-            csv_file.write(
-                ",".join(
-                    [
-                        f"{d:.{data.format_spec.places}f}" if numpy.isfinite(d) else ""
-                        for d in data[row_index]
-                    ]
-                )
-            )
-            csv_file.write("\n")
+    numpy.savez(
+        file_path,
+        data=numpy.asarray(data.data, dtype=float),
+        row_labels=numpy.array([str(label) for label in data.row_labels], dtype=str),
+        column_labels=numpy.array([str(label) for label in data.column_labels], dtype=str),
+        caption=numpy.array(data.caption),
+        label=numpy.array(data.label),
+    )
+
+
+def _read_npz_table(file_path: str, memory_map: bool) -> DataTable:
+    """
+    Read a data table from a NumPy archive.
+
+    Args:
+        file_path (str): Read the data table from this file.
+        memory_map (bool): Memory-map the data instead of reading it.
+
+    Returns:
+        DataTable: The data table.
+    """
+    with numpy.load(file_path) as archive:
+        data = DataTable(archive["row_labels"].tolist(), archive["column_labels"].tolist())
+        data.caption = str(archive["caption"])
+        data.label = str(archive["label"])
+        data.data = _map_npz_member(file_path, "data.npy") if memory_map else archive["data"]
+    return data
+
+
+def _map_npz_member(file_path: str, member: str) -> numpy.ndarray:
+    """
+    Memory-map an array stored, uncompressed, in a NumPy archive.
+
+    Args:
+        file_path (str): The path to the archive.
+        member (str): The name of the array file in the archive.
+
+    Returns:
+        numpy.ndarray: The read-only array.
+
+    Raises:
+        ValueError: This is raised if the member is compressed.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        info = archive.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{member} in {file_path} is compressed; it cannot be memory-mapped.")
+    with open(file_path, "rb") as archive_file:
+        # Skip the local file header: 30 fixed bytes, then the file name and the extra field.
+        archive_file.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", archive_file.read(4))
+        archive_file.seek(name_length + extra_length, os.SEEK_CUR)
+        version = numpy.lib.format.read_magic(archive_file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(archive_file)
+        else:
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(archive_file)
+        offset = archive_file.tell()
+    return numpy.memmap(
+        file_path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
 
 
 # ==================================================================================================
-# LaTeX tables
+# JSON lines
 # ==================================================================================================
-def _write_latex_table(data: DataTable, file_path: str) -> None:
+def _write_json_lines_table(data: DataTable, file_path: str) -> None:
     """
-    Write a data table to a LaTeX file.
+    Write a data table to a JSON lines file, one column per line.
 
     Args:
         data (DataTable): Write this ``DataTable``.
         file_path (str): Write the ``data`` to this file.
     """
-    _configure_pylatex()
-    table = _make_latex_table(data)
-    table.generate_tex(file_path[:-4])
-    if data.format_spec.pretty_format:
-        subprocess.run(["latexindent", "--overwrite", "--silent", file_path], check=False)
+    values = [[_json_number(value) for value in column] for column in data.data.T.tolist()]
+    with open(file_path, "w") as json_file:
+        json.dump(
+            {
+                "caption": data.caption,
+                "label": data.label,
+                "row_labels": list(data.row_labels),
+                "column_labels": list(data.column_labels),
+            },
+            json_file,
+            allow_nan=False,
+        )
+        json_file.write("\n")
+        json_file.writelines(
+            json.dumps({"column": label, "values": column}, allow_nan=False) + "\n"
+            for label, column in zip(data.column_labels, values)
+        )
 
 
-def _configure_pylatex() -> None:
-    """Configure a few aspects of the pylatex package."""
-    # By default, pylatex does not support the S column type. Add it to the list of available types
-    # so the tabular environment works correctly.
-    pylatex.table.COLUMN_LETTERS.add("S")
+def _json_number(value: float):
+    """
+    Convert a number to a strict JSON value.
 
-    # By default, pylatex appends '%\n' to every line. Just print a newline.
-    pylatex.base_classes.Container.content_separator = "\n"
+    JSON has no NaN or infinity, so NaN is ``null`` and infinity is a string that ``float()`` and
+    :py:func:`numpy.array()` read back.
 
+    Args:
+        value (float): Convert this number.
 
-def _make_latex_table(data: DataTable) -> pylatex.Table:
+    Returns:
+        float | str | None: The JSON value.
     """
-    Create a `pylatex.Table
-    <https://jeltef.github.io/PyLaTeX/current/pylatex/pylatex.table.html#pylatex.table.Table>`_
-    object and fill it with the provided ``data``.
+    if math.isnan(value):
+        return None
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return value
 
-    Args:
-        data (DataTable): Write this data to the ``pylatex.Table`` object.
 
-    Returns:
-        pylatex.Table: The completed table.
-    """
-    table = pylatex.Table(position="!h")
-    with table.create(pylatex.Center()):
-        if data.caption:
-            if data.label:
-                table.add_caption(pylatex.NoEscape(rf"{data.caption}\label{{table:{data.label}}}"))
-            else:
-                table.add_caption(pylatex.NoEscape(data.caption))
-        table_spec = _make_latex_table_spec(data)
-        with table.create(pylatex.Tabular(table_spec, booktabs=True)) as tabular:
-            _write_latex_column_labels(tabular, data.column_labels)
-            for row_index in range(data.shape[0]):
-                _write_latex_row(
-                    tabular, data.row_labels[row_index], data[row_index], data.format_spec
-                )
-    return table
-
-
-def _make_latex_table_spec(data: DataTable) -> str:
+def _read_json_lines_table(file_path: str) -> DataTable:
     """
-    Make the specification for the LaTeX table.
+    Read a data table from a JSON lines file.
 
     Args:
-        data (DataTable): Create a table spec for this DataTable.
+        file_path (str): Read the data table from this file.
 
     Returns:
-        str: The LaTeX table spec suitable for the given ``data``.
+        DataTable: The data table.
+    """
+    with open(file_path, "r") as json_file:
+        header = json.loads(json_file.readline())
+        columns = [json.loads(line)["values"] for line in json_file if line.strip()]
+    data = DataTable(header["row_labels"], header["column_labels"])
+    data.caption = header["caption"]
+    data.label = header["label"]
+    if columns:
+        data.data = numpy.array(columns, dtype=float).T.copy()
+    return data
+
+
+# ==================================================================================================
+# CSV tables
+# ==================================================================================================
+def _write_csv_table(data: _FinalTable, file_path: str) -> None:
+    """
+    Write a data table to a CSV file.
+
+    Args:
+        data (_FinalTable): Write this finalized ``DataTable``.
+        file_path (str): Write the ``data`` to this file.
     """
-    if data.format_spec.transpose and data.shape[1] > 1:
-        if data.format_spec.include_median and data.format_spec.include_mean:
-            return "l" + "c" * (data.shape[1] - 2) + "|" + "cc"
-        if data.format_spec.include_median or data.format_spec.include_mean:
-            return "l" + "c" * (data.shape[1] - 1) + "|" + "c"
-    return "l" + "c" * data.shape[1]
+    with open(file_path, "w") as csv_file:
+        csv_file.write(",")
+        csv_file.write(",".join(data.column_labels))
+        csv_file.write("\n")
+        csv_file.writelines(
+            f"{label},{','.join(row)}\n" for label, row in zip(data.row_labels, data.cells.tolist())
+        )
 
 
-def _write_latex_column_labels(table: pylatex.Tabular, labels: list) -> None:
+# ==================================================================================================
+# LaTeX tables
+# ==================================================================================================
+def _write_latex_table(data: _FinalTable, file_path: str) -> None:
     """
-    Write a DataTable's column labels to a LaTeX table.
+    Write a data table to a LaTeX file.
+
+    The table uses the booktabs package, and marks the best cells with a ``\\Best`` command that
+    the document must define.
 
     Args:
-        table (pylatex.Tabular): Write the labels to this LaTeX table object.
-        labels (list): Write these column labels.
+        data (_FinalTable): Write this finalized ``DataTable``.
+        file_path (str): Write the ``data`` to this file.
     """
-    labels = [pylatex.NoEscape(f"{{{l}}}") for l in labels]
-    labels.insert(0, "")
-    table.add_row(labels)
-    table.add_hline()
+    lines = [r"\begin{table}[!h]", r"\begin{center}"]
+    if data.source.caption:
+        if data.source.label:
+            lines.append(rf"\caption{{{data.source.caption}\label{{table:{data.source.label}}}}}")
+        else:
+            lines.append(rf"\caption{{{data.source.caption}}}")
+    lines.append(rf"\begin{{tabular}}{{@{{}}{_make_latex_table_spec(data)}@{{}}}}")
+    lines.append(r"\toprule%")
+    lines.append("".join(f"&{{{label}}}" for label in data.column_labels) + r"\\")
+    lines.append(r"\midrule")
+    # numpy.char.replace() keeps the width of the input strings, so it would cut "{-}0" to "{-0".
+    cells = numpy.array(
+        [[cell.replace("-", "{-}") for cell in row] for row in data.cells.tolist()], dtype=object
+    ).reshape(data.cells.shape)
+    if data.best is not None:
+        rows = numpy.arange(len(cells))
+        cells[rows, data.best] = r"\Best{" + cells[rows, data.best] + "}"
+    lines.extend(
+        "&".join([pylatex.utils.escape_latex(str(label))] + row) + r"\\"
+        for label, row in zip(data.row_labels, cells.tolist())
+    )
+    lines[-1] += r"\bottomrule%"
+    lines.extend(["", r"\end{tabular}", r"\end{center}", r"\end{table}"])
+    with open(file_path, "w") as latex_file:
+        latex_file.write("\n".join(lines))
+    if data.source.format_spec.pretty_format:
+        subprocess.run(["latexindent", "--overwrite", "--silent", file_path], check=False)
 
 
-def _write_latex_row(
-    table: pylatex.Tabular, label: str, row_data: numpy.ndarray, format_spec: FormatSpec
-) -> None:
+def _make_latex_table_spec(data: _FinalTable) -> str:
     """
-    Write one row of a DataTable to a LaTeX table.
+    Make the specification for the LaTeX table.
 
     Args:
-        table (pylatex.Tabular): Write the row to this LaTeX table object.
-        label (str): The row label, written to the first column.
-        row_data (numpy.ndarray): Write this row data to the ``table``.
-        format_spec (FormatSpec): Describe how to format data in this row.
-    """
-    row = [label]
-    row.extend([f"{d:.{format_spec.places}f}" if numpy.isfinite(d) else "" for d in row_data])
-    if len(row_data) > 1 and format_spec.mark_best:
-        # Add one to account for the row label in row[0].
-        index = numpy.argmax(row_data) + 1
-        row[index] = pylatex.Command("Best", row[index])
-    table.add_row(row)
+        data (_FinalTable): Create a table spec for this finalized DataTable.
+
+    Returns:
+        str: The LaTeX table spec suitable for the given ``data``.
+    """
+    format_spec = data.source.format_spec
+    columns = data.cells.shape[1]
+    if format_spec.transpose and columns > 1:
+        if format_spec.include_median and format_spec.include_mean:
+            return "l" + "c" * (columns - 2) + "|" + "cc"
+        if format_spec.include_median or format_spec.include_mean:
+            return "l" + "c" * (columns - 1) + "|" + "c"
+    return "l" + "c" * columns
@@ -0,0 +1,190 @@
+"""
+Memoize the output of a tracker on a sequence.
+
+The pilot study and the experiments seed the tracker, so tracking a sequence again with the same
+tracker code and options produces the same boxes. A :py:class:`TrackingCache` stores the boxes and
+frame times of each run under a content key, and the pilot study, the sweep, and the experiments
+return the stored output instead of tracking the sequence again.
+
+The key is a SHA-1 digest of:
+
+=================== ===============================================================================
+Input               Content
+=================== ===============================================================================
+Tracker source      The content of every Python file in the tracker's source tree. For py-MDNet,
+                    this is the py-MDNet repository.
+Tracker options     The tracker's ``opts``, as sorted JSON. This includes the model path.
+Seed                The tracker's ``random_seed`` option.
+Sequence            The name of the sequence and the initial target box.
+Frames              The size and modification time, in nanoseconds, of every frame file.
+=================== ===============================================================================
+
+Changing any of these makes a new key, so stale output is never returned. The key does not cover
+files the tracker reads outside its source tree, such as model weights; replace a model file under
+a new name, or use ``--no-cache``, to track with new weights.
+
+The cache stores one ``.npz`` file per key in ``~/.cache/flatfoot/tracking``. Nothing removes old
+entries; delete the directory to clear the cache.
+
+Reference
+---------
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import numpy
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/flatfoot/tracking")
+
+# The source hash of each source tree, keyed by the tree's root directory. Each value is a tuple of
+# the file fingerprints and the hash, so a tree is only hashed again after a file changes.
+_SOURCE_HASHES = {}
+
+
+def add_cache_parameter(parser: argparse.ArgumentParser) -> argparse.Action:
+    """
+    Add the ``--no-cache`` parameter to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Add the parameter to this parser.
+
+    Returns:
+        argparse.Action: The new parameter.
+    """
+    return parser.add_argument(
+        "--no-cache",
+        help="Track every sequence, even if the tracking cache has output for the same tracker "
+        "code, options, and frames.",
+        action="store_true",
+    )
+
+
+class TrackingCache:
+    """
+    Tracker output, keyed by :py:func:`tracking_key()`.
+
+    Args:
+        cache_dir (str): Store the output in this directory.
+
+    Attributes:
+        cache_dir (str): The directory with the output files.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+
+    def get(self, key: str) -> tuple:
+        """
+        Look up the output of a tracking run.
+
+        Args:
+            key (str): The key from :py:func:`tracking_key()`.
+
+        Returns:
+            tuple | None: A tuple of (numpy.ndarray, numpy.ndarray); the frames x 4 boxes and the
+            time of each frame. This is ``None`` if the cache does not have output for ``key``.
+        """
+        try:
+            with numpy.load(self.__path(key)) as output:
+                return output["boxes"], output["times"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, boxes: numpy.ndarray, times: numpy.ndarray) -> None:
+        """
+        Store the output of a tracking run.
+
+        Args:
+            key (str): The key from :py:func:`tracking_key()`.
+            boxes (numpy.ndarray): The frames x 4 boxes.
+            times (numpy.ndarray): The time of each frame.
+        """
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as output_file:
+            numpy.savez(output_file, boxes=boxes, times=times)
+        os.replace(temporary_path, path)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npz")
+
+
+def tracking_key(tracker, sequence_name: str, images: list, initial_box) -> str:
+    """
+    Make the cache key of a tracking run.
+
+    Args:
+        tracker: The tracker. It must have an ``opts`` dictionary, like ``tracking.mdnet.Mdnet``.
+        sequence_name (str): The name of the sequence.
+        images (list): The paths to the sequence frames.
+        initial_box: The initial target box.
+
+    Returns:
+        str: The hexadecimal SHA-1 key.
+    """
+    digest = hashlib.sha1()
+    digest.update(source_hash(tracker).encode())
+    digest.update(json.dumps(tracker.opts, sort_keys=True, default=str).encode())
+    digest.update(str(tracker.opts.get("random_seed")).encode())
+    digest.update(sequence_name.encode())
+    digest.update(numpy.asarray(initial_box, dtype=float).tobytes())
+    for image in images:
+        status = os.stat(image)
+        digest.update(f"{status.st_size}:{status.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def source_hash(tracker) -> str:
+    """
+    Hash the source code of a tracker.
+
+    The source tree is the directory that contains the tracker's top level package, or the
+    directory of the tracker's module if the module is not in a package.
+
+    Args:
+        tracker: Hash the source code of this object's class.
+
+    Returns:
+        str: The hexadecimal SHA-1 digest of every Python file in the source tree.
+    """
+    root = _source_root(type(tracker).__module__)
+    paths = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(d for d in subdirectories if not d.startswith((".", "__")))
+        paths.extend(os.path.join(directory, f) for f in sorted(files) if f.endswith(".py"))
+    fingerprints = []
+    for path in paths:
+        status = os.stat(path)
+        fingerprints.append((path, status.st_size, status.st_mtime_ns))
+    if root in _SOURCE_HASHES and _SOURCE_HASHES[root][0] == fingerprints:
+        return _SOURCE_HASHES[root][1]
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, "rb") as source_file:
+            digest.update(source_file.read())
+    _SOURCE_HASHES[root] = (fingerprints, digest.hexdigest())
+    return _SOURCE_HASHES[root][1]
+
+
+def _source_root(module_name: str) -> str:
+    """
+    Find the source tree of a module.
+
+    Args:
+        module_name (str): The module's full name, such as ``tracking.mdnet``.
+
+    Returns:
+        str: The directory that contains the module's top level package. If the module is not in a
+        package, this is the module's directory.
+    """
+    top_level = sys.modules[module_name.split(".")[0]]
+    if hasattr(top_level, "__path__"):
+        # py-MDNet's packages have no __init__.py, so they are namespace packages without a
+        # __file__.
+        return os.path.dirname(os.path.abspath(list(top_level.__path__)[0]))
+    return os.path.dirname(os.path.abspath(top_level.__file__))
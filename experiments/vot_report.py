@@ -0,0 +1,415 @@
+"""
+Compute supervised VOT reports.
+
+This module is a vectorized replacement for ``got10k.experiments.ExperimentVOT.report()`` with the
+supervised experiment. It reads every repetition of every sequence of a tracker, clips the tracker
+rectangles and the annotation polygons to the image with a vectorized Sutherland-Hodgman clipper,
+and computes every polygon overlap in one pass. Burn-in frames after each re-initialization, the
+per-repetition averages, and the failure counts are masks and ``numpy.bincount()`` reductions
+instead of Python loops. The ``performance.json`` it writes has the same fields and values as the
+GOT-10k report: ``accuracy``, ``robustness``, and ``speed_fps``.
+
+The GOT-10k record format has one line per frame. A line with one value marks the initialization
+frame (1), a tracking failure (2), or a skipped frame (0). Every other line is the tracker's
+rectangle. This module supports rectangle results only; use the GOT-10k engine for trackers that
+report polygons.
+
+Reference
+---------
+"""
+
+import glob
+import json
+import os
+import numpy
+import PIL.Image
+import experiments.command_line as command_line
+
+# These match the GOT-10k VOT experiment.
+BURNIN = 10
+REPETITIONS = 15
+TAGS = ["camera_motion", "illum_change", "occlusion", "size_change", "motion_change", "empty"]
+
+# The record codes of frames without a rectangle.
+_TRACKED = -1
+_INITIALIZED = 1
+_FAILED = 2
+
+
+def report(
+    dataset, result_dir: str, report_dir: str, tracker_names: list, partial: bool = False
+) -> dict:
+    """
+    Compute the supervised VOT performance of trackers and write it to ``performance.json``.
+
+    Args:
+        dataset: The GOT-10k VOT dataset the trackers ran on. The dataset must return metadata.
+        result_dir (str): The path to the benchmark results, such as ``results/VOT2019``.
+        report_dir (str): The path to the benchmark reports, such as ``reports/VOT2019``.
+        tracker_names (list): Report these trackers. The first tracker is the primary tracker; the
+            function writes the report in its subdirectory of ``report_dir``.
+        partial (bool): Report only the sequences that every tracker has at least one complete
+            repetition of. Use this to score experiments that are still running.
+
+    Returns:
+        dict: The performance data, in the same layout as the GOT-10k report.
+
+    Raises:
+        RuntimeError: This is raised if a tracker's results are missing, do not match the dataset
+            annotations, or contain polygons. If ``partial`` is set, missing and incomplete results
+            are skipped, and this is raised if no sequence has complete results.
+    """
+    sequences = _load_sequences(dataset)
+    records = {
+        name: [_read_sequence_records(result_dir, name, s.name, len(s.polygons)) for s in sequences]
+        for name in tracker_names
+    }
+    if partial:
+        selected = [
+            s
+            for s in range(len(sequences))
+            if all(records[name][s] is not None and records[name][s][0] for name in tracker_names)
+        ]
+        if not selected:
+            raise RuntimeError("No sequence has complete results from every tracker.")
+        command_line.print_information(
+            f"Scoring {len(selected)} of {len(sequences)} sequences."
+        )
+        sequences = [sequences[s] for s in selected]
+        records = {name: [records[name][s] for s in selected] for name in tracker_names}
+    else:
+        for name in tracker_names:
+            for sequence, sequence_records in zip(sequences, records[name]):
+                if sequence_records is not None and not sequence_records[0]:
+                    raise RuntimeError(f"{name} has no results for {sequence.name}.")
+                if sequence_records is None:
+                    raise RuntimeError(
+                        f"{name} has a repetition of {sequence.name} that does not match the "
+                        f"{len(sequence.polygons)} annotations."
+                    )
+    polygons = numpy.concatenate([s.polygons for s in sequences])
+    bounds = numpy.concatenate(
+        [numpy.tile(s.bound, (len(s.polygons), 1)) for s in sequences]
+    ).astype(float)
+    masks = numpy.concatenate([s.masks for s in sequences], axis=1)
+    offsets = numpy.cumsum([0] + [len(s.polygons) for s in sequences])
+    performance = {}
+    for name in tracker_names:
+        command_line.print_information("Evaluating", name)
+        performance[name] = _tracker_performance(
+            records[name], polygons, bounds, masks, offsets
+        )
+    tracker_report_dir = os.path.join(report_dir, tracker_names[0])
+    os.makedirs(tracker_report_dir, exist_ok=True)
+    with open(os.path.join(tracker_report_dir, "performance.json"), "w") as report_file:
+        json.dump(performance, report_file, indent=4)
+    return performance
+
+
+def poly_iou(
+    rectangles: numpy.ndarray, polygons: numpy.ndarray, bounds: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Compute the intersection over union of rectangles and quadrilaterals, within the image.
+
+    This is the same computation as ``got10k.utils.metrics.poly_iou()`` with an image bound, for
+    rectangle results and polygon annotations, but it computes all the pairs at once.
+
+    Args:
+        rectangles (numpy.ndarray): An N x 4 array of (left, top, width, height) rectangles.
+        polygons (numpy.ndarray): An N x 8 array of (x1, y1, x2, y2, x3, y3, x4, y4) polygons.
+        bounds (numpy.ndarray): An N x 2 array of the (width, height) of each image.
+
+    Returns:
+        numpy.ndarray: The overlap of each pair of shapes.
+    """
+    origin = numpy.zeros_like(bounds)
+    vertices, counts = _clip_to_box(
+        polygons.reshape(-1, 4, 2), numpy.full(len(polygons), 4), origin, bounds
+    )
+    polygon_areas = _polygon_areas(vertices, counts)
+    corners = numpy.stack([rectangles[:, :2], rectangles[:, :2] + rectangles[:, 2:]])
+    lower = numpy.maximum(corners.min(axis=0), origin)
+    upper = numpy.minimum(corners.max(axis=0), bounds)
+    rectangle_areas = numpy.prod(numpy.maximum(upper - lower, 0), axis=1)
+    intersection_areas = _polygon_areas(*_clip_to_box(vertices, counts, lower, upper))
+    union_areas = rectangle_areas + polygon_areas - intersection_areas
+    return numpy.clip(intersection_areas / (union_areas + numpy.finfo(float).eps), 0.0, 1.0)
+
+
+class _Sequence:
+    """
+    The parts of a VOT sequence a report needs.
+
+    Attributes:
+        name (str): The name of the sequence.
+        polygons (numpy.ndarray): The frames x 8 annotation polygons.
+        bound (tuple): The (width, height) of the images.
+        masks (numpy.ndarray): The tags x frames masks of the frames with each of the
+            :py:data:`TAGS`.
+    """
+
+    def __init__(self, name: str, img_files: list, annotations: numpy.ndarray, meta: dict) -> None:
+        self.name = name
+        if annotations.shape[1] == 4:
+            left, top, width, height = annotations.T
+            right, bottom = left + width, top + height
+            annotations = numpy.stack(
+                [left, top, right, top, right, bottom, left, bottom], axis=1
+            )
+        self.polygons = annotations
+        with PIL.Image.open(img_files[0]) as image:
+            self.bound = image.size
+        self.masks = numpy.zeros((len(TAGS), len(annotations)), bool)
+        for t, tag in enumerate(TAGS):
+            if tag in meta:
+                self.masks[t] = meta[tag]
+        tag_frames = numpy.array([v for k, v in meta.items() if "practical" not in k], dtype=bool)
+        self.masks[TAGS.index("empty")] = ~numpy.logical_or.reduce(tag_frames, axis=0)
+
+
+def _load_sequences(dataset) -> list:
+    """
+    Load the annotations, image sizes, and tags of every sequence of a VOT dataset.
+
+    Args:
+        dataset: The GOT-10k VOT dataset.
+
+    Returns:
+        list: A :py:class:`_Sequence` for each sequence of the dataset.
+    """
+    return [
+        _Sequence(dataset.seq_names[s], *dataset[s]) for s in range(len(dataset.seq_names))
+    ]
+
+
+def _read_sequence_records(
+    result_dir: str, tracker_name: str, sequence_name: str, frame_count: int
+) -> tuple:
+    """
+    Read every repetition of a tracker on a sequence.
+
+    Args:
+        result_dir (str): The path to the benchmark results.
+        tracker_name (str): The name of the tracker.
+        sequence_name (str): The name of the sequence.
+        frame_count (int): The number of frames in the sequence.
+
+    Returns:
+        tuple | None: A tuple of (list, numpy.ndarray). The list has a tuple of (numpy.ndarray,
+        numpy.ndarray) for each repetition, from :py:func:`_read_record()`. The array is the frames
+        x repetitions times, NaN if there is no times file. This is ``None`` if a repetition does
+        not have ``frame_count`` frames.
+    """
+    sequence_dir = os.path.join(result_dir, tracker_name, "baseline", sequence_name)
+    record_files = sorted(glob.glob(os.path.join(sequence_dir, f"{sequence_name}_[0-9]*.txt")))
+    repetitions = [_read_record(path) for path in record_files[:REPETITIONS]]
+    if any(len(codes) != frame_count for codes, _ in repetitions):
+        return None
+    times = numpy.full((frame_count, REPETITIONS), numpy.nan)
+    time_file = os.path.join(sequence_dir, f"{sequence_name}_time.txt")
+    if os.path.exists(time_file):
+        file_times = numpy.loadtxt(time_file, delimiter=",", ndmin=2)[:frame_count, :REPETITIONS]
+        times[: len(file_times), : file_times.shape[1]] = file_times
+    return repetitions, times
+
+
+def _read_record(path: str) -> tuple:
+    """
+    Read one repetition of a supervised VOT experiment.
+
+    Args:
+        path (str): The path to the record file.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray). The first array is the code of each frame:
+        the value of a one value line, or -1 for a rectangle. The second array is the frames x 4
+        rectangles, NaN on frames without a rectangle.
+
+    Raises:
+        RuntimeError: This is raised if the record has polygons.
+    """
+    with open(path, "r") as record_file:
+        lines = record_file.read().strip().split("\n")
+    widths = numpy.array([line.count(",") + 1 for line in lines])
+    if numpy.any((widths != 1) & (widths != 4)):
+        raise RuntimeError(f"{path} has polygon results; use the GOT-10k engine.")
+    codes = numpy.full(len(lines), _TRACKED)
+    singles = numpy.flatnonzero(widths == 1)
+    codes[singles] = [float(lines[i]) for i in singles]
+    rectangles = numpy.full((len(lines), 4), numpy.nan)
+    tracked = codes == _TRACKED
+    if numpy.any(tracked):
+        rectangles[tracked] = numpy.array(
+            ",".join(line for line, width in zip(lines, widths) if width == 4).split(","),
+            dtype=float,
+        ).reshape(-1, 4)
+    return codes, rectangles
+
+
+def _tracker_performance(
+    records: list,
+    polygons: numpy.ndarray,
+    bounds: numpy.ndarray,
+    masks: numpy.ndarray,
+    offsets: numpy.ndarray,
+) -> dict:
+    """
+    Compute the accuracy, robustness, and speed of one tracker.
+
+    Args:
+        records (list): The repetitions and times of each sequence, from
+            :py:func:`_read_sequence_records()`.
+        polygons (numpy.ndarray): The frames x 8 annotations of all the sequences, concatenated.
+        bounds (numpy.ndarray): The frames x 2 image sizes.
+        masks (numpy.ndarray): The tags x frames masks of the :py:data:`TAGS`.
+        offsets (numpy.ndarray): The offset of each sequence's first frame, followed by the total
+            number of frames.
+
+    Returns:
+        dict: The tracker's ``accuracy``, ``robustness``, and ``speed_fps``.
+    """
+    frames = [numpy.empty(0, int)]
+    codes = [numpy.empty(0, int)]
+    scored = [numpy.empty(0, bool)]
+    rectangles = [numpy.empty((0, 4))]
+    for (repetitions, _), offset in zip(records, offsets):
+        for repetition_codes, repetition_rectangles in repetitions:
+            frames.append(numpy.arange(offset, offset + len(repetition_codes)))
+            codes.append(repetition_codes)
+            scored.append(_scored_frames(repetition_codes))
+            rectangles.append(repetition_rectangles)
+    frames = numpy.concatenate(frames)
+    codes = numpy.concatenate(codes)
+    scored = numpy.concatenate(scored)
+    rectangles = numpy.concatenate(rectangles)
+    frame_count = offsets[-1]
+    ious = poly_iou(rectangles[scored], polygons[frames[scored]], bounds[frames[scored]])
+    # Average the overlaps and failures of each frame over the repetitions.
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        frame_ious = numpy.bincount(
+            frames[scored], weights=ious, minlength=frame_count
+        ) / numpy.bincount(frames[scored], minlength=frame_count)
+        frame_failures = numpy.bincount(
+            frames, weights=codes == _FAILED, minlength=frame_count
+        ) / numpy.bincount(frames, minlength=frame_count)
+    tag_ious = numpy.array([_nanmean(frame_ious[m]) for m in masks])
+    tag_failures = numpy.array([numpy.nansum(frame_failures[m]) for m in masks])
+    tag_frames = masks.sum(axis=1)
+    tag_ious[numpy.isnan(tag_ious)] = 0.0
+    tag_weights = tag_frames / tag_frames.sum()
+    times = numpy.concatenate([t.ravel() for _, t in records])
+    times = times[times > 0]
+    return {
+        "accuracy": float(numpy.sum(tag_ious * tag_weights)),
+        "robustness": float(numpy.sum(tag_failures * tag_weights)),
+        "speed_fps": float(numpy.mean(1.0 / times)) if len(times) > 0 else -1,
+    }
+
+
+def _scored_frames(codes: numpy.ndarray) -> numpy.ndarray:
+    """
+    Find the frames of one repetition that count toward accuracy.
+
+    Args:
+        codes (numpy.ndarray): The code of each frame of the repetition.
+
+    Returns:
+        numpy.ndarray: The mask of frames with a rectangle, outside the burn-in period. The burn-in
+        period is each initialization frame and the following :py:data:`BURNIN` - 1 frames.
+    """
+    initializations = numpy.cumsum(codes == _INITIALIZED)
+    recent = initializations.copy()
+    recent[BURNIN:] -= initializations[:-BURNIN]
+    return (codes == _TRACKED) & (recent == 0)
+
+
+def _nanmean(values: numpy.ndarray) -> float:
+    """Compute the mean of the values that are not NaN, or NaN if there are none."""
+    values = values[~numpy.isnan(values)]
+    return numpy.mean(values) if len(values) > 0 else numpy.nan
+
+
+def _clip_to_box(
+    vertices: numpy.ndarray, counts: numpy.ndarray, lower: numpy.ndarray, upper: numpy.ndarray
+) -> tuple:
+    """
+    Clip polygons to axis aligned boxes.
+
+    Args:
+        vertices (numpy.ndarray): The N x V x 2 vertices of the polygons. Only the first ``counts``
+            vertices of each polygon are valid.
+        counts (numpy.ndarray): The number of vertices of each polygon.
+        lower (numpy.ndarray): The N x 2 (left, top) corners of the boxes.
+        upper (numpy.ndarray): The N x 2 (right, bottom) corners of the boxes.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the vertices and vertex counts of the
+        clipped polygons.
+    """
+    for axis in range(2):
+        vertices, counts = _clip_to_half_plane(vertices, counts, axis, lower[:, axis], 1.0)
+        vertices, counts = _clip_to_half_plane(vertices, counts, axis, upper[:, axis], -1.0)
+    return vertices, counts
+
+
+def _clip_to_half_plane(
+    vertices: numpy.ndarray,
+    counts: numpy.ndarray,
+    axis: int,
+    limits: numpy.ndarray,
+    direction: float,
+) -> tuple:
+    """
+    Clip polygons to axis aligned half planes, with one Sutherland-Hodgman pass.
+
+    Args:
+        vertices (numpy.ndarray): The N x V x 2 vertices of the polygons.
+        counts (numpy.ndarray): The number of vertices of each polygon.
+        axis (int): Clip along this axis: 0 for x, 1 for y.
+        limits (numpy.ndarray): The boundary of each half plane, along the ``axis``.
+        direction (float): 1 to keep the vertices at or above the ``limits``, -1 to keep the
+            vertices at or below them.
+
+    Returns:
+        tuple: A tuple of (numpy.ndarray, numpy.ndarray); the vertices and vertex counts of the
+        clipped polygons.
+    """
+    indices = numpy.arange(vertices.shape[1])[numpy.newaxis, :]
+    valid = indices < counts[:, numpy.newaxis]
+    next_indices = numpy.where(indices + 1 < counts[:, numpy.newaxis], indices + 1, 0)
+    next_vertices = numpy.take_along_axis(vertices, next_indices[..., numpy.newaxis], axis=1)
+    distances = direction * (vertices[..., axis] - limits[:, numpy.newaxis])
+    next_distances = direction * (next_vertices[..., axis] - limits[:, numpy.newaxis])
+    inside = distances >= 0
+    crossing = inside != (next_distances >= 0)
+    fractions = numpy.divide(
+        distances, distances - next_distances, out=numpy.zeros_like(distances), where=crossing
+    )
+    crossings = vertices + fractions[..., numpy.newaxis] * (next_vertices - vertices)
+    crossings[..., axis] = limits[:, numpy.newaxis]
+    # Each edge emits its start vertex if it is inside, then the crossing point if it crosses.
+    candidates = numpy.stack([vertices, crossings], axis=2).reshape(len(vertices), -1, 2)
+    keep = numpy.stack([inside & valid, crossing & valid], axis=2).reshape(len(vertices), -1)
+    counts = keep.sum(axis=1)
+    order = numpy.argsort(~keep, axis=1, kind="stable")[:, : max(1, counts.max(initial=0))]
+    return numpy.take_along_axis(candidates, order[..., numpy.newaxis], axis=1), counts
+
+
+def _polygon_areas(vertices: numpy.ndarray, counts: numpy.ndarray) -> numpy.ndarray:
+    """
+    Compute the areas of polygons with the shoelace formula.
+
+    Args:
+        vertices (numpy.ndarray): The N x V x 2 vertices of the polygons.
+        counts (numpy.ndarray): The number of vertices of each polygon.
+
+    Returns:
+        numpy.ndarray: The area of each polygon.
+    """
+    indices = numpy.arange(vertices.shape[1])[numpy.newaxis, :]
+    next_indices = numpy.where(indices + 1 < counts[:, numpy.newaxis], indices + 1, 0)
+    next_vertices = numpy.take_along_axis(vertices, next_indices[..., numpy.newaxis], axis=1)
+    cross = vertices[..., 0] * next_vertices[..., 1] - next_vertices[..., 0] * vertices[..., 1]
+    cross[indices >= counts[:, numpy.newaxis]] = 0.0
+    return numpy.abs(cross.sum(axis=1)) / 2
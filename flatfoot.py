@@ -3,15 +3,31 @@
 """The control application for MDNet experiments, reports, and more."""
 
 import argparse
-import experiments.experiment
-import experiments.pilot_study
-import experiments.report
+import importlib
+import sys
+
+# The module that implements each command. Some command modules import matplotlib and PyTorch,
+# which can take longer than a pilot study or a report without plots, so only the selected
+# command's module is imported. Without a known command, every module is imported for the help.
+COMMANDS = {
+    "experiment": "experiments.experiment",
+    "pilot": "experiments.pilot_study",
+    "serve": "experiments.pilot_server",
+    "sweep": "experiments.sweep",
+    "report": "experiments.report",
+    "bench-decode": "experiments.image_decoder",
+    "import-results": "experiments.results_cache",
+    "bench-harness": "experiments.harness_benchmark",
+    "make-dataset": "experiments.synthetic_dataset",
+}
 
 # Parse the command line
 PARSER = argparse.ArgumentParser()
 SUBPARSERS = PARSER.add_subparsers(title="Available Commands")
-experiments.experiment.fill_command_line_parser(SUBPARSERS.add_parser("experiment"))
-experiments.pilot_study.fill_command_line_parser(SUBPARSERS.add_parser("pilot"))
-experiments.report.fill_command_line_parser(SUBPARSERS.add_parser("report"))
+SELECTED = [command for command in sys.argv[1:2] if command in COMMANDS] or list(COMMANDS)
+for COMMAND in SELECTED:
+    importlib.import_module(COMMANDS[COMMAND]).fill_command_line_parser(
+        SUBPARSERS.add_parser(COMMAND)
+    )
 ARGUMENTS = PARSER.parse_args()
 ARGUMENTS.func(ARGUMENTS)
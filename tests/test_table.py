@@ -0,0 +1,86 @@
+"""Check the output of :py:mod:`experiments.table`."""
+
+import numpy
+import pytest
+import experiments.table as table
+
+# Tables of negative cells, and the pylatex table writer's output for them: (rows, places, LaTeX).
+# The direct LaTeX writer must write the same bytes. A one row table has no mean and median rows, so
+# its only cell, "-0", is one character after the minus sign.
+_NEGATIVE_TABLES = [
+    (
+        [[-0.2]],
+        0,
+        r"""\begin{table}[!h]
+\begin{center}
+\caption{Overlap Change\label{table:overlap_change}}
+\begin{tabular}{@{}lc@{}}
+\toprule%
+&{MDNet}\\
+\midrule
+Basketball&{-}0\\\bottomrule%
+
+\end{tabular}
+\end{center}
+\end{table}""",
+    ),
+    (
+        [[-0.2, -3.0], [-9.4, -12.5]],
+        0,
+        r"""\begin{table}[!h]
+\begin{center}
+\caption{Overlap Change\label{table:overlap_change}}
+\begin{tabular}{@{}lcc@{}}
+\toprule%
+&{MDNet}&{Ours}\\
+\midrule
+Basketball&\Best{{-}0}&{-}3\\
+Bolt&\Best{{-}9}&{-}12\\
+Mean&\Best{{-}5}&{-}8\\
+Median&\Best{{-}5}&{-}8\\\bottomrule%
+
+\end{tabular}
+\end{center}
+\end{table}""",
+    ),
+    (
+        [[-0.2, -3.0], [-9.4, -12.5]],
+        2,
+        r"""\begin{table}[!h]
+\begin{center}
+\caption{Overlap Change\label{table:overlap_change}}
+\begin{tabular}{@{}lcc@{}}
+\toprule%
+&{MDNet}&{Ours}\\
+\midrule
+Basketball&\Best{{-}0.20}&{-}3.00\\
+Bolt&\Best{{-}9.40}&{-}12.50\\
+Mean&\Best{{-}4.80}&{-}7.75\\
+Median&\Best{{-}4.80}&{-}7.75\\\bottomrule%
+
+\end{tabular}
+\end{center}
+\end{table}""",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "rows, places, latex",
+    _NEGATIVE_TABLES,
+    ids=[f"{len(rows)}x{len(rows[0])}-{places}places" for rows, places, _ in _NEGATIVE_TABLES],
+)
+def test_latex_negative_cells(tmp_path, rows, places, latex):
+    """
+    The LaTeX writer escapes the minus sign of every negative cell, including ``-0``, exactly like
+    the pylatex writer did.
+    """
+    data = table.DataTable(["Basketball", "Bolt"][: len(rows)], ["MDNet", "Ours"][: len(rows[0])])
+    data.data = numpy.array(rows)
+    data.format_spec.places = places
+    data.format_spec.mark_best = len(rows[0]) > 1
+    data.caption = "Overlap Change"
+    data.label = "overlap_change"
+    file_path = tmp_path / "negative.tex"
+    table.write_table(data, str(file_path))
+    assert file_path.read_bytes() == latex.encode()
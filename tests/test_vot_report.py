@@ -0,0 +1,167 @@
+"""Check :py:mod:`experiments.vot_report` against the GOT-10k VOT report engine."""
+
+import os
+import numpy
+import PIL.Image
+import pytest
+import got10k.experiments
+import got10k.experiments.vot
+import got10k.utils.metrics
+import experiments.vot_report as vot_report
+
+
+@pytest.fixture(name="got10k_vot")
+def fixture_got10k_vot(monkeypatch):
+    """
+    Patch the GOT-10k VOT engine so it runs with NumPy 2.
+
+    GOT-10k uses ``numpy.NaN``, which NumPy 2 removed. Its ``_calc_iou()`` also builds an array
+    from the one element arrays ``poly_iou()`` returns for single polygons, which NumPy 2 rejects as
+    ragged, so each IoU is unwrapped to a number. Both patches leave the engine's results as they
+    are.
+    """
+    monkeypatch.setattr(numpy, "NaN", numpy.nan, raising=False)
+    monkeypatch.setattr(
+        got10k.experiments.vot,
+        "poly_iou",
+        lambda *args, **kwargs: got10k.utils.metrics.poly_iou(*args, **kwargs)[0],
+    )
+
+
+def test_report_matches_got10k(tmp_path, got10k_vot, capsys):  # pylint: disable=unused-argument
+    """
+    The native report matches ``ExperimentVOT.report()`` on synthetic supervised records with
+    failures, burn-in frames, tagged and untagged sequences, zero times, and a tracker with fewer
+    repetitions than the experiment.
+    """
+    dataset = _SyntheticVotDataset(os.path.join(tmp_path, "images"))
+    result_dir = os.path.join(tmp_path, "results")
+    # Tracker B has fewer repetitions than the experiment, so the engines average over the
+    # repetitions it has.
+    tracker_repetitions = {"A": vot_report.REPETITIONS, "B": 3}
+    rng = numpy.random.default_rng(0)
+    for name, repetitions in tracker_repetitions.items():
+        for sequence_name, (_, polygons, _) in zip(dataset.seq_names, dataset):
+            _write_vot_records(
+                os.path.join(result_dir, name, "baseline", sequence_name),
+                sequence_name,
+                polygons,
+                repetitions,
+                rng,
+            )
+    # The constructor downloads and checks a real VOT dataset, so set the attributes report()
+    # reads directly.
+    experiment = object.__new__(got10k.experiments.ExperimentVOT)
+    experiment.dataset = dataset
+    experiment.result_dir = result_dir
+    experiment.report_dir = os.path.join(tmp_path, "got10k_reports")
+    experiment.burnin = vot_report.BURNIN
+    experiment.repetitions = vot_report.REPETITIONS
+    experiment.tags = vot_report.TAGS
+    expected = experiment.report(list(tracker_repetitions))
+    actual = vot_report.report(
+        dataset, result_dir, os.path.join(tmp_path, "reports"), list(tracker_repetitions)
+    )
+    capsys.readouterr()
+    assert actual == {
+        name: {field: pytest.approx(value, rel=1e-12, abs=1e-15) for field, value in fields.items()}
+        for name, fields in expected.items()
+    }
+
+
+class _SyntheticVotDataset:
+    """
+    A small GOT-10k style VOT dataset with random rotated target polygons.
+
+    Each sequence has one blank frame image, which every frame shares. The first sequence has no
+    tags, and the others have a mix of supported tags, an unsupported tag, and a ``practical``
+    entry, which is not a tag.
+
+    Attributes:
+        seq_names (list): The name of each sequence.
+    """
+
+    def __init__(self, image_dir: str) -> None:
+        rng = numpy.random.default_rng(1)
+        os.makedirs(image_dir, exist_ok=True)
+        self.seq_names = [f"sequence{s}" for s in range(5)]
+        self.__sequences = []
+        for s in range(len(self.seq_names)):
+            frames = int(rng.integers(20, 80))
+            width, height = rng.integers(80, 200, 2)
+            image_file = os.path.join(image_dir, f"{s}.jpg")
+            PIL.Image.new("RGB", (int(width), int(height))).save(image_file)
+            centers = rng.uniform(0, [width, height], (frames, 2))
+            sizes = rng.uniform(10, 60, (frames, 2))
+            angles = rng.uniform(0, numpy.pi, frames)
+            along = numpy.column_stack([numpy.cos(angles), numpy.sin(angles)]) * sizes[:, :1] / 2
+            across = numpy.column_stack([-numpy.sin(angles), numpy.cos(angles)]) * sizes[:, 1:] / 2
+            polygons = numpy.hstack(
+                [
+                    centers - along - across,
+                    centers + along - across,
+                    centers + along + across,
+                    centers - along + across,
+                ]
+            )
+            meta = {}
+            if s > 0:
+                meta = {
+                    tag: (rng.random(frames) < 0.3).astype(float)
+                    for tag in ["camera_motion", "occlusion", "size_change", "unsupported_tag"]
+                }
+            meta["practical"] = rng.random(frames)
+            self.__sequences.append(([image_file] * frames, polygons, meta))
+
+    def __getitem__(self, index: int) -> tuple:
+        return self.__sequences[index]
+
+    def __len__(self) -> int:
+        return len(self.__sequences)
+
+
+def _write_vot_records(
+    sequence_dir: str,
+    sequence_name: str,
+    polygons: numpy.ndarray,
+    repetitions: int,
+    rng: numpy.random.Generator,
+) -> None:
+    """
+    Write random supervised VOT records and times for one tracker on one sequence.
+
+    Each repetition tracks the target's bounding rectangle with noise. A few frames fail; each
+    failure skips 5 frames and then re-initializes, like the GOT-10k experiment. Some times are 0,
+    which the speed ignores.
+
+    Args:
+        sequence_dir (str): Write the records to this directory.
+        sequence_name (str): The name of the sequence.
+        polygons (numpy.ndarray): The frames x 8 annotation polygons.
+        repetitions (int): Write this many repetitions.
+        rng (numpy.random.Generator): Draw the tracking noise, failures, and times from this
+            generator.
+    """
+    os.makedirs(sequence_dir, exist_ok=True)
+    frames = len(polygons)
+    times = rng.uniform(0.001, 0.1, (frames, repetitions))
+    times[rng.random(times.shape) < 0.2] = 0.0
+    numpy.savetxt(
+        os.path.join(sequence_dir, f"{sequence_name}_time.txt"), times, fmt="%.8f", delimiter=","
+    )
+    corners = numpy.column_stack([polygons[:, 0::2].min(axis=1), polygons[:, 1::2].min(axis=1)])
+    sizes = numpy.column_stack([numpy.ptp(polygons[:, 0::2], 1), numpy.ptp(polygons[:, 1::2], 1)])
+    rectangles = numpy.hstack([corners, sizes])
+    for repetition in range(1, repetitions + 1):
+        lines = []
+        while len(lines) < frames:
+            lines.append("1")
+            while len(lines) < frames:
+                if rng.random() < 0.05:
+                    lines += ["2"] + ["0"] * 5
+                    break
+                box = rectangles[len(lines)] + rng.normal(0, 10, 4)
+                lines.append(",".join(f"{value:.4f}" for value in box))
+        record_file = os.path.join(sequence_dir, f"{sequence_name}_{repetition:03d}.txt")
+        with open(record_file, "w") as records:
+            records.write("\n".join(lines[:frames]) + "\n")